@@ -20,6 +20,9 @@ from app.models.user import User, UserRole
 from app.models.roadmap import Roadmap, DailyPlan, TopicProgress
 from app.models.test import MockTest, TestResult
 from app.models.interview import InterviewSession, InterviewFeedback
+from app.models.template import GenerationTemplate, TemplateDailyPlan
+from app.models.catalog import RoleCatalogEntry
+from app.models.job import GenerationJob
 
 # Get Alembic config object
 config = context.config
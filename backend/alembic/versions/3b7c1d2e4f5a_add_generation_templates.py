@@ -0,0 +1,51 @@
+"""Add shared generation template cache
+
+Revision ID: 3b7c1d2e4f5a
+Revises: ee977a322e90
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7c1d2e4f5a'
+down_revision = 'ee977a322e90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('generation_templates',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('role_key', sa.String(), nullable=False),
+    sa.Column('duration_days', sa.Integer(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('roadmap_text', sa.Text(), nullable=True),
+    sa.Column('roadmap_generated_at', sa.DateTime(), nullable=True),
+    sa.Column('daily_plan_generated_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('role_key', 'duration_days', 'prompt_version', name='uq_generation_templates_key')
+    )
+    op.create_index(op.f('ix_generation_templates_id'), 'generation_templates', ['id'], unique=False)
+    op.create_table('template_daily_plans',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('template_id', sa.Integer(), nullable=False),
+    sa.Column('day_number', sa.Integer(), nullable=False),
+    sa.Column('topic', sa.Text(), nullable=False),
+    sa.Column('estimated_hours', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['template_id'], ['generation_templates.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_template_daily_plans_id'), 'template_daily_plans', ['id'], unique=False)
+    op.create_index(op.f('ix_template_daily_plans_template_id'), 'template_daily_plans', ['template_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_template_daily_plans_template_id'), table_name='template_daily_plans')
+    op.drop_index(op.f('ix_template_daily_plans_id'), table_name='template_daily_plans')
+    op.drop_table('template_daily_plans')
+    op.drop_index(op.f('ix_generation_templates_id'), table_name='generation_templates')
+    op.drop_table('generation_templates')
@@ -0,0 +1,44 @@
+"""Add pre-generated role catalog
+
+Revision ID: 5d2e8a9c1b7f
+Revises: 3b7c1d2e4f5a
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a9c1b7f'
+down_revision = '3b7c1d2e4f5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('generation_templates', sa.Column('pinned', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.create_table('role_catalog',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('role_key', sa.String(), nullable=False),
+    sa.Column('role_name', sa.String(), nullable=False),
+    sa.Column('duration_days', sa.Integer(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('build_seconds', sa.Float(), nullable=True),
+    sa.Column('template_id', sa.Integer(), nullable=True),
+    sa.Column('built_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['template_id'], ['generation_templates.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('role_key', 'duration_days', 'prompt_version', name='uq_role_catalog_key')
+    )
+    op.create_index(op.f('ix_role_catalog_id'), 'role_catalog', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_role_catalog_id'), table_name='role_catalog')
+    op.drop_table('role_catalog')
+    op.drop_column('generation_templates', 'pinned')
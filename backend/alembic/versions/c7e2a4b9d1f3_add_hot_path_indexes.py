@@ -0,0 +1,167 @@
+"""Add indexes for the hot query paths
+
+Revision ID: c7e2a4b9d1f3
+Revises: 8f4a6c2d9e1b
+Create Date: 2026-10-17 18:00:00.000000
+
+Every roadmap, daily-plan and delete route filters on a foreign key that
+only had the primary-key index, and deleting a role cascades through
+roadmaps, daily_plans and topic_progress by those same columns. The
+indexes are built CONCURRENTLY on Postgres so the tables stay writable;
+that cannot run in a transaction, so it happens in an autocommit block.
+If a concurrent build fails it leaves an INVALID index behind: drop it
+and run the upgrade again.
+
+Before the unique (user_id, lower(role_name)) index is built, roles that
+differ only in capitalisation are merged: their roadmaps, daily plans
+(with their topic progress), mock tests, interview sessions and queued
+daily-plan jobs move to one surviving role, and the emptied duplicates
+are deleted. A role has one roadmap and one plan, so when several roles
+in a group have them the newest wins (highest id): the survivor is the
+role with the newest daily plans (it keeps their duration_days) and it
+gets the newest roadmap. The older roadmaps and plans are deleted, and
+each one is logged with its role and id. The downgrade drops the indexes
+but does not split merged roles again.
+
+"""
+import json
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2a4b9d1f3'
+down_revision = '8f4a6c2d9e1b'
+branch_labels = None
+depends_on = None
+
+log = logging.getLogger(f"alembic.migration.{revision}")
+
+# Tables whose rows belong to a user role
+ROLE_CHILD_TABLES = ('roadmaps', 'daily_plans', 'mock_tests', 'interview_sessions')
+
+
+def _delete_where_in(bind, table: str, column: str, ids) -> None:
+    """DELETE FROM table WHERE column IN ids"""
+    bind.execute(
+        sa.text(f"DELETE FROM {table} WHERE {column} IN :ids").bindparams(sa.bindparam("ids", expanding=True)),
+        {"ids": list(ids)}
+    )
+
+
+def merge_duplicate_roles() -> None:
+    """Merge roles that differ only in capitalisation, keeping the newest roadmap and plan"""
+    if op.get_context().as_sql:
+        # Offline (--sql) scripts cannot look at the data; the unique index
+        # build fails instead if duplicates remain
+        return
+    bind = op.get_bind()
+    groups = bind.execute(sa.text(
+        "SELECT user_id, lower(role_name) FROM user_roles "
+        "GROUP BY user_id, lower(role_name) HAVING count(*) > 1"
+    )).all()
+
+    jobs = bind.execute(sa.text(
+        "SELECT id, payload FROM generation_jobs WHERE kind = 'daily_plan' AND status IN ('queued', 'running')"
+    )).all()
+    for user_id, name_key in groups:
+        roles = bind.execute(sa.text(
+            "SELECT r.id, r.role_name, "
+            "(SELECT count(*) FROM daily_plans p WHERE p.user_role_id = r.id) AS plan_days, "
+            "(SELECT max(p.id) FROM daily_plans p WHERE p.user_role_id = r.id) AS newest_plan "
+            "FROM user_roles r WHERE r.user_id = :user_id AND lower(r.role_name) = :name_key "
+            "ORDER BY r.id"
+        ), {"user_id": user_id, "name_key": name_key}).all()
+        role_ids = [role.id for role in roles]
+        names = {role.id: role.role_name for role in roles}
+        roadmaps = bind.execute(
+            sa.text("SELECT id, user_role_id FROM roadmaps WHERE user_role_id IN :role_ids ORDER BY id")
+            .bindparams(sa.bindparam("role_ids", expanding=True)),
+            {"role_ids": role_ids}
+        ).all()
+        with_plans = sorted((role for role in roles if role.plan_days), key=lambda role: role.newest_plan)
+
+        # The newest plan's role keeps its duration_days; otherwise the newest roadmap's, otherwise the newest role
+        if with_plans:
+            keep = with_plans[-1].id
+        elif roadmaps:
+            keep = roadmaps[-1].user_role_id
+        else:
+            keep = role_ids[-1]
+        duplicates = [role_id for role_id in role_ids if role_id != keep]
+
+        old_roadmaps = roadmaps[:-1]
+        for roadmap in old_roadmaps:
+            log.warning(
+                "Deleting roadmap %s of role %r (id %s) of user %s, superseded by roadmap %s",
+                roadmap.id, names[roadmap.user_role_id], roadmap.user_role_id, user_id, roadmaps[-1].id
+            )
+        if old_roadmaps:
+            _delete_where_in(bind, "roadmaps", "id", [roadmap.id for roadmap in old_roadmaps])
+
+        old_plans = with_plans[:-1]
+        for role in old_plans:
+            log.warning(
+                "Deleting the %s-day plan of role %r (id %s) of user %s, superseded by the plan of role %s",
+                role.plan_days, role.role_name, role.id, user_id, keep
+            )
+        if old_plans:
+            plan_ids = bind.execute(
+                sa.text("SELECT id FROM daily_plans WHERE user_role_id IN :role_ids")
+                .bindparams(sa.bindparam("role_ids", expanding=True)),
+                {"role_ids": [role.id for role in old_plans]}
+            ).scalars().all()
+            _delete_where_in(bind, "topic_progress", "daily_plan_id", plan_ids)
+            _delete_where_in(bind, "daily_plans", "id", plan_ids)
+
+        for table in ROLE_CHILD_TABLES:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET user_role_id = :keep WHERE user_role_id IN :duplicates")
+                .bindparams(sa.bindparam("duplicates", expanding=True)),
+                {"keep": keep, "duplicates": duplicates}
+            )
+        for job_id, payload in jobs:
+            data = json.loads(payload)
+            if data.get("user_role_id") in duplicates:
+                data["user_role_id"] = keep
+                bind.execute(
+                    sa.text("UPDATE generation_jobs SET payload = :payload WHERE id = :id"),
+                    {"payload": json.dumps(data), "id": job_id}
+                )
+        _delete_where_in(bind, "user_roles", "id", duplicates)
+        log.info("Merged roles %s of user %s into role %s", duplicates, user_id, keep)
+
+
+def upgrade() -> None:
+    merge_duplicate_roles()
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_daily_plans_user_role_id_day_number', 'daily_plans', ['user_role_id', 'day_number'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_roadmaps_user_role_id', 'roadmaps', ['user_role_id'],
+            unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_topic_progress_daily_plan_id', 'topic_progress', ['daily_plan_id'],
+            unique=False, postgresql_concurrently=True
+        )
+        # Also serves lookups by user_id alone (GET /ai/daily-plans)
+        op.create_index(
+            'uq_user_roles_user_id_role_name', 'user_roles', ['user_id', sa.text('lower(role_name)')],
+            unique=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('uq_user_roles_user_id_role_name', table_name='user_roles', postgresql_concurrently=True)
+        op.drop_index('ix_topic_progress_daily_plan_id', table_name='topic_progress', postgresql_concurrently=True)
+        op.drop_index('ix_roadmaps_user_role_id', table_name='roadmaps', postgresql_concurrently=True)
+        op.drop_index(
+            'ix_daily_plans_user_role_id_day_number', table_name='daily_plans', postgresql_concurrently=True
+        )
@@ -0,0 +1,221 @@
+"""
+LLM Admission Control
+Global and per-user concurrency limits with a bounded wait queue
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, Optional
+
+from app.ai.errors import AdmissionRejectedError
+from app.ai.hedging import LatencyTracker
+
+# User on whose behalf LLM calls in the current request are made (set by the AI routes)
+current_llm_user: ContextVar[Optional[int]] = ContextVar("current_llm_user", default=None)
+
+
+class AdmissionController:
+    """
+    Admission gate in front of upstream LLM calls
+
+    At most `max_concurrent` calls run at once. Extra calls wait in a FIFO
+    queue of at most `max_queue` entries for up to `max_queue_seconds`; each
+    user may hold at most `max_per_user` running or queued calls. Anything
+    over a limit is rejected immediately instead of piling up.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_per_user: int,
+        max_queue: int,
+        max_queue_seconds: float
+    ):
+        """
+        Initialize the controller
+
+        Args:
+            max_concurrent: Service-wide cap on running LLM calls
+            max_per_user: Cap on running plus queued calls per user
+            max_queue: Maximum number of calls waiting for a slot
+            max_queue_seconds: Longest a call may wait for a slot
+        """
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.max_queue_seconds = max_queue_seconds
+
+        self._active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._per_user: Dict[int, int] = {}
+
+        self.wait_times = LatencyTracker(500)
+        self.admitted = 0
+        self.rejected_user_limit = 0
+        self.rejected_queue_full = 0
+        self.rejected_queue_timeout = 0
+
+    def check(self, user_id: Optional[int]) -> None:
+        """
+        Fail fast if a new call would certainly be rejected (reserves nothing)
+
+        Args:
+            user_id: Calling user, or None for background work
+
+        Raises:
+            AdmissionRejectedError: If the user or the queue is at its limit
+        """
+        if user_id is not None and self._per_user.get(user_id, 0) >= self.max_per_user:
+            self.rejected_user_limit += 1
+            raise AdmissionRejectedError(
+                "Too many concurrent AI requests for this user",
+                status_code=429,
+                retry_after=1.0
+            )
+        if self._active >= self.max_concurrent and len(self._waiters) >= self.max_queue:
+            self.rejected_queue_full += 1
+            raise AdmissionRejectedError(
+                "AI service is at capacity, please retry shortly",
+                status_code=503,
+                retry_after=self.max_queue_seconds
+            )
+
+    async def _acquire_slot(self, max_wait: Optional[float] = None) -> None:
+        """Take a global slot, waiting in the queue for at most max_wait (or max_queue_seconds)"""
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            return
+
+        timeout = self.max_queue_seconds if max_wait is None else max(0.0, min(max_wait, self.max_queue_seconds))
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Slot was handed over just as the timeout fired: keep it
+                return
+            self._waiters.remove(waiter)
+            waiter.cancel()
+            self.rejected_queue_timeout += 1
+            raise AdmissionRejectedError(
+                "Timed out waiting for AI capacity, please retry shortly",
+                status_code=503,
+                retry_after=self.max_queue_seconds
+            )
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was handed to us but the caller is gone: pass it on
+                self._release_slot()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+                waiter.cancel()
+            raise
+
+    def _release_slot(self) -> None:
+        """Hand the slot to the next live waiter or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    @contextmanager
+    def hold_user(self, user_id: Optional[int]) -> Iterator[None]:
+        """
+        Count a call against its user's cap for the duration of the block
+
+        admit() does this itself. Callers that wait on a call started
+        without a user (a coalesced single-flight call) hold their own
+        place here instead, so the per-user cap still applies to them.
+
+        Args:
+            user_id: Calling user, or None for background work
+
+        Raises:
+            AdmissionRejectedError: If the user is at their limit (429)
+        """
+        if user_id is None:
+            yield
+            return
+        if self._per_user.get(user_id, 0) >= self.max_per_user:
+            self.rejected_user_limit += 1
+            raise AdmissionRejectedError(
+                "Too many concurrent AI requests for this user",
+                status_code=429,
+                retry_after=1.0
+            )
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+        try:
+            yield
+        finally:
+            remaining = self._per_user.get(user_id, 1) - 1
+            if remaining > 0:
+                self._per_user[user_id] = remaining
+            else:
+                self._per_user.pop(user_id, None)
+
+    @asynccontextmanager
+    async def admit(self, user_id: Optional[int] = None, max_wait: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the block
+
+        Args:
+            user_id: Calling user (defaults to current_llm_user), None for background work
+            max_wait: Shorter limit on the queue wait (e.g. the request's remaining deadline)
+
+        Raises:
+            AdmissionRejectedError: If a limit is exceeded or the queue wait times out
+        """
+        if user_id is None:
+            user_id = current_llm_user.get()
+
+        self.check(user_id)
+
+        with self.hold_user(user_id):
+            queued_at = time.monotonic()
+            await self._acquire_slot(max_wait)
+            self.wait_times.record(time.monotonic() - queued_at)
+            self.admitted += 1
+            try:
+                yield
+            finally:
+                self._release_slot()
+
+    def utilization(self) -> float:
+        """
+        Running plus queued calls as a fraction of the concurrency cap
+
+        Returns:
+            0.0 when idle, 1.0 when every slot is busy, above 1.0 while calls queue
+        """
+        return (self._active + len(self._waiters)) / self.max_concurrent
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Admission counters and queue state for monitoring
+
+        Call from the event loop (/health/llm is an async route): the wait
+        percentiles sort a deque that admitted calls append to there.
+
+        Returns:
+            Dictionary with active calls, queue depth, wait percentiles and rejections
+        """
+        return {
+            "active": self._active,
+            "max_concurrent": self.max_concurrent,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "users_active": len(self._per_user),
+            "wait_p50": round(self.wait_times.percentile(50) or 0.0, 4),
+            "wait_p95": round(self.wait_times.percentile(95) or 0.0, 4),
+            "wait_max": round(self.wait_times.percentile(100) or 0.0, 4),
+            "admitted": self.admitted,
+            "rejected_user_limit": self.rejected_user_limit,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_queue_timeout": self.rejected_queue_timeout
+        }
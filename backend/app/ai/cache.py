@@ -0,0 +1,218 @@
+"""
+LLM Result Cache
+Bounded, memory-accounted LRU cache with TTL and stale-while-revalidate
+"""
+
+import asyncio
+import contextvars
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from app.ai.singleflight import SingleFlight
+
+# Rough per-entry bookkeeping overhead (key, entry object, OrderedDict node)
+ENTRY_OVERHEAD_BYTES = 200
+
+
+class _Entry:
+    """A cached value with its accounted size and expiry times"""
+
+    __slots__ = ("value", "size", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, size: int, fresh_until: float, stale_until: float):
+        self.value = value
+        self.size = size
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """
+    In-process LRU cache for JSON-serializable LLM results
+
+    - Size is bounded by the approximate memory of the stored values,
+      evicting least-recently-used entries first.
+    - Entries are fresh for `ttl` seconds, then served stale for up to
+      `stale_ttl` more seconds while one background refresh runs.
+    - Concurrent misses for a key share a single load (no stampedes).
+    """
+
+    def __init__(self, max_bytes: int, ttl: float, stale_ttl: float):
+        """
+        Initialize the cache
+
+        Args:
+            max_bytes: Memory budget for cached values
+            ttl: Seconds an entry is served as fresh
+            stale_ttl: Extra seconds an expired entry may be served while refreshing
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._loads = SingleFlight()
+        self._background: Set["asyncio.Task[Any]"] = set()
+        self._refreshing: Set[str] = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @staticmethod
+    def _measure(value: Any) -> int:
+        """Approximate memory footprint of a value in bytes"""
+        return len(json.dumps(value, separators=(",", ":")).encode("utf-8")) + ENTRY_OVERHEAD_BYTES
+
+    def _lookup(self, key: str, now: float) -> Optional[_Entry]:
+        """Return a servable entry (fresh or stale) and drop dead ones"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now >= entry.stale_until:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remove(self, key: str) -> None:
+        """Delete an entry and release its accounted bytes"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, evicting least-recently-used entries to stay in budget
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        size = self._measure(value)
+        if size > self.max_bytes:
+            return
+
+        now = time.monotonic()
+        self._remove(key)
+        self._entries[key] = _Entry(value, size, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self._bytes += size
+
+        while self._bytes > self.max_bytes and self._entries:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def peek(self, key: str) -> Optional[Any]:
+        """
+        Return a fresh cached value without loading or counting a lookup
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value, or None if absent or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() >= entry.fresh_until:
+            return None
+        return entry.value
+
+    def contains(self, key: str) -> bool:
+        """
+        Whether a fresh value is cached for key
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if a fresh entry exists
+        """
+        return self.peek(key) is not None
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Run the loader once per key and store its result"""
+        async def load_and_store() -> Any:
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        return await self._loads.do(key, load_and_store)
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        """
+        Start a background refresh for a stale key unless one is running
+
+        The refresh runs in an empty context, not a copy of the request that
+        found the stale entry, so that request's deadline cannot cut it short.
+        """
+        # A refresh task only joins the in-flight table once it starts running
+        if key in self._refreshing or self._loads.is_in_flight(key):
+            return
+        self._refreshing.add(key)
+
+        async def refresh() -> None:
+            try:
+                await self._load(key, loader)
+                self.refreshes += 1
+            except Exception as e:
+                self.refresh_failures += 1
+                print(f"Background cache refresh failed for {key!r}: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.get_running_loop().create_task(refresh(), context=contextvars.Context())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value for key, loading it on a miss
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value on a miss or refresh
+
+        Returns:
+            Cached or freshly loaded value
+        """
+        now = time.monotonic()
+        entry = self._lookup(key, now)
+
+        if entry is not None:
+            if now < entry.fresh_until:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader)
+            return entry.value
+
+        self.misses += 1
+        return await self._load(key, loader)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache counters for monitoring
+
+        Returns:
+            Dictionary with size, hit/miss/eviction counters and hit ratio
+        """
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0
+        }
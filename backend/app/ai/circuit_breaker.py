@@ -0,0 +1,209 @@
+"""
+LLM Circuit Breaker
+Fails LLM calls fast while the upstream is degraded
+"""
+
+import time
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Tuple
+
+from app.ai.errors import CircuitOpenError
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker driven by a sliding window
+
+    While closed, every call outcome is recorded with its latency. When the
+    window holds enough calls and either the error rate or the slow-call rate
+    crosses its threshold, the breaker opens and rejects calls immediately.
+    After the open period a limited number of probe calls are let through
+    (half-open); if they all succeed the breaker closes, otherwise it opens
+    again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        window_seconds: float,
+        min_calls: int,
+        error_rate_threshold: float,
+        slow_call_seconds: float,
+        slow_call_rate_threshold: float,
+        open_seconds: float,
+        half_open_max_calls: int
+    ):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            window_seconds: Length of the sliding outcome window
+            min_calls: Calls required in the window before the breaker may open
+            error_rate_threshold: Failure ratio (0-1) that opens the breaker
+            slow_call_seconds: Latency above which a call counts as slow
+            slow_call_rate_threshold: Slow-call ratio (0-1) that opens the breaker
+            open_seconds: How long the breaker stays open before probing
+            half_open_max_calls: Probe calls allowed while half-open
+        """
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state = self.CLOSED
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+        self.times_opened = 0
+        self.rejected_calls = 0
+
+    def _trim(self, now: float) -> None:
+        """Drop outcomes that fell out of the sliding window"""
+        cutoff = now - self.window_seconds
+        while self._window and self._window[0][0] < cutoff:
+            self._window.popleft()
+
+    def _open(self, now: float) -> None:
+        """Trip the breaker"""
+        self.state = self.OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.times_opened += 1
+
+    def retry_after(self, now: Optional[float] = None) -> float:
+        """
+        Seconds until the breaker will let a probe through
+
+        Args:
+            now: Current time.monotonic() value (defaults to now)
+
+        Returns:
+            Remaining open time in seconds (0 when not open)
+        """
+        if self.state != self.OPEN:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._opened_at + self.open_seconds - now)
+
+    def check(self) -> None:
+        """
+        Fail fast if the breaker is open, without reserving a call slot
+
+        Raises:
+            CircuitOpenError: If calls are currently rejected
+        """
+        if self.state == self.OPEN:
+            remaining = self.retry_after()
+            if remaining > 0:
+                self.rejected_calls += 1
+                raise CircuitOpenError(
+                    "LLM service temporarily unavailable (circuit open)",
+                    retry_after=remaining
+                )
+
+    def acquire(self) -> None:
+        """
+        Reserve permission for one upstream call
+
+        Every successful acquire must be followed by record() or release().
+
+        Raises:
+            CircuitOpenError: If the breaker is open or half-open probes are exhausted
+        """
+        now = time.monotonic()
+
+        if self.state == self.OPEN:
+            if self.retry_after(now) > 0:
+                self.rejected_calls += 1
+                raise CircuitOpenError(
+                    "LLM service temporarily unavailable (circuit open)",
+                    retry_after=self.retry_after(now)
+                )
+            self.state = self.HALF_OPEN
+
+        if self.state == self.HALF_OPEN:
+            if self._probes_in_flight >= self.half_open_max_calls:
+                self.rejected_calls += 1
+                raise CircuitOpenError(
+                    "LLM service temporarily unavailable (circuit half-open)",
+                    retry_after=1.0
+                )
+            self._probes_in_flight += 1
+
+    def release(self) -> None:
+        """Give back a reserved call slot without recording an outcome"""
+        if self.state == self.HALF_OPEN and self._probes_in_flight > 0:
+            self._probes_in_flight -= 1
+
+    def record(self, success: bool, latency: float) -> None:
+        """
+        Record the outcome of an acquired call
+
+        Args:
+            success: Whether the upstream behaved (client errors count as success)
+            latency: Call latency in seconds
+        """
+        now = time.monotonic()
+
+        if self.state == self.HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if not success:
+                self._open(now)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_max_calls:
+                self.state = self.CLOSED
+                self._window.clear()
+            return
+
+        if self.state == self.OPEN:
+            # Outcome of a call started before the breaker opened
+            return
+
+        self._window.append((now, success, latency >= self.slow_call_seconds))
+        self._trim(now)
+
+        total = len(self._window)
+        if total < self.min_calls:
+            return
+
+        failures = sum(1 for _, ok, _ in self._window if not ok)
+        slow = sum(1 for _, _, is_slow in self._window if is_slow)
+        if (failures / total >= self.error_rate_threshold
+                or slow / total >= self.slow_call_rate_threshold):
+            self._open(now)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Breaker state for monitoring
+
+        Call from the event loop: trimming and counting the window would
+        race the calls recorded there.
+
+        Returns:
+            Dictionary with state, window counts and counters
+        """
+        now = time.monotonic()
+        self._trim(now)
+        total = len(self._window)
+        failures = sum(1 for _, ok, _ in self._window if not ok)
+        slow = sum(1 for _, _, is_slow in self._window if is_slow)
+        return {
+            "state": self.state,
+            "window_calls": total,
+            "window_failures": failures,
+            "window_slow_calls": slow,
+            "error_rate": round(failures / total, 3) if total else 0.0,
+            "retry_after": round(self.retry_after(now), 3),
+            "times_opened": self.times_opened,
+            "rejected_calls": self.rejected_calls
+        }
@@ -0,0 +1,80 @@
+"""
+LLM Errors
+Exception types raised by the LLM client layer
+"""
+
+from typing import Optional
+
+# HTTP statuses worth retrying: request timeout, rate limit and transient server errors
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """
+    Base class for LLM client failures
+
+    Attributes:
+        retryable: Whether the same request may succeed if sent again
+        retry_after: Server-suggested wait in seconds before retrying, if any
+    """
+
+    retryable = False
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMTimeoutError(LLMError):
+    """The upstream did not answer within the allowed time"""
+
+    retryable = True
+
+
+class LLMConnectionError(LLMError):
+    """The connection to the upstream failed before a response arrived"""
+
+    retryable = True
+
+
+class LLMUpstreamError(LLMError):
+    """The upstream answered with an HTTP error status"""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message, retry_after)
+        self.status_code = status_code
+        self.retryable = status_code in RETRYABLE_STATUS_CODES
+
+
+class LLMResponseError(LLMError):
+    """The upstream answered successfully but the body was not usable"""
+
+
+class LLMUnavailableError(LLMError):
+    """
+    The call was refused locally to protect the service
+
+    Raised before any upstream request is made, so it is never retried.
+
+    Attributes:
+        status_code: HTTP status the API should answer with
+    """
+
+    status_code = 503
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """The circuit breaker is open because the upstream is degraded"""
+
+
+class AdmissionRejectedError(LLMUnavailableError):
+    """
+    The call was refused by admission control
+
+    429 when the user is over their own concurrency cap, 503 when the
+    service-wide queue is full or the wait for a slot timed out.
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message, retry_after)
+        self.status_code = status_code
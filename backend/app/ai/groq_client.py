@@ -3,57 +3,188 @@ Groq LLM Client
 Handles communication with Groq API for LLM operations
 """
 
+import asyncio
+import hashlib
 import json
+import time
+from pathlib import Path
 import httpx
-from typing import Dict, Any, Optional
+from pydantic import TypeAdapter, ValidationError
+from typing import Dict, Any, Optional, AsyncIterator, Tuple
 from app.core.config import settings
+from app.ai.admission import AdmissionController, current_llm_user
+from app.ai.circuit_breaker import CircuitBreaker
+from app.ai.errors import (
+    LLMError,
+    LLMTimeoutError,
+    LLMConnectionError,
+    LLMUpstreamError,
+    LLMResponseError
+)
+from app.ai.hedging import HedgePolicy, LatencyTracker
+from app.ai.json_extract import JSONExtractionError, extract_json
+from app.ai.retry import RetryPolicy, parse_retry_after
+from app.ai.singleflight import SingleFlight, completion_key
+from app.ai.telemetry import LLMCallTelemetry, outcome_for
+from app.core import deadline
 
 
 class GroqClient:
     """
     Client for interacting with Groq API
+    
+    A single pooled httpx.AsyncClient is shared by every call so that
+    TCP/TLS handshakes are paid once per connection instead of per request.
     """
     
     BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
+    HEADERS = {"Content-Type": "application/json"}
     
     def __init__(self):
         """Initialize Groq client with API key from settings"""
         self.api_key = settings.LLM_API_KEY
+        self.base_url = settings.LLM_BASE_URL or self.BASE_URL
         self.model = settings.LLM_MODEL_NAME
         self.timeout = settings.LLM_TIMEOUT
         self.max_tokens = settings.LLM_MAX_TOKENS
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.LLM_RETRY_MAX_ATTEMPTS,
+            base_delay=settings.LLM_RETRY_BASE_DELAY,
+            max_delay=settings.LLM_RETRY_MAX_DELAY,
+            total_budget=settings.LLM_RETRY_TOTAL_BUDGET
+        )
+        self.circuit_breaker = CircuitBreaker(
+            window_seconds=settings.LLM_BREAKER_WINDOW_SECONDS,
+            min_calls=settings.LLM_BREAKER_MIN_CALLS,
+            error_rate_threshold=settings.LLM_BREAKER_ERROR_RATE,
+            slow_call_seconds=settings.LLM_BREAKER_SLOW_CALL_SECONDS,
+            slow_call_rate_threshold=settings.LLM_BREAKER_SLOW_CALL_RATE,
+            open_seconds=settings.LLM_BREAKER_OPEN_SECONDS,
+            half_open_max_calls=settings.LLM_BREAKER_HALF_OPEN_CALLS
+        )
+        self.single_flight = SingleFlight()
+        self.admission = AdmissionController(
+            max_concurrent=settings.LLM_MAX_CONCURRENCY,
+            max_per_user=settings.LLM_MAX_CONCURRENCY_PER_USER,
+            max_queue=settings.LLM_MAX_QUEUE,
+            max_queue_seconds=settings.LLM_MAX_QUEUE_SECONDS
+        )
+        self.fallback_model = settings.LLM_FALLBACK_MODEL_NAME or self.model
+        self.hedge_policy = HedgePolicy(
+            percentile=settings.LLM_HEDGE_PERCENTILE,
+            min_delay=settings.LLM_HEDGE_MIN_DELAY,
+            default_delay=settings.LLM_HEDGE_DEFAULT_DELAY,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+            max_rate=settings.LLM_HEDGE_MAX_RATE
+        )
+        # End-to-end latency of successful calls per operation, for deadline checks
+        self.operation_latency: Dict[str, LatencyTracker] = {}
         
         if not self.api_key:
             raise ValueError("LLM_API_KEY not configured in environment variables")
     
-    async def generate_completion(
+    def _build_http_client(self) -> httpx.AsyncClient:
+        """
+        Build the shared HTTP client with keep-alive, HTTP/2 and pool limits
+        
+        Returns:
+            Configured httpx.AsyncClient
+        """
+        limits = httpx.Limits(
+            max_connections=settings.LLM_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=settings.LLM_POOL_KEEPALIVE_EXPIRY
+        )
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=limits,
+            http2=settings.LLM_HTTP2,
+            headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+    
+    async def start(self) -> None:
+        """Open the shared HTTP client (called from the FastAPI lifespan)"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._build_http_client()
+    
+    async def close(self) -> None:
+        """Close the shared HTTP client and release pooled connections"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """
+        Shared HTTP client
+        
+        Created lazily so scripts that never run the app lifespan still work.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = self._build_http_client()
+        return self._http_client
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Connection pool statistics for sizing the pool under load
+        
+        Returns:
+            Dictionary with idle/active connection counts and waiting requests
+        """
+        stats = {
+            "http2": settings.LLM_HTTP2,
+            "max_connections": settings.LLM_POOL_MAX_CONNECTIONS,
+            "max_keepalive": settings.LLM_POOL_MAX_KEEPALIVE,
+            "keepalive_expiry": settings.LLM_POOL_KEEPALIVE_EXPIRY,
+            "connections": 0,
+            "idle": 0,
+            "active": 0,
+            "waiting": 0
+        }
+        if self._http_client is None or self._http_client.is_closed:
+            return stats
+        
+        # httpcore does not expose pool counters publicly, so read them defensively
+        pool = getattr(self._http_client._transport, "_pool", None)
+        if pool is None:
+            return stats
+        
+        connections = list(getattr(pool, "connections", []))
+        idle = sum(1 for conn in connections if conn.is_idle())
+        stats["connections"] = len(connections)
+        stats["idle"] = idle
+        stats["active"] = len(connections) - idle
+        stats["waiting"] = sum(
+            1 for request in getattr(pool, "_requests", []) if request.is_queued()
+        )
+        return stats
+    
+    def _build_payload(
         self,
         prompt: str,
-        temperature: float = 0.7,
-        max_tokens: Optional[int] = None
-    ) -> str:
+        temperature: float,
+        max_tokens: Optional[int],
+        stream: bool,
+        model: Optional[str] = None,
+        json_mode: bool = False
+    ) -> Dict[str, Any]:
         """
-        Generate a completion using Groq LLM
+        Build the chat completion request body
         
         Args:
             prompt: The prompt to send to the LLM
-            temperature: Sampling temperature (0-1, higher = more random)
+            temperature: Sampling temperature
             max_tokens: Maximum tokens to generate (overrides default)
+            stream: Whether to request a server-sent event stream
+            model: Model to use (defaults to LLM_MODEL_NAME)
+            json_mode: Ask the API for a JSON object response (needs LLM_JSON_MODE)
             
         Returns:
-            Generated text response
-            
-        Raises:
-            httpx.HTTPError: If API request fails
-            ValueError: If response parsing fails
+            Request payload dictionary
         """
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
-            "model": self.model,
+            "model": model or self.model,
             "messages": [
                 {
                     "role": "user",
@@ -63,46 +194,512 @@ class GroqClient:
             "temperature": temperature,
             "max_tokens": max_tokens or self.max_tokens,
             "top_p": 1,
-            "stream": False
+            "stream": stream
         }
+        if json_mode and settings.LLM_JSON_MODE:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+    
+    def _translate_error(self, error: Exception, timeout: float) -> LLMError:
+        """
+        Map an httpx failure onto the LLM error hierarchy
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    self.BASE_URL,
-                    headers=headers,
-                    json=payload
-                )
-                response.raise_for_status()
-                
-                result = response.json()
+        Args:
+            error: Exception raised while talking to the upstream
+            timeout: Timeout that applied to the attempt, for the message
+            
+        Returns:
+            Matching LLMError (retryable or not)
+        """
+        if isinstance(error, LLMError):
+            return error
+        if isinstance(error, httpx.TimeoutException):
+            return LLMTimeoutError(f"LLM request timed out after {timeout:.1f} seconds")
+        if isinstance(error, httpx.HTTPStatusError):
+            response = error.response
+            return LLMUpstreamError(
+                f"LLM API error: {response.status_code} - {response.text}",
+                status_code=response.status_code,
+                retry_after=parse_retry_after(response.headers)
+            )
+        if isinstance(error, httpx.TransportError):
+            return LLMConnectionError(f"LLM request failed: {str(error)}")
+        return LLMResponseError(f"LLM request failed: {str(error)}")
+    
+    @staticmethod
+    def _is_upstream_failure(error: LLMError) -> bool:
+        """
+        Whether an error says the upstream itself is unhealthy
+        
+        Client-side errors (bad request, auth) and rate limits do not count
+        against the circuit breaker.
+        
+        Args:
+            error: Translated LLM error
+            
+        Returns:
+            True for timeouts, connection failures and 5xx responses
+        """
+        if isinstance(error, (LLMTimeoutError, LLMConnectionError)):
+            return True
+        return isinstance(error, LLMUpstreamError) and error.status_code >= 500
+    
+    def ensure_available(self) -> None:
+        """
+        Fail fast when the circuit breaker is open or admission would be refused
+        
+        Raises:
+            CircuitOpenError: If upstream calls are currently rejected
+            AdmissionRejectedError: If the current user or the queue is at its limit
+            DeadlineExceededError: If the request deadline leaves no time for a call
+        """
+        self.circuit_breaker.check()
+        self.admission.check(current_llm_user.get())
+        deadline.check(settings.REQUEST_MIN_LLM_SECONDS, "an AI call")
+    
+    # Successful calls needed before an operation's median latency is trusted
+    DEADLINE_MIN_SAMPLES = 20
+    
+    def _check_deadline(self, operation: str) -> None:
+        """
+        Refuse a call that would most likely outlive the request deadline
+        
+        A call needs at least REQUEST_MIN_LLM_SECONDS, or the operation's
+        median latency once enough calls have been observed.
+        
+        Args:
+            operation: Metrics label of the call
+            
+        Raises:
+            DeadlineExceededError: If less time than that is left
+        """
+        if deadline.remaining() is None:
+            return
+        needed = settings.REQUEST_MIN_LLM_SECONDS
+        latency = self.operation_latency.get(operation)
+        if latency is not None and len(latency) >= self.DEADLINE_MIN_SAMPLES:
+            needed = max(needed, latency.percentile(50))
+        deadline.check(needed, f"the {operation} AI call")
+    
+    def _record_latency(self, operation: str, seconds: float) -> None:
+        """Add a successful call's end-to-end latency to its operation's window"""
+        latency = self.operation_latency.get(operation)
+        if latency is None:
+            latency = self.operation_latency[operation] = LatencyTracker(200)
+        latency.record(seconds)
+    
+    async def _request_completion(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        telemetry: Optional[LLMCallTelemetry] = None
+    ) -> str:
+        """
+        Send one non-streaming completion request
+        
+        Args:
+            payload: Request body from _build_payload
+            timeout: Timeout for this attempt in seconds
+            telemetry: Call record that receives the response's model, usage and quota headers
+            
+        Returns:
+            Generated text response
+            
+        Raises:
+            LLMError: If the attempt fails
+        """
+        self.circuit_breaker.acquire()
+        started_at = time.monotonic()
+        try:
+            response = await self.http_client.post(
+                self.base_url,
+                headers=self.HEADERS,
+                json=payload,
+                timeout=timeout
+            )
+            if telemetry is not None:
+                telemetry.observe_headers(response.headers, payload["model"])
+            response.raise_for_status()
+            
+            result = response.json()
+            
+            # Extract the generated text
+            if "choices" in result and len(result["choices"]) > 0:
+                content = result["choices"][0]["message"]["content"].strip()
+            else:
+                raise LLMResponseError("Unexpected response structure from Groq API")
+            
+            if telemetry is not None:
+                telemetry.observe_result(payload["model"], result.get("usage"), len(content))
                 
-                # Extract the generated text
-                if "choices" in result and len(result["choices"]) > 0:
-                    return result["choices"][0]["message"]["content"].strip()
-                else:
-                    raise ValueError("Unexpected response structure from Groq API")
-                    
-            except httpx.TimeoutException:
-                raise Exception(f"LLM request timed out after {self.timeout} seconds")
-            except httpx.HTTPStatusError as e:
-                raise Exception(f"LLM API error: {e.response.status_code} - {e.response.text}")
-            except Exception as e:
-                raise Exception(f"LLM request failed: {str(e)}")
+        except Exception as e:
+            error = self._translate_error(e, timeout)
+            self.circuit_breaker.record(
+                success=not self._is_upstream_failure(error),
+                latency=time.monotonic() - started_at
+            )
+            raise error
+        except BaseException:
+            # Cancelled: no verdict on upstream health
+            self.circuit_breaker.release()
+            raise
+        
+        self.circuit_breaker.record(success=True, latency=time.monotonic() - started_at)
+        return content
+    
+    async def generate_completion(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        hedge: bool = False,
+        json_mode: bool = False,
+        operation: str = "other",
+        usage: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Generate a completion using Groq LLM
+        
+        Transient failures (429, 5xx, timeouts, connection errors) are retried
+        according to the client's RetryPolicy. Concurrent calls with the same
+        model, prompt, temperature and max_tokens are coalesced into one, and
+        each upstream call must first pass admission control. Every upstream
+        call is recorded in the LLM telemetry metrics under `operation`.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Sampling temperature (0-1, higher = more random)
+            max_tokens: Maximum tokens to generate (overrides default)
+            hedge: Send a backup request if the primary is slow (needs LLM_HEDGE_ENABLED)
+            json_mode: Request the API's JSON object response format
+            operation: Metrics label for the calling operation (roadmap, daily_plan, teach_topic, ...)
+            usage: Dictionary that receives the response's usage block (token counts), if the API sent one
+            
+        Returns:
+            Generated text response
+            
+        Raises:
+            LLMError: If the request still fails after retries
+        """
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=False, json_mode=json_mode)
+        
+        async def call_model(body: Dict[str, Any], telemetry: LLMCallTelemetry) -> str:
+            # Retries stop when either the retry budget or the request deadline runs out
+            return await self.retry_policy.call(
+                lambda timeout: self._request_completion(body, timeout, telemetry),
+                default_timeout=self.timeout,
+                budget=deadline.budget(self.retry_policy.total_budget)
+            )
+        
+        async def call_with_deadline(telemetry: LLMCallTelemetry) -> str:
+            if hedge and settings.LLM_HEDGE_ENABLED:
+                hedge_payload = dict(payload, model=self.fallback_model)
+                call = self.hedge_policy.race(
+                    lambda: call_model(payload, telemetry),
+                    lambda: call_model(hedge_payload, telemetry),
+                    operation
+                )
+            else:
+                call = call_model(payload, telemetry)
+            left = deadline.remaining()
+            if left is None:
+                return await call
+            try:
+                return await asyncio.wait_for(call, timeout=max(0.0, left))
+            except asyncio.TimeoutError:
+                raise deadline.DeadlineExceededError("Request deadline exceeded while waiting for the AI response")
+        
+        async def call_upstream() -> Tuple[str, Dict[str, Any]]:
+            telemetry = LLMCallTelemetry(operation, payload["model"], prompt)
+            call_started_at = time.monotonic()
+            try:
+                self._check_deadline(operation)
+                async with self.admission.admit(max_wait=deadline.remaining()):
+                    telemetry.admitted()
+                    started_at = time.monotonic()
+                    result = await call_with_deadline(telemetry)
+                    self.hedge_policy.record_completion(operation, time.monotonic() - started_at)
+            except BaseException as e:
+                telemetry.finish(outcome_for(e))
+                raise
+            telemetry.finish()
+            self._record_latency(operation, time.monotonic() - call_started_at)
+            return result, dict(telemetry.usage or {})
+        
+        if not settings.LLM_SINGLE_FLIGHT:
+            result, call_usage = await call_upstream()
+            if usage is not None:
+                usage.update(call_usage)
+            return result
+        
+        # Identical concurrent prompts share a single upstream call. It runs
+        # without this request's deadline and user, so both are applied here:
+        # a new call must fit the deadline, joining one already running is
+        # always worth it, and the wait counts against this user's cap.
+        key = completion_key(
+            payload["model"], prompt, temperature, payload["max_tokens"], "response_format" in payload
+        )
+        if not self.single_flight.is_in_flight(key):
+            self._check_deadline(operation)
+        with self.admission.hold_user(current_llm_user.get()):
+            result, call_usage = await self.single_flight.do(key, call_upstream)
+        if usage is not None:
+            usage.update(call_usage)
+        return result
     
     async def generate_json_completion(
         self,
         prompt: str,
         temperature: float = 0.7,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        hedge: bool = False,
+        schema: Optional[TypeAdapter] = None,
+        operation: str = "other",
+        usage: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         Generate a JSON completion and parse it
         
+        The API's JSON response format is requested when LLM_JSON_MODE is on.
+        
         Args:
             prompt: The prompt to send to the LLM
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
+            hedge: Send a backup request if the primary is slow
+            schema: Response schema from app.ai.response_schemas to validate against
+            operation: Metrics label for the calling operation
+            usage: Dictionary that receives the response's usage block, if the API sent one
+            
+        Returns:
+            Parsed (and validated, if a schema is given) JSON object as dictionary
+            
+        Raises:
+            Exception: If JSON parsing or validation fails
+        """
+        response_text = await self.generate_completion(
+            prompt, temperature, max_tokens, hedge=hedge, json_mode=True, operation=operation, usage=usage
+        )
+        if schema is not None:
+            return self.parse_structured_response(response_text, schema)
+        return self.parse_json_response(response_text)
+    
+    async def _stream_once(
+        self,
+        payload: Dict[str, Any],
+        timeout: float,
+        telemetry: Optional[LLMCallTelemetry] = None
+    ) -> AsyncIterator[str]:
+        """
+        Open one streaming completion request and yield its token deltas
+        
+        Args:
+            payload: Request body from _build_payload
+            timeout: Timeout in seconds for connecting and for each read
+            telemetry: Call record that receives the final chunk's usage and the quota headers
+            
+        Yields:
+            Text deltas in generation order
+            
+        Raises:
+            LLMError: If the attempt fails
+        """
+        self.circuit_breaker.acquire()
+        started_at = time.monotonic()
+        # The breaker verdict is given at the first token (or at the failure before it)
+        recorded = False
+        try:
+            async with self.http_client.stream(
+                "POST",
+                self.base_url,
+                headers=self.HEADERS,
+                json=payload,
+                timeout=timeout
+            ) as response:
+                if telemetry is not None:
+                    telemetry.observe_headers(response.headers, payload["model"])
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                
+                # Server-sent events: one "data: {...}" line per chunk, "[DONE]" at the end
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    
+                    chunk = json.loads(data)
+                    if telemetry is not None:
+                        # Groq sends usage in x_groq on the last chunk, OpenAI-compatible servers at top level
+                        usage = (chunk.get("x_groq") or {}).get("usage") or chunk.get("usage")
+                        if usage:
+                            telemetry.usage = usage
+                    choices = chunk.get("choices") or []
+                    if choices:
+                        delta = (choices[0].get("delta") or {}).get("content")
+                        if delta:
+                            if not recorded:
+                                recorded = True
+                                self.circuit_breaker.record(
+                                    success=True,
+                                    latency=time.monotonic() - started_at
+                                )
+                            yield delta
+                            
+        except Exception as e:
+            error = self._translate_error(e, timeout)
+            if not recorded:
+                recorded = True
+                self.circuit_breaker.record(
+                    success=not self._is_upstream_failure(error),
+                    latency=time.monotonic() - started_at
+                )
+            raise error
+        finally:
+            if not recorded:
+                # Empty stream or cancelled before the first token
+                self.circuit_breaker.release()
+    
+    async def _stream_with_retry(
+        self,
+        payload: Dict[str, Any],
+        telemetry: Optional[LLMCallTelemetry] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream one completion, retrying failures that happen before the first token
+        
+        Args:
+            payload: Request body from _build_payload
+            telemetry: Call record passed to every attempt
+            
+        Yields:
+            Text deltas in generation order
+            
+        Raises:
+            LLMError: If the request fails after retries or after output started
+        """
+        policy = self.retry_policy
+        started_at = time.monotonic()
+        budget = deadline.budget(policy.total_budget)
+        attempt = 0
+        
+        while True:
+            timeout = min(self.timeout, policy.remaining(started_at, budget))
+            yielded = False
+            try:
+                async for delta in self._stream_once(payload, timeout, telemetry):
+                    yielded = True
+                    yield delta
+                return
+            except LLMError as e:
+                delay = None if yielded else policy.next_delay(attempt, e, started_at, budget)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+    
+    async def stream_completion(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        hedge: bool = False,
+        operation: str = "other",
+        usage: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion from Groq LLM, yielding token deltas as they arrive
+        
+        Failures before the first token are retried like generate_completion;
+        once output has been yielded the error is raised to the caller. With
+        hedging, a backup stream is opened if the first token is late and the
+        stream that produces a token first is kept.
+        
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Sampling temperature (0-1, higher = more random)
+            max_tokens: Maximum tokens to generate (overrides default)
+            hedge: Send a backup request if the first token is slow (needs LLM_HEDGE_ENABLED)
+            operation: Metrics label for the calling operation
+            usage: Dictionary that receives the final chunk's usage block once the stream
+                is fully consumed, if the API sent one
+            
+        Yields:
+            Text deltas in generation order
+            
+        Raises:
+            LLMError: If the API request fails or the stream is malformed
+        """
+        payload = self._build_payload(prompt, temperature, max_tokens, stream=True)
+        telemetry = LLMCallTelemetry(operation, payload["model"], prompt)
+        call_started_at = time.monotonic()
+        output_chars = 0
+        
+        try:
+            # The deadline bounds the wait for the first token; output already flowing is not cut off
+            self._check_deadline(operation)
+            # The admission slot is held until the stream is fully consumed or closed
+            async with self.admission.admit(max_wait=deadline.remaining()):
+                telemetry.admitted()
+                started_at = time.monotonic()
+                try:
+                    if hedge and settings.LLM_HEDGE_ENABLED:
+                        hedge_payload = dict(payload, model=self.fallback_model)
+                        # Remember which model each stream uses so the winner is labelled correctly
+                        models = {}
+                        
+                        def open_stream(body: Dict[str, Any]) -> AsyncIterator[str]:
+                            stream = self._stream_with_retry(body, telemetry)
+                            models[stream] = body["model"]
+                            return stream
+                        
+                        stream, first = await self.hedge_policy.race_first_item(
+                            lambda: open_stream(payload),
+                            lambda: open_stream(hedge_payload),
+                            operation
+                        )
+                        telemetry.model = models[stream]
+                    else:
+                        stream = self._stream_with_retry(payload, telemetry)
+                        first = await stream.__anext__()
+                except StopAsyncIteration:
+                    telemetry.finish()
+                    return
+                
+                telemetry.first_token()
+                self.hedge_policy.record_first_token(operation, time.monotonic() - started_at)
+                
+                try:
+                    output_chars += len(first)
+                    yield first
+                    async for delta in stream:
+                        output_chars += len(delta)
+                        yield delta
+                finally:
+                    await stream.aclose()
+        except BaseException as e:
+            telemetry.output_chars = output_chars
+            telemetry.finish(outcome_for(e))
+            raise
+        
+        telemetry.output_chars = output_chars
+        telemetry.finish()
+        self._record_latency(operation, time.monotonic() - call_started_at)
+        if usage is not None and telemetry.usage:
+            usage.update(telemetry.usage)
+    
+    @staticmethod
+    def parse_json_response(response_text: str) -> Dict[str, Any]:
+        """
+        Parse a raw LLM response into a JSON object
+        
+        Markdown fences and surrounding prose are ignored, and common defects
+        (trailing commas, truncated output) are repaired instead of failing.
+        
+        Args:
+            response_text: Complete text returned by the LLM
             
         Returns:
             Parsed JSON object as dictionary
@@ -110,38 +707,64 @@ class GroqClient:
         Raises:
             Exception: If JSON parsing fails
         """
-        response_text = await self.generate_completion(prompt, temperature, max_tokens)
+        try:
+            return extract_json(response_text, expected=dict)
+        except JSONExtractionError as e:
+            raise Exception(f"Failed to parse LLM response as JSON: {str(e)}. Response: {response_text.strip()[:200]}")
+
+    @staticmethod
+    def parse_structured_response(response_text: str, schema: TypeAdapter) -> Dict[str, Any]:
+        """
+        Parse and validate a raw LLM response against a response schema
+        
+        Clean JSON is parsed, validated and coerced in a single pass; anything
+        else is extracted and repaired first.
         
-        # Try to extract JSON from the response
+        Args:
+            response_text: Complete text returned by the LLM
+            schema: Precompiled TypeAdapter from app.ai.response_schemas
+            
+        Returns:
+            Validated data as dictionary
+            
+        Raises:
+            Exception: If the response cannot be parsed
+            LLMResponseError: If it does not match the schema
+        """
         try:
-            # Sometimes LLM adds markdown code blocks, strip them
-            if "```json" in response_text:
-                # Extract content between ```json and ```
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            elif "```" in response_text:
-                # Extract content between ``` and ```
-                start = response_text.find("```") + 3
-                end = response_text.find("```", start)
-                response_text = response_text[start:end].strip()
-            
-            # Parse JSON with strict=False to allow control characters
-            return json.loads(response_text, strict=False)
-            
-        except json.JSONDecodeError as e:
-            # If parsing fails, try to find the last complete JSON object
+            value = schema.validate_json(response_text)
+        except ValidationError:
+            GroqClient._save_malformed_response(response_text)
             try:
-                # Remove any trailing incomplete content
-                last_brace = response_text.rfind('}')
-                if last_brace > 0:
-                    truncated = response_text[:last_brace + 1]
-                    return json.loads(truncated, strict=False)
-            except:
-                pass
-            
-            raise Exception(f"Failed to parse LLM response as JSON: {str(e)}. Response: {response_text[:200]}")
+                value = schema.validate_python(GroqClient.parse_json_response(response_text))
+            except ValidationError as e:
+                raise LLMResponseError(
+                    f"LLM response does not match the expected schema: {e.errors()[0]['msg']} "
+                    f"at {'.'.join(str(loc) for loc in e.errors()[0]['loc']) or 'root'}"
+                )
+        return schema.dump_python(value)
 
+    @staticmethod
+    def _save_malformed_response(response_text: str) -> None:
+        """
+        Save a response that needed extraction or repair to LLM_MALFORMED_RESPONSE_DIR
+        
+        Files are named by content hash, so repeats are stored once. They feed
+        the corpus of benchmarks/json_extract_bench.py; failures to write are
+        ignored.
+        
+        Args:
+            response_text: Complete text returned by the LLM
+        """
+        if not settings.LLM_MALFORMED_RESPONSE_DIR:
+            return
+        try:
+            directory = Path(settings.LLM_MALFORMED_RESPONSE_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            name = hashlib.sha1(response_text.encode("utf-8")).hexdigest()[:12]
+            (directory / f"{name}.txt").write_text(response_text, encoding="utf-8")
+        except OSError as e:
+            print(f"Could not save malformed LLM response: {e}")
 
 # Global instance
 groq_client = GroqClient()
@@ -0,0 +1,296 @@
+"""
+Hedged LLM Requests
+Latency-budgeted backup requests that cut tail latency
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """
+    Rolling window of recent latencies with percentile lookup
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize the tracker
+
+        Args:
+            size: Number of most recent samples to keep
+        """
+        self._samples: Deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """Add a latency sample in seconds"""
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the recorded samples
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None without samples
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(pct / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+
+class _OperationLatency:
+    """Completion and first-token latency windows of one operation"""
+
+    __slots__ = ("completion", "first_token")
+
+    def __init__(self, window: int):
+        self.completion = LatencyTracker(window)
+        self.first_token = LatencyTracker(window)
+
+
+class HedgePolicy:
+    """
+    Decides when to send a backup request and races it against the primary
+
+    The hedge delay is the configured percentile of recently observed
+    latencies (clamped to a floor), so only the slowest requests get a
+    backup. Latencies are kept per operation: a multi-topic batch or a
+    daily plan takes far longer than a single explanation, and must not
+    push up the delay used to hedge teach-topic calls. Hedges are capped
+    at a fraction of all hedgeable requests to keep the extra upstream
+    load bounded.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        min_delay: float,
+        default_delay: float,
+        min_samples: int,
+        max_rate: float,
+        window: int = 200
+    ):
+        """
+        Initialize the hedge policy
+
+        Args:
+            percentile: Latency percentile used as the hedge delay (e.g. 95)
+            min_delay: Lower bound for the hedge delay in seconds
+            default_delay: Delay used until enough samples are recorded
+            min_samples: Samples required before the percentile is trusted
+            max_rate: Maximum fraction of requests that may be hedged
+            window: Number of recent latencies kept per operation and tracker
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.max_rate = max_rate
+        self.window = window
+
+        self._latency: Dict[str, _OperationLatency] = {}
+
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+
+    def _operation(self, operation: str) -> _OperationLatency:
+        """Latency windows of an operation, created on first use"""
+        latency = self._latency.get(operation)
+        if latency is None:
+            latency = self._latency[operation] = _OperationLatency(self.window)
+        return latency
+
+    def record_completion(self, operation: str, seconds: float) -> None:
+        """Add the latency of a completed non-streaming call of an operation"""
+        self._operation(operation).completion.record(seconds)
+
+    def record_first_token(self, operation: str, seconds: float) -> None:
+        """Add the time to first token of a streaming call of an operation"""
+        self._operation(operation).first_token.record(seconds)
+
+    def delay(self, tracker: LatencyTracker) -> float:
+        """
+        Current hedge delay for a latency tracker
+
+        Args:
+            tracker: One of an operation's latency windows
+
+        Returns:
+            Seconds to wait for the primary before hedging
+        """
+        observed = tracker.percentile(self.percentile)
+        if observed is None or len(tracker) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, observed)
+
+    def completion_delay(self, operation: str) -> float:
+        """
+        Hedge delay for a non-streaming call of an operation
+
+        Args:
+            operation: Metrics label of the call
+
+        Returns:
+            Seconds to wait for the primary before hedging
+        """
+        return self.delay(self._operation(operation).completion)
+
+    def first_token_delay(self, operation: str) -> float:
+        """
+        Hedge delay for the first token of a streaming call of an operation
+
+        Args:
+            operation: Metrics label of the call
+
+        Returns:
+            Seconds to wait for the primary's first token before hedging
+        """
+        return self.delay(self._operation(operation).first_token)
+
+    def _may_hedge(self) -> bool:
+        """Whether firing another hedge stays within the hedge-rate budget"""
+        return self.hedges_fired + 1 <= self.max_rate * self.requests
+
+    async def race(
+        self,
+        start_primary: Callable[[], Awaitable[T]],
+        start_hedge: Callable[[], Awaitable[T]],
+        operation: str = "other"
+    ) -> T:
+        """
+        Run the primary call, hedging it if it is slower than the hedge delay
+
+        The first successful result wins and the other call is cancelled. If
+        both fail, the primary's error is raised.
+
+        Args:
+            start_primary: Coroutine factory for the primary request
+            start_hedge: Coroutine factory for the backup request
+            operation: Metrics label of the call, whose completion latency sets the delay
+
+        Returns:
+            Result of the winning call
+        """
+        self.requests += 1
+        primary = asyncio.ensure_future(start_primary())
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.completion_delay(operation))
+            if done or not self._may_hedge():
+                return await primary
+
+            self.hedges_fired += 1
+            hedge = asyncio.ensure_future(start_hedge())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            raise primary.exception()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def race_first_item(
+        self,
+        start_primary: Callable[[], AsyncIterator[T]],
+        start_hedge: Callable[[], AsyncIterator[T]],
+        operation: str = "other"
+    ) -> Tuple[AsyncIterator[T], T]:
+        """
+        Race two streams to their first item, hedging after the first-token delay
+
+        The losing stream is cancelled and closed.
+
+        Args:
+            start_primary: Factory for the primary stream
+            start_hedge: Factory for the backup stream
+            operation: Metrics label of the call, whose first-token latency sets the delay
+
+        Returns:
+            (winning stream, its first item); the caller keeps consuming the stream
+
+        Raises:
+            StopAsyncIteration: If the winning stream is empty
+        """
+        self.requests += 1
+        streams: Dict["asyncio.Future[Any]", AsyncIterator[T]] = {}
+
+        primary_stream = start_primary()
+        primary = asyncio.ensure_future(primary_stream.__anext__())
+        streams[primary] = primary_stream
+        hedge = None
+        winner = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.first_token_delay(operation))
+            if done or not self._may_hedge():
+                winner = primary
+                return primary_stream, await primary
+
+            self.hedges_fired += 1
+            hedge_stream = start_hedge()
+            hedge = asyncio.ensure_future(hedge_stream.__anext__())
+            streams[hedge] = hedge_stream
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = task
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return streams[task], task.result()
+            winner = primary
+            raise primary.exception()
+        finally:
+            for task, stream in streams.items():
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except BaseException:
+                        pass
+                await stream.aclose()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hedging counters for monitoring
+
+        Returns:
+            Dictionary with hedge rate, win rate and each operation's current delays
+        """
+        return {
+            "requests": self.requests,
+            "hedges_fired": self.hedges_fired,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges_fired / self.requests, 3) if self.requests else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedges_fired, 3) if self.hedges_fired else 0.0,
+            "default_delay": self.default_delay,
+            "operations": {
+                operation: {
+                    "completion_delay": round(self.delay(latency.completion), 3),
+                    "completion_samples": len(latency.completion),
+                    "first_token_delay": round(self.delay(latency.first_token), 3),
+                    "first_token_samples": len(latency.first_token)
+                }
+                for operation, latency in sorted(self._latency.items())
+            }
+        }
@@ -0,0 +1,210 @@
+"""
+JSON Extraction
+Single-pass extractor and repairer for JSON embedded in LLM output
+"""
+
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+_decoder = json.JSONDecoder(strict=False)
+
+# Characters that matter outside and inside JSON strings
+_STRUCTURAL = re.compile(r'["{}\[\],]')
+_IN_STRING = re.compile(r'["\\]')
+_OPENER = re.compile(r'[{\[]')
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+_MISSING = object()
+
+
+class JSONExtractionError(ValueError):
+    """No JSON value could be extracted from the text"""
+
+
+def extract_json(text: str, expected: Optional[type] = None) -> Any:
+    """
+    Extract the first top-level JSON value of the expected shape from LLM output
+
+    Well-formed JSON (possibly surrounded by prose or markdown fences) is
+    decoded directly; anything else goes through the repairing scanner.
+    Bracketed spans that are not JSON (e.g. "{day, topic}" in prose) or
+    decode to the wrong shape (e.g. "[1]" before the object) are skipped
+    and the next one after them is tried.
+
+    Args:
+        text: Raw LLM response
+        expected: Type the value must have (dict or list), or None for any
+
+    Returns:
+        The first decoded value of the expected type, or else the first
+        decoded value of any type
+
+    Raises:
+        JSONExtractionError: If no JSON value can be recovered
+    """
+    match = _OPENER.search(text)
+    if match is None:
+        raise JSONExtractionError("No JSON object or array found")
+    fallback = _MISSING
+    error = None
+
+    # Fast path: C decoder from each opener, ignoring anything after the value
+    while match is not None:
+        try:
+            value, end = _decoder.raw_decode(text, match.start())
+        except json.JSONDecodeError as e:
+            error = e
+            break
+        if expected is None or isinstance(value, expected):
+            return value
+        if fallback is _MISSING:
+            fallback = value
+        match = _OPENER.search(text, end)
+
+    while match is not None:
+        repaired, end = _repair(text, match.start())
+        try:
+            value = _decoder.decode(repaired)
+        except json.JSONDecodeError as e:
+            error = e
+        else:
+            if expected is None or isinstance(value, expected):
+                return value
+            if fallback is _MISSING:
+                fallback = value
+        match = _OPENER.search(text, end)
+
+    if fallback is not _MISSING:
+        return fallback
+    raise JSONExtractionError(f"Unrecoverable JSON ({error})")
+
+
+def repair_json(text: str) -> str:
+    """
+    Rewrite the first JSON value in a text into valid JSON
+
+    Scans once while tracking string/escape state and bracket depth. Drops
+    prose before and after the value and trailing commas before a closer.
+    If the text ends mid-value (truncated output), it is cut back to the
+    end of the last complete element of the outermost open array, so an
+    unfinished element is dropped whole rather than kept with some of its
+    fields ('{"plan": [{"day": 1}, {"day": 2, "to' gives one day). With no
+    array open, the members of the open objects are kept up to the last
+    complete one. The open arrays and objects are then closed.
+
+    Args:
+        text: Raw LLM response
+
+    Returns:
+        Repaired JSON text
+
+    Raises:
+        JSONExtractionError: If the text has no opening bracket
+    """
+    match = _OPENER.search(text)
+    if match is None:
+        raise JSONExtractionError("No JSON object or array found")
+    return _repair(text, match.start())[0]
+
+
+def _repair(text: str, start: int) -> Tuple[str, int]:
+    """
+    Repair the bracketed value opening at start
+
+    Returns:
+        (repaired JSON text, index just past the scanned span)
+    """
+    out: List[str] = []
+    size = 0  # characters in out
+    stack: List[str] = []  # expected closers
+    outer_array = -1  # stack index of the outermost open array
+    # Last point where the output ends between whole elements: (output size, open closers)
+    safe: Tuple[int, Tuple[str, ...]] = (0, ())
+    pos = start
+    length = len(text)
+
+    while pos < length:
+        match = _STRUCTURAL.search(text, pos)
+        if match is None:
+            out.append(text[pos:])
+            size += length - pos
+            pos = length
+            break
+
+        index = match.start()
+        char = text[index]
+        if index > pos:
+            out.append(text[pos:index])
+            size += index - pos
+        pos = index + 1
+
+        if char == '"':
+            # Copy the whole string, honouring escapes
+            end = _string_end(text, pos)
+            if end < 0:
+                pos = length
+                break  # truncated inside a string
+            out.append(text[index:end])
+            size += end - index
+            pos = end
+        elif char in "{[":
+            stack.append(_CLOSERS[char])
+            if char == "[" and outer_array < 0:
+                outer_array = len(stack) - 1
+            out.append(char)
+            size += 1
+            if outer_array < 0 or len(stack) == outer_array + 1:
+                safe = (size, tuple(stack))
+        elif char in "}]":
+            size = _strip_trailing_comma(out, size)
+            out.append(stack.pop())
+            size += 1
+            if not stack:
+                return "".join(out), pos
+            if len(stack) == outer_array:
+                outer_array = -1
+            if outer_array < 0 or len(stack) == outer_array + 1:
+                safe = (size, tuple(stack))
+        else:  # comma
+            if outer_array < 0 or len(stack) == outer_array + 1:
+                safe = (size, tuple(stack))
+            out.append(char)
+            size += 1
+
+    # Truncated: keep the last complete prefix and close what is still open
+    cut, open_closers = safe
+    return _truncate("".join(out), cut) + "".join(reversed(open_closers)), pos
+
+
+def _string_end(text: str, pos: int) -> int:
+    """Index just past the closing quote of a string starting before pos, or -1"""
+    while True:
+        match = _IN_STRING.search(text, pos)
+        if match is None:
+            return -1
+        if match.group() == '"':
+            return match.end()
+        pos = match.end() + 1  # skip the escaped character
+
+
+def _strip_trailing_comma(out: List[str], size: int) -> int:
+    """Remove a trailing comma (and whitespace after it) from the output"""
+    while out:
+        tail = out[-1].rstrip()
+        if tail.endswith(","):
+            stripped = tail[:-1]
+            size -= len(out[-1]) - len(stripped)
+            out[-1] = stripped
+            return size
+        if tail:
+            return size
+        size -= len(out.pop())
+    return size
+
+
+def _truncate(text: str, cut: int) -> str:
+    """Cut the text at a safe point, dropping a dangling comma"""
+    text = text[:cut].rstrip()
+    return text[:-1] if text.endswith(",") else text
@@ -0,0 +1,140 @@
+"""
+Incremental JSON Stream Parser
+Extracts complete array elements from a JSON document while it is still streaming
+"""
+
+import json
+from typing import Dict, Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for the elements of one array inside a streamed JSON object
+
+    Feed it text chunks as they arrive from the LLM; every call returns the
+    array elements that became complete with that chunk. Consumed text is
+    discarded, so memory use stays proportional to a single element rather
+    than to the whole response.
+
+    Example:
+        parser = JSONArrayStreamParser("daily_plan")
+        for chunk in chunks:
+            for day in parser.feed(chunk):
+                ...
+    """
+
+    def __init__(self, array_key: str):
+        """
+        Initialize the parser
+
+        Args:
+            array_key: Name of the object key whose array elements are emitted
+        """
+        self.key_token = json.dumps(array_key)
+        self.found_array = False
+        self.finished = False
+
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._element_start = -1
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Consume a chunk of streamed text
+
+        Args:
+            chunk: Next piece of the LLM response
+
+        Returns:
+            Array elements completed by this chunk (objects that fail to decode are skipped)
+        """
+        if self.finished:
+            return []
+
+        self._buffer += chunk
+
+        if not self.found_array and not self._seek_array():
+            return []
+
+        elements = self._scan_elements()
+
+        # Drop everything already consumed, keeping a partial element if one is open
+        keep_from = self._element_start if self._element_start >= 0 else self._pos
+        if keep_from > 0:
+            self._buffer = self._buffer[keep_from:]
+            self._pos -= keep_from
+            if self._element_start >= 0:
+                self._element_start = 0
+
+        return elements
+
+    def _seek_array(self) -> bool:
+        """
+        Look for the target key followed by the opening bracket of its array
+
+        Returns:
+            True once the scanner is positioned just inside the array
+        """
+        key_index = self._buffer.find(self.key_token)
+        if key_index < 0:
+            return False
+
+        bracket_index = self._buffer.find("[", key_index + len(self.key_token))
+        if bracket_index < 0:
+            return False
+
+        self.found_array = True
+        self._pos = bracket_index + 1
+        return True
+
+    def _scan_elements(self) -> List[Dict[str, Any]]:
+        """
+        Scan the buffered text for array elements that are now complete
+
+        Returns:
+            Decoded elements in order of appearance
+        """
+        elements = []
+        buffer = self._buffer
+        pos = self._pos
+        length = len(buffer)
+
+        while pos < length:
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                if self._depth == 0:
+                    self._element_start = pos
+                self._depth += 1
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0 and self._element_start >= 0:
+                    raw = buffer[self._element_start:pos + 1]
+                    self._element_start = -1
+                    try:
+                        element = json.loads(raw, strict=False)
+                    except json.JSONDecodeError:
+                        element = None
+                    if isinstance(element, dict):
+                        elements.append(element)
+            elif char == "]" and self._depth == 0:
+                self.finished = True
+                pos += 1
+                break
+
+            pos += 1
+
+        self._pos = pos
+        return elements
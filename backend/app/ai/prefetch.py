@@ -0,0 +1,179 @@
+"""
+Background Prefetching
+Low-priority warming of LLM result caches that yields to interactive traffic
+"""
+
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.ai.errors import LLMUnavailableError
+from app.ai.groq_client import groq_client
+from app.core.metrics import Counter, metrics_registry
+
+prefetch_items = metrics_registry.register(Counter(
+    "llm_prefetch_items_total",
+    "Items offered to a prefetcher by what happened to them",
+    ("prefetcher", "result")
+))
+prefetch_lookups = metrics_registry.register(Counter(
+    "llm_prefetch_lookups_total",
+    "Interactive cache lookups: served by a prefetched entry, another cached entry, or missed",
+    ("prefetcher", "result")
+))
+
+
+class BackgroundPrefetcher:
+    """
+    Single background task that loads queued keys one at a time
+
+    Prefetches never compete with users: each load waits until LLM
+    admission utilization is at or below `max_utilization` and the circuit
+    breaker admits calls, and loads are spaced `min_interval` seconds
+    apart. Keys that are already cached or already queued are skipped, and
+    a full queue drops new keys rather than growing.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[str, Any], Awaitable[Any]],
+        is_cached: Callable[[str], bool],
+        max_pending: int,
+        min_interval: float,
+        max_utilization: float,
+        tracked_keys: int = 10000
+    ):
+        """
+        Initialize the prefetcher
+
+        Args:
+            name: Label used in metrics
+            loader: Coroutine function loading (key, item) into the cache
+            is_cached: Whether a fresh value for key is already cached
+            max_pending: Most keys waiting to be loaded
+            min_interval: Seconds between two loads
+            max_utilization: Admission utilization above which loads wait
+            tracked_keys: Prefetched keys remembered for hit accounting
+        """
+        self.name = name
+        self.loader = loader
+        self.is_cached = is_cached
+        self.max_pending = max_pending
+        self.min_interval = min_interval
+        self.max_utilization = max_utilization
+        self.tracked_keys = tracked_keys
+
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._pending: Dict[str, Any] = {}
+        self._prefetched: "OrderedDict[str, None]" = OrderedDict()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def submit(self, key: str, item: Any) -> bool:
+        """
+        Queue a key for loading
+
+        Args:
+            key: Cache key
+            item: Argument passed to the loader with the key
+
+        Returns:
+            True if the key was queued
+        """
+        if key in self._pending:
+            return False
+        if self.is_cached(key):
+            prefetch_items.inc((self.name, "already_cached"))
+            return False
+        if len(self._pending) >= self.max_pending:
+            prefetch_items.inc((self.name, "dropped"))
+            return False
+        self._pending[key] = item
+        self._queue.put_nowait(key)
+        prefetch_items.inc((self.name, "queued"))
+        return True
+
+    def record_lookup(self, key: str) -> None:
+        """
+        Count an interactive lookup of key (call before the cache is read)
+
+        Args:
+            key: Cache key being looked up
+        """
+        if not self.is_cached(key):
+            result = "miss"
+        elif key in self._prefetched:
+            result = "prefetched"
+        else:
+            result = "cached"
+        prefetch_lookups.inc((self.name, result))
+
+    async def _wait_for_capacity(self) -> None:
+        """Sleep until interactive traffic leaves room for a background call"""
+        while True:
+            if groq_client.admission.utilization() <= self.max_utilization:
+                try:
+                    groq_client.ensure_available()
+                    return
+                except LLMUnavailableError as e:
+                    await asyncio.sleep(max(self.min_interval, e.retry_after or 0.0))
+                    continue
+            await asyncio.sleep(self.min_interval)
+
+    async def _run(self) -> None:
+        """Load queued keys one at a time until cancelled"""
+        while True:
+            key = await self._queue.get()
+            item = self._pending.get(key)
+            try:
+                if self.is_cached(key):
+                    prefetch_items.inc((self.name, "already_cached"))
+                    continue
+                await self._wait_for_capacity()
+                try:
+                    await self.loader(key, item)
+                except Exception as e:
+                    prefetch_items.inc((self.name, "failed"))
+                    print(f"Prefetch failed for {key!r}: {e}")
+                else:
+                    prefetch_items.inc((self.name, "loaded"))
+                    self._prefetched[key] = None
+                    self._prefetched.move_to_end(key)
+                    while len(self._prefetched) > self.tracked_keys:
+                        self._prefetched.popitem(last=False)
+                await asyncio.sleep(self.min_interval)
+            finally:
+                self._pending.pop(key, None)
+
+    def start(self) -> None:
+        """Start the background task (idempotent)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def close(self) -> None:
+        """Stop the background task, abandoning queued keys"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue state and lookup hit rates for monitoring
+
+        Returns:
+            Dictionary with pending keys, counters and the share of lookups served by prefetches
+        """
+        items = {result: int(prefetch_items.value((self.name, result)))
+                 for result in ("queued", "already_cached", "dropped", "loaded", "failed")}
+        lookups = {result: int(prefetch_lookups.value((self.name, result)))
+                   for result in ("prefetched", "cached", "miss")}
+        total = sum(lookups.values())
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "pending": len(self._pending),
+            "items": items,
+            "lookups": lookups,
+            "prefetch_hit_ratio": round(lookups["prefetched"] / total, 3) if total else 0.0,
+            "hit_ratio": round((lookups["prefetched"] + lookups["cached"]) / total, 3) if total else 0.0
+        }
@@ -9,6 +9,9 @@ class PromptTemplates:
     Centralized prompt templates for AI services
     """
     
+    # Bump whenever a prompt changes so cached generations are not reused
+    VERSION = "1"
+    
     @staticmethod
     def roadmap_generation(role_name: str, duration_days: int = 90) -> str:
         """
@@ -93,6 +96,55 @@ Requirements:
 - Topics should build progressively
 - Cover fundamentals to advanced concepts
 
+Return ONLY the JSON object, no additional text."""
+    
+    @staticmethod
+    def daily_plan_segment(
+        role_name: str,
+        duration_days: int,
+        start_day: int,
+        end_day: int,
+        phase: str = None,
+        phase_topics: list = None
+    ) -> str:
+        """
+        Generate a prompt for one day range of a long daily learning plan
+        
+        Args:
+            role_name: The job role or career path
+            duration_days: Total number of days in the full plan
+            start_day: First day of this segment
+            end_day: Last day of this segment (inclusive)
+            phase: Optional roadmap phase the segment belongs to
+            phase_topics: Optional roadmap topics for that phase
+            
+        Returns:
+            Formatted prompt string
+        """
+        days = end_day - start_day + 1
+        phase_text = f"\nThis part covers the \"{phase}\" phase of the roadmap." if phase else ""
+        if phase_topics:
+            phase_text += f"\nPhase topics to cover: {', '.join(str(t) for t in phase_topics)}"
+        
+        return f"""You are a learning plan expert. You are writing days {start_day} to {end_day} of a {duration_days}-day study plan for: {role_name}{phase_text}
+
+Your response MUST be a valid JSON object with this EXACT structure:
+{{
+    "daily_plan": [
+        {{
+            "day": {start_day},
+            "topic": "Focused topic for day {start_day}",
+            "estimated_hours": 3
+        }}
+    ]
+}}
+
+Requirements:
+- Create exactly {days} daily entries, numbered {start_day} to {end_day}
+- Each day should have a focused, specific topic that is not repeated
+- Estimated hours should be realistic (2-6 hours per day)
+- Topics should build progressively and fit this point of the overall plan
+
 Return ONLY the JSON object, no additional text."""
     
     @staticmethod
@@ -193,3 +245,61 @@ Your entire response must be parseable by JSON.parse(). Start with {{ and end wi
 - Ensure the JSON is complete and valid
 
 Make the explanation practical and actionable. Return ONLY the JSON object, no additional text."""
+    
+    @staticmethod
+    def teach_topics(topics: list, context: str = None) -> str:
+        """
+        Generate one prompt that teaches several topics at once
+        
+        The shared instructions are sent once instead of once per topic.
+        Each explanation has the same shape as teach_topic's response and
+        carries the topic's 1-based "id" so answers can be matched back.
+        
+        Args:
+            topics: Topics to explain, in order
+            context: Optional additional context applying to every topic
+            
+        Returns:
+            Formatted prompt string
+        """
+        context_text = f"\n\nAdditional context: {context}" if context else ""
+        topic_list = "\n".join(f"{i}. {topic}" for i, topic in enumerate(topics, start=1))
+        
+        return f"""You are an expert teacher. Explain each of the following {len(topics)} topics:
+{topic_list}{context_text}
+
+CRITICAL: Your response must be ONLY a JSON object. NO code examples, NO markdown, NO explanations outside the JSON.
+
+Return this EXACT JSON structure, with one entry per topic in the order given:
+{{
+    "topics": [
+        {{
+            "id": 1,
+            "topic": "Topic 1 exactly as written above",
+            "explanation": "A clear, detailed explanation of the topic. Use \\n for line breaks within this string.",
+            "examples": [
+                "Example 1: Brief description of the example",
+                "Example 2: Brief description of the example",
+                "Example 3: Brief description of the example"
+            ],
+            "resources": [
+                "Official Documentation: [actual official docs URL for the topic]",
+                "GeeksforGeeks Tutorial: https://www.geeksforgeeks.org/[topic-name-with-hyphens]/",
+                "W3Schools Guide: https://www.w3schools.com/[relevant-section]",
+                "Code With Harry - [topic]: https://www.youtube.com/results?search_query=code+with+harry+[topic+with+plus+signs]",
+                "Apna College - [topic]: https://www.youtube.com/results?search_query=apna+college+[topic+with+plus+signs]",
+                "Chai aur Code - [topic]: https://www.youtube.com/results?search_query=chai+aur+code+[topic+with+plus+signs]",
+                "Scaler Article: https://www.scaler.com/topics/[language]/[topic-name]/"
+            ]
+        }}
+    ]
+}}
+
+REQUIREMENTS:
+- Exactly {len(topics)} entries, "id" 1 to {len(topics)} matching the numbered topics
+- Official documentation must be the EXACT real URL for the topic (MDN, docs.python.org, react.dev, nodejs.org, docs.oracle.com, ...)
+- Replace every [placeholder] with the topic-specific value; all URLs must follow the real URL structure of these platforms
+- Keep examples as text descriptions, not actual code
+- Use \\n for line breaks inside JSON strings and escape quotes properly; no actual line breaks inside string values
+
+Make each explanation practical and actionable. Return ONLY the JSON object, no additional text."""
@@ -0,0 +1,90 @@
+"""
+LLM Response Schemas
+Pydantic models for the JSON each prompt in PromptTemplates asks for
+"""
+
+from typing import Annotated, Any, Dict, List, Optional
+
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, TypeAdapter
+
+
+def _to_int(value: Any) -> Any:
+    """Round numeric values ("3.5", 3.5) to int, leave the rest to pydantic"""
+    if isinstance(value, str):
+        try:
+            value = float(value.strip())
+        except ValueError:
+            return value
+    if isinstance(value, float):
+        return int(round(value))
+    return value
+
+
+def _to_optional_int(value: Any) -> Any:
+    """Like _to_int, but unusable values become None instead of an error"""
+    value = _to_int(value)
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _to_text(value: Any) -> Any:
+    """Flatten numbers and small objects the LLM sometimes returns for strings"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, dict):
+        return " - ".join(str(item) for item in value.values() if item not in (None, ""))
+    return value
+
+
+Number = Annotated[int, BeforeValidator(_to_int)]
+OptionalNumber = Annotated[Optional[int], BeforeValidator(_to_optional_int)]
+Text = Annotated[str, BeforeValidator(_to_text)]
+
+
+class LearningPhase(BaseModel):
+    """One phase of a roadmap learning_path"""
+    phase: Text = ""
+    topics: List[Text] = []
+    duration_weeks: OptionalNumber = None
+
+
+class RoadmapOutput(BaseModel):
+    """Response to PromptTemplates.roadmap_generation"""
+    model_config = ConfigDict(extra="allow")
+
+    role: Text = ""
+    required_skills: List[Text] = []
+    learning_path: List[LearningPhase] = []
+    recommended_projects: List[Text] = []
+
+
+class DailyPlanEntry(BaseModel):
+    """One day of a daily_plan array"""
+    day: Number = 0
+    topic: Text = Field(..., min_length=1)
+    estimated_hours: Number = 3
+
+
+class DailyPlanOutput(BaseModel):
+    """
+    Response to PromptTemplates.daily_plan_generation and daily_plan_segment
+
+    Entries stay raw so one bad day can be skipped without rejecting the
+    whole plan; validate them with DAILY_PLAN_ENTRY_SCHEMA.
+    """
+    total_days: OptionalNumber = None
+    daily_plan: List[Dict[str, Any]]
+
+
+class TeachTopicOutput(BaseModel):
+    """Response to PromptTemplates.teach_topic"""
+    topic: Text = ""
+    explanation: Text = ""
+    examples: List[Text] = []
+    resources: List[Text] = []
+
+
+# Compiled once at import and shared by every request
+ROADMAP_SCHEMA = TypeAdapter(RoadmapOutput)
+DAILY_PLAN_SCHEMA = TypeAdapter(DailyPlanOutput)
+DAILY_PLAN_ENTRY_SCHEMA = TypeAdapter(DailyPlanEntry)
+TEACH_TOPIC_SCHEMA = TypeAdapter(TeachTopicOutput)
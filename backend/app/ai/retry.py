@@ -0,0 +1,201 @@
+"""
+LLM Retry Engine
+Exponential backoff with full jitter, Retry-After support and a total time budget
+"""
+
+import asyncio
+import random
+import re
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Mapping, Optional, TypeVar
+
+from app.ai.errors import LLMError
+
+T = TypeVar("T")
+
+# Groq reports rate-limit resets as Go-style durations, e.g. "2m59.56s", "7.66s", "120ms"
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+RATE_LIMIT_RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """
+    Parse a Go-style duration string into seconds
+
+    Args:
+        value: Duration such as "1m30s", "7.66s" or "250ms"
+
+    Returns:
+        Duration in seconds, or None if the value is not a duration
+    """
+    value = value.strip()
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Extract the server-suggested retry delay from response headers
+
+    Honours Retry-After (seconds or HTTP date) first, then the longest of
+    the x-ratelimit-reset-* headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        Delay in seconds, or None if the server gave no hint
+    """
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            try:
+                when = parsedate_to_datetime(retry_after)
+                return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                pass
+
+    resets = []
+    for header in RATE_LIMIT_RESET_HEADERS:
+        value = headers.get(header)
+        if value:
+            seconds = parse_duration(value)
+            if seconds is None:
+                try:
+                    seconds = float(value)
+                except ValueError:
+                    continue
+            resets.append(seconds)
+
+    return max(resets) if resets else None
+
+
+class RetryPolicy:
+    """
+    Retry schedule for LLM calls
+
+    Delays follow exponential backoff with full jitter unless the server
+    asks for a specific wait. No attempt is started, and no sleep is taken,
+    that would run past the total time budget.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        total_budget: float
+    ):
+        """
+        Initialize the retry policy
+
+        Args:
+            max_attempts: Total attempts including the first one
+            base_delay: Backoff base in seconds
+            max_delay: Upper bound for a single backoff sleep in seconds
+            total_budget: Wall-clock budget in seconds across all attempts
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.total_budget = total_budget
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Full-jitter backoff for a zero-based retry attempt
+
+        Args:
+            attempt: Number of attempts already made minus one
+
+        Returns:
+            Sleep duration in seconds
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def remaining(self, started_at: float, budget: Optional[float] = None) -> float:
+        """
+        Seconds left in the budget
+
+        Args:
+            started_at: time.monotonic() when the first attempt started
+            budget: Budget override in seconds (defaults to total_budget)
+
+        Returns:
+            Remaining seconds (may be negative)
+        """
+        budget = self.total_budget if budget is None else budget
+        return budget - (time.monotonic() - started_at)
+
+    def next_delay(
+        self,
+        attempt: int,
+        error: Exception,
+        started_at: float,
+        budget: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt
+
+        Args:
+            attempt: Zero-based index of the attempt that just failed
+            error: The failure raised by that attempt
+            started_at: time.monotonic() when the first attempt started
+            budget: Budget override in seconds (defaults to total_budget)
+
+        Returns:
+            Seconds to sleep before the next attempt, or None to give up
+        """
+        if not isinstance(error, LLMError) or not error.retryable:
+            return None
+        if attempt + 1 >= self.max_attempts:
+            return None
+
+        delay = self.backoff(attempt)
+        if error.retry_after is not None:
+            delay = error.retry_after
+
+        # Leave time for the next attempt to actually do something
+        if delay >= self.remaining(started_at, budget):
+            return None
+        return delay
+
+    async def call(
+        self,
+        operation: Callable[[float], Awaitable[T]],
+        default_timeout: float,
+        budget: Optional[float] = None
+    ) -> T:
+        """
+        Run an operation with retries
+
+        Args:
+            operation: Coroutine factory taking the per-attempt timeout in seconds
+            default_timeout: Upper bound for a single attempt in seconds
+            budget: Budget override in seconds (defaults to total_budget)
+
+        Returns:
+            Result of the first successful attempt
+
+        Raises:
+            LLMError: The last failure once retries are exhausted
+        """
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            timeout = min(default_timeout, self.remaining(started_at, budget))
+            try:
+                return await operation(timeout)
+            except LLMError as e:
+                delay = self.next_delay(attempt, e, started_at, budget)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
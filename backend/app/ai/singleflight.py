@@ -0,0 +1,145 @@
+"""
+Single-Flight Request Coalescing
+Concurrent identical LLM calls share one upstream request
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app.core import deadline
+
+T = TypeVar("T")
+
+
+def completion_key(
+    model: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    json_mode: bool = False
+) -> str:
+    """
+    Build the coalescing key for a completion request
+
+    Args:
+        model: Model name
+        prompt: Full prompt text
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+        json_mode: Whether the JSON response format was requested
+
+    Returns:
+        Hex digest identifying the request
+    """
+    raw = json.dumps([model, prompt, temperature, max_tokens, json_mode], separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    """An in-flight shared call and the number of callers awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key
+
+    The first caller for a key starts the work in its own task; callers that
+    arrive while it is running await the same task and receive the same
+    result or exception. The shared task is only cancelled when every caller
+    waiting on it has been cancelled or has run out of time.
+
+    The task runs in an empty context rather than a copy of the first
+    caller's: it has no request deadline and no current LLM user, so one
+    caller's short deadline or admission limit cannot fail the call for
+    everyone else. Each caller instead stops waiting at its own deadline.
+    """
+
+    def __init__(self):
+        """Initialize an empty in-flight table"""
+        self._calls: Dict[str, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run factory() once per key among concurrent callers
+
+        Args:
+            key: Coalescing key
+            factory: Coroutine factory performing the actual work
+
+        Returns:
+            Result of the shared call
+
+        Raises:
+            DeadlineExceededError: If the caller's deadline passes before the call finishes
+        """
+        call = self._calls.get(key)
+        if call is None:
+            task = asyncio.get_running_loop().create_task(factory(), context=contextvars.Context())
+            call = _Call(task)
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _task, key=key, call=call: self._forget(key, call))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            left = deadline.remaining()
+            if left is None:
+                return await asyncio.shield(call.task)
+            # asyncio.wait neither cancels the task on timeout nor confuses a
+            # TimeoutError raised by the task with the caller's own
+            done, _ = await asyncio.wait((call.task,), timeout=max(0.0, left))
+            if not done:
+                raise deadline.DeadlineExceededError("Request deadline exceeded while waiting for the AI response")
+            return call.task.result()
+        except (asyncio.CancelledError, deadline.DeadlineExceededError):
+            # Last interested caller gone: stop paying for the upstream call
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    def is_in_flight(self, key: str) -> bool:
+        """
+        Whether a shared call is currently running for key
+
+        Args:
+            key: Coalescing key
+
+        Returns:
+            True if a call is in flight
+        """
+        return key in self._calls
+
+    def _forget(self, key: str, call: _Call) -> None:
+        """Remove a finished call from the in-flight table"""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Coalescing statistics
+
+        Returns:
+            Dictionary with executed and coalesced call counts
+        """
+        total = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.executions,
+            "coalesced_calls": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 3) if total else 0.0
+        }
@@ -0,0 +1,234 @@
+"""
+LLM Call Telemetry
+Per-call latency, token usage and outcome metrics for upstream LLM calls
+"""
+
+import asyncio
+import time
+from typing import Any, Mapping, Optional
+
+from app.ai.errors import (
+    AdmissionRejectedError,
+    CircuitOpenError,
+    LLMConnectionError,
+    LLMResponseError,
+    LLMTimeoutError,
+    LLMUpstreamError
+)
+from app.ai.token_budget import CHARS_PER_TOKEN
+from app.core.deadline import DeadlineExceededError
+from app.core.metrics import Counter, Gauge, Histogram, metrics_registry
+
+llm_requests = metrics_registry.register(Counter(
+    "llm_requests_total",
+    "Upstream LLM calls by outcome",
+    ("operation", "model", "outcome")
+))
+llm_queue_seconds = metrics_registry.register(Histogram(
+    "llm_queue_seconds",
+    "Time spent waiting for an admission slot",
+    ("operation",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+))
+llm_time_to_first_token_seconds = metrics_registry.register(Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from admission to the first streamed token",
+    ("operation", "model")
+))
+llm_request_duration_seconds = metrics_registry.register(Histogram(
+    "llm_request_duration_seconds",
+    "Time from admission to the end of the call, retries included",
+    ("operation", "model", "outcome")
+))
+llm_tokens = metrics_registry.register(Counter(
+    "llm_tokens_total",
+    "Prompt and completion tokens reported by the API (estimated when absent)",
+    ("operation", "model", "type")
+))
+llm_completion_tokens_per_second = metrics_registry.register(Histogram(
+    "llm_completion_tokens_per_second",
+    "Generation throughput of successful calls",
+    ("operation", "model"),
+    buckets=(10, 25, 50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000)
+))
+llm_ratelimit_remaining = metrics_registry.register(Gauge(
+    "llm_ratelimit_remaining",
+    "Remaining upstream quota from the last x-ratelimit-remaining-* headers",
+    ("model", "kind")
+))
+
+llm_cancelled_tokens_saved = metrics_registry.register(Counter(
+    "llm_cancelled_tokens_saved_total",
+    "Completion tokens not generated because the call was cancelled (estimated from recent successful calls)",
+    ("operation", "model")
+))
+
+RATELIMIT_HEADERS = (
+    ("x-ratelimit-remaining-requests", "requests"),
+    ("x-ratelimit-remaining-tokens", "tokens")
+)
+
+# Moving average of completion tokens per successful call, by operation
+EXPECTED_TOKENS_WEIGHT = 0.1
+expected_completion_tokens = {}
+
+
+def outcome_for(error: BaseException) -> str:
+    """
+    Metric label for how a call ended
+
+    Args:
+        error: Exception that ended the call
+
+    Returns:
+        Short outcome name such as "timeout" or "rate_limited"
+    """
+    if isinstance(error, LLMTimeoutError):
+        return "timeout"
+    if isinstance(error, LLMConnectionError):
+        return "connection_error"
+    if isinstance(error, LLMUpstreamError):
+        return "rate_limited" if error.status_code == 429 else "upstream_error"
+    if isinstance(error, LLMResponseError):
+        return "invalid_response"
+    if isinstance(error, DeadlineExceededError):
+        return "deadline_exceeded"
+    if isinstance(error, AdmissionRejectedError):
+        return "rejected"
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, (asyncio.CancelledError, GeneratorExit)):
+        return "cancelled"
+    return "error"
+
+
+class LLMCallTelemetry:
+    """
+    Timings and usage of one logical LLM call
+
+    Created when the call starts waiting for admission and finished exactly
+    once. Recording happens in finish(), so the request path only pays for a
+    few attribute writes.
+    """
+
+    __slots__ = (
+        "operation", "model", "prompt_chars", "output_chars", "usage",
+        "started_at", "admitted_at", "first_token_at", "finished"
+    )
+
+    def __init__(self, operation: str, model: str, prompt: str):
+        """
+        Start timing a call
+
+        Args:
+            operation: Caller-level operation name (roadmap, daily_plan, teach_topic, ...)
+            model: Model requested in the payload
+            prompt: Prompt text, used to estimate tokens when the API reports no usage
+        """
+        self.operation = operation
+        self.model = model
+        self.prompt_chars = len(prompt)
+        self.output_chars = 0
+        self.usage: Optional[Mapping[str, Any]] = None
+        self.started_at = time.monotonic()
+        self.admitted_at: Optional[float] = None
+        self.first_token_at: Optional[float] = None
+        self.finished = False
+
+    def admitted(self) -> None:
+        """Mark the end of the admission queue wait"""
+        self.admitted_at = time.monotonic()
+
+    def first_token(self) -> None:
+        """Mark the first streamed token (later calls are ignored)"""
+        if self.first_token_at is None:
+            self.first_token_at = time.monotonic()
+
+    def observe_headers(self, headers: Mapping[str, str], model: str) -> None:
+        """
+        Update the remaining-quota gauges from a response
+
+        Args:
+            headers: Upstream response headers
+            model: Model the request was sent to (quotas are per model)
+        """
+        for header, kind in RATELIMIT_HEADERS:
+            value = headers.get(header)
+            if value is not None:
+                try:
+                    llm_ratelimit_remaining.set((model, kind), float(value))
+                except ValueError:
+                    pass
+
+    def observe_result(self, model: str, usage: Optional[Mapping[str, Any]], output_chars: int) -> None:
+        """
+        Keep the details of the attempt whose output is returned
+
+        Args:
+            model: Model that produced the output (the fallback model for a winning hedge)
+            usage: The response's usage block, if the API sent one
+            output_chars: Length of the generated text
+        """
+        self.model = model
+        if usage:
+            self.usage = usage
+        self.output_chars = output_chars
+
+    def finish(self, outcome: str = "success") -> None:
+        """
+        Record the call's metrics
+
+        Args:
+            outcome: "success" or a label from outcome_for
+        """
+        if self.finished:
+            return
+        self.finished = True
+        now = time.monotonic()
+        operation, model = self.operation, self.model
+
+        llm_requests.inc((operation, model, outcome))
+        if outcome == "cancelled":
+            self._record_saved_tokens()
+        if self.admitted_at is None:
+            # Never got a slot: all of the time was queueing
+            llm_queue_seconds.observe((operation,), now - self.started_at)
+            return
+        llm_queue_seconds.observe((operation,), self.admitted_at - self.started_at)
+        llm_request_duration_seconds.observe((operation, model, outcome), now - self.admitted_at)
+        if self.first_token_at is not None:
+            llm_time_to_first_token_seconds.observe((operation, model), self.first_token_at - self.admitted_at)
+
+        usage = self.usage or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        completion_tokens = usage.get("completion_tokens")
+        if prompt_tokens is None and outcome == "success":
+            prompt_tokens = int(self.prompt_chars / CHARS_PER_TOKEN)
+        if completion_tokens is None:
+            completion_tokens = int(self.output_chars / CHARS_PER_TOKEN)
+        if prompt_tokens:
+            llm_tokens.inc((operation, model, "prompt"), prompt_tokens)
+        if completion_tokens:
+            llm_tokens.inc((operation, model, "completion"), completion_tokens)
+
+        if outcome == "success" and completion_tokens:
+            expected = expected_completion_tokens.get(operation)
+            expected_completion_tokens[operation] = completion_tokens if expected is None else (
+                expected + EXPECTED_TOKENS_WEIGHT * (completion_tokens - expected)
+            )
+            # Groq reports pure generation time; otherwise time after the first token (or admission)
+            generation_seconds = usage.get("completion_time") or (now - (self.first_token_at or self.admitted_at))
+            if generation_seconds > 0:
+                llm_completion_tokens_per_second.observe((operation, model), completion_tokens / generation_seconds)
+
+    def _record_saved_tokens(self) -> None:
+        """Count the completion tokens a cancelled call did not generate"""
+        expected = expected_completion_tokens.get(self.operation)
+        if expected is None:
+            return
+        generated = int(self.output_chars / CHARS_PER_TOKEN)
+        if (self.usage or {}).get("completion_tokens"):
+            generated = self.usage["completion_tokens"]
+        saved = int(expected - generated)
+        if saved > 0:
+            llm_cancelled_tokens_saved.inc((self.operation, self.model), saved)
@@ -0,0 +1,143 @@
+"""
+Token Budgeting
+Prompt token estimates and history-based max_tokens for list-shaped LLM output
+"""
+
+import math
+from typing import Any, Dict, Optional
+
+# Average characters per token for English/JSON text on Llama tokenizers
+CHARS_PER_TOKEN = 4.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without loading a tokenizer
+
+    Args:
+        text: Prompt or completion text
+
+    Returns:
+        Approximate number of tokens
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+class TokenBudgetExceededError(ValueError):
+    """A single LLM call would need more tokens than the model allows"""
+
+    def __init__(self, message: str, prompt_tokens: int, output_tokens: int):
+        super().__init__(message)
+        self.prompt_tokens = prompt_tokens
+        self.output_tokens = output_tokens
+
+
+class TokenBudget:
+    """
+    Output-token estimator for responses made of N similar entries
+
+    Tokens per entry start at a configured seed and follow an exponentially
+    weighted moving average of observed completions, so max_tokens tracks
+    what the model actually produces.
+    """
+
+    def __init__(
+        self,
+        tokens_per_entry: float,
+        overhead_tokens: int,
+        margin: float,
+        context_window: int,
+        max_output_tokens: int,
+        smoothing: float = 0.2
+    ):
+        """
+        Initialize the budget
+
+        Args:
+            tokens_per_entry: Initial estimate of output tokens per entry
+            overhead_tokens: Output tokens outside the entries (wrapper object)
+            margin: Safety multiplier applied to the estimate
+            context_window: Model context window (prompt + output)
+            max_output_tokens: Model limit for max_tokens
+            smoothing: EWMA weight of each new observation
+        """
+        self.tokens_per_entry = tokens_per_entry
+        self.overhead_tokens = overhead_tokens
+        self.margin = margin
+        self.context_window = context_window
+        self.max_output_tokens = max_output_tokens
+        self.smoothing = smoothing
+        self.observations = 0
+
+    def observe(self, output_text: str, entries: int, completion_tokens: Optional[int] = None) -> None:
+        """
+        Update the per-entry estimate from a finished completion
+
+        Every caller observes the same thing, the tokens the model generated:
+        the API's completion_tokens when it reports usage, otherwise an
+        estimate from the raw completion text (not a re-serialisation of the
+        parsed result, whose whitespace differs).
+
+        Args:
+            output_text: Raw completion text
+            entries: Number of entries it contained
+            completion_tokens: Generated tokens reported by the API, if any
+        """
+        if entries <= 0:
+            return
+        generated = completion_tokens if completion_tokens else estimate_tokens(output_text)
+        per_entry = max(0, generated - self.overhead_tokens) / entries
+        self.tokens_per_entry += self.smoothing * (per_entry - self.tokens_per_entry)
+        self.observations += 1
+
+    def max_tokens_for(self, prompt: str, entries: int) -> int:
+        """
+        max_tokens for a call expected to return the given number of entries
+
+        Args:
+            prompt: Prompt text sent to the model
+            entries: Number of entries requested
+
+        Returns:
+            Output token budget for the call
+
+        Raises:
+            TokenBudgetExceededError: If the call cannot fit the model limits
+        """
+        prompt_tokens = estimate_tokens(prompt)
+        output_tokens = math.ceil(
+            (self.overhead_tokens + self.tokens_per_entry * entries) * self.margin
+        )
+
+        if output_tokens > self.max_output_tokens:
+            raise TokenBudgetExceededError(
+                f"{entries} entries need about {output_tokens} output tokens, "
+                f"more than the model limit of {self.max_output_tokens}",
+                prompt_tokens,
+                output_tokens
+            )
+        if prompt_tokens + output_tokens > self.context_window:
+            raise TokenBudgetExceededError(
+                f"Prompt ({prompt_tokens}) plus output ({output_tokens}) tokens exceed "
+                f"the {self.context_window}-token context window",
+                prompt_tokens,
+                output_tokens
+            )
+        return output_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current estimate for monitoring
+
+        Returns:
+            Dictionary with tokens per entry and observation count
+        """
+        return {
+            "tokens_per_entry": round(self.tokens_per_entry, 2),
+            "observations": self.observations,
+            "max_entries": int(
+                (self.max_output_tokens / self.margin - self.overhead_tokens) // max(self.tokens_per_entry, 1)
+            )
+        }
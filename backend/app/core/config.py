@@ -4,6 +4,7 @@ Loads environment variables and provides centralized configuration settings.
 """
 
 from pydantic_settings import BaseSettings
+from sqlalchemy.engine import make_url
 from typing import Optional, List
 import os
 
@@ -26,6 +27,13 @@ class Settings(BaseSettings):
     DB_USER: Optional[str] = None
     DB_PASSWORD: Optional[str] = None
     
+    # Database connection pool (per engine, per process)
+    DB_POOL_SIZE: int = 5  # connections kept open
+    DB_MAX_OVERFLOW: int = 10  # extra connections opened under load
+    DB_POOL_TIMEOUT: float = 30.0  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced; -1 = never
+    DB_POOL_LIVENESS_INTERVAL: float = 0.0  # seconds; > 0 replaces per-checkout pre-ping with a background check
+    
     # JWT Configuration
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
@@ -34,8 +42,99 @@ class Settings(BaseSettings):
     # LLM Configuration (Phase 3)
     LLM_API_KEY: str
     LLM_MODEL_NAME: str = "llama-3.1-8b-instant"
+    LLM_BASE_URL: Optional[str] = None  # chat completions URL override (e.g. the local fake server)
     LLM_TIMEOUT: int = 30  # seconds
     LLM_MAX_TOKENS: int = 2048
+    LLM_JSON_MODE: bool = True  # request JSON object responses for structured (non-streaming) calls
+    LLM_MALFORMED_RESPONSE_DIR: Optional[str] = None  # save responses that needed JSON repair here (benchmark corpus)
+    
+    # Model limits and daily-plan token budgeting
+    LLM_CONTEXT_WINDOW: int = 131072  # prompt + output tokens
+    LLM_MAX_OUTPUT_TOKENS: int = 8192  # largest max_tokens the model accepts
+    DAILY_PLAN_TOKENS_PER_DAY: float = 30.0  # initial estimate, learned from responses
+    DAILY_PLAN_TOKEN_MARGIN: float = 1.25  # headroom over the estimate
+    
+    # Long daily plans are generated as concurrent day-range segments
+    DAILY_PLAN_SEGMENT_DAYS: int = 30  # longest segment (and longest single-call plan)
+    DAILY_PLAN_SEGMENT_CONCURRENCY: int = 4  # segments in flight per plan
+    
+    # LLM HTTP Connection Pool (shared client, opened with the app lifespan)
+    LLM_HTTP2: bool = True
+    LLM_POOL_MAX_CONNECTIONS: int = 20
+    LLM_POOL_MAX_KEEPALIVE: int = 10
+    LLM_POOL_KEEPALIVE_EXPIRY: float = 30.0  # seconds
+    
+    # LLM Retries (exponential backoff with full jitter, honours Retry-After)
+    LLM_RETRY_MAX_ATTEMPTS: int = 3
+    LLM_RETRY_BASE_DELAY: float = 0.5  # seconds
+    LLM_RETRY_MAX_DELAY: float = 8.0  # seconds
+    LLM_RETRY_TOTAL_BUDGET: float = 45.0  # seconds across all attempts
+    
+    # LLM Circuit Breaker (sliding window over recent upstream calls)
+    LLM_BREAKER_WINDOW_SECONDS: float = 60.0
+    LLM_BREAKER_MIN_CALLS: int = 10
+    LLM_BREAKER_ERROR_RATE: float = 0.5  # failure ratio that opens the breaker
+    LLM_BREAKER_SLOW_CALL_SECONDS: float = 20.0
+    LLM_BREAKER_SLOW_CALL_RATE: float = 0.8  # slow-call ratio that opens the breaker
+    LLM_BREAKER_OPEN_SECONDS: float = 30.0
+    LLM_BREAKER_HALF_OPEN_CALLS: int = 2
+    
+    # Coalesce identical in-flight LLM prompts into one upstream call
+    LLM_SINGLE_FLIGHT: bool = True
+    
+    # Admission control for upstream LLM calls
+    LLM_MAX_CONCURRENCY: int = 16  # service-wide running calls
+    LLM_MAX_CONCURRENCY_PER_USER: int = 2  # running + queued calls per user
+    LLM_MAX_QUEUE: int = 64  # calls allowed to wait for a slot
+    LLM_MAX_QUEUE_SECONDS: float = 10.0  # longest wait for a slot
+    
+    # Hedged requests (opt-in): backup call after a percentile-based delay
+    LLM_HEDGE_ENABLED: bool = False
+    LLM_FALLBACK_MODEL_NAME: Optional[str] = None  # model for the backup call
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_DELAY: float = 1.0  # seconds
+    LLM_HEDGE_DEFAULT_DELAY: float = 5.0  # seconds, until enough samples exist
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    LLM_HEDGE_MAX_RATE: float = 0.1  # max fraction of requests that get hedged
+    
+    # Teach-topic result cache (in-process LRU with TTL)
+    TEACH_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    TEACH_CACHE_TTL_SECONDS: float = 24 * 3600
+    TEACH_CACHE_STALE_SECONDS: float = 3600  # served stale while refreshing
+    
+    # Batch teach-topic requests (/ai/teach-topics)
+    TEACH_BATCH_TOPICS_PER_PROMPT: int = 4  # most topics packed into one LLM call
+    TEACH_BATCH_CONCURRENCY: int = 4  # LLM calls in flight per batch request
+    TEACH_TOPIC_TOKENS: float = 700.0  # initial output tokens per explanation, learned from responses
+    
+    # Teach-topic prefetching (warms the cache for the upcoming days of active plans)
+    TEACH_PREFETCH_ENABLED: bool = True
+    TEACH_PREFETCH_DAYS: int = 3  # upcoming days warmed per plan, today included
+    TEACH_PREFETCH_SWEEP_SECONDS: float = 3600.0  # how often active plans are scanned
+    TEACH_PREFETCH_MAX_ROLES: int = 500  # most recently created active plans per scan
+    TEACH_PREFETCH_MAX_PENDING: int = 2000  # queued topics; more are dropped
+    TEACH_PREFETCH_MIN_INTERVAL: float = 2.0  # seconds between prefetch LLM calls
+    TEACH_PREFETCH_MAX_UTILIZATION: float = 0.5  # share of LLM_MAX_CONCURRENCY in use above which prefetching pauses
+    
+    # Shared roadmap / daily-plan template cache (database)
+    TEMPLATE_CACHE_ENABLED: bool = True
+    TEMPLATE_CACHE_MAX_AGE_HOURS: float = 168  # 0 = never expires
+    
+    # Background generation jobs (drained by worker.py)
+    JOB_WORKER_CONCURRENCY: int = 4  # jobs run at once per worker process
+    JOB_POLL_INTERVAL: float = 1.0  # seconds between polls of an empty queue
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_LEASE_SECONDS: float = 600.0  # running jobs whose lease is older than this are reclaimed
+    JOB_HEARTBEAT_SECONDS: float = 60.0  # how often a running job renews its lease
+    JOB_MAX_PENDING_PER_USER: int = 5  # queued + running jobs per user
+    
+    # End-to-end request deadlines (clients may send X-Request-Timeout: <seconds>)
+    REQUEST_TIMEOUT_ROADMAP: float = 60.0  # seconds, /ai/generate-roadmap (+ /stream)
+    REQUEST_TIMEOUT_DAILY_PLAN: float = 120.0  # seconds, /ai/generate-daily-plan
+    REQUEST_TIMEOUT_TEACH: float = 45.0  # seconds, /ai/teach-topic (+ /stream) and /ai/teach-topics
+    REQUEST_TIMEOUT_MAX: float = 300.0  # cap on X-Request-Timeout
+    REQUEST_MIN_LLM_SECONDS: float = 2.0  # LLM calls with less time left are refused with 504
+    DB_STATEMENT_TIMEOUT: float = 30.0  # seconds (Postgres), for requests without a deadline; 0 = none
     
     # CORS Settings (production-safe with environment variable support)
     CORS_ORIGINS: List[str] = []
@@ -72,7 +171,25 @@ class Settings(BaseSettings):
             return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         
         raise ValueError("Database configuration missing. Set DATABASE_URL or individual DB_* variables")
-    
+
+    @property
+    def async_database_url(self) -> str:
+        """
+        Get the database URL with an asyncio driver (asyncpg / aiosqlite)
+        Used by the async engine; the sync engine keeps database_url
+        """
+        url = make_url(self.database_url)
+        backend = url.get_backend_name()
+        if backend == "postgresql":
+            query = dict(url.query)
+            # asyncpg spells psycopg2's sslmode as ssl
+            if "sslmode" in query:
+                query["ssl"] = query.pop("sslmode")
+            url = url.set(drivername="postgresql+asyncpg", query=query)
+        elif backend == "sqlite":
+            url = url.set(drivername="sqlite+aiosqlite")
+        return url.render_as_string(hide_password=False)
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,30 +1,83 @@
 """
 Database Connection and Session Management
-Sets up SQLAlchemy engine and session factory
+Sets up SQLAlchemy engines and session factories
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import AsyncIterator
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from app.core import deadline
 from app.core.config import settings
+from app.core.db_pool import engine_options
 
-# Create database engine
+# Create database engine (scripts, migrations and other blocking callers)
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,  # Enable connection health checks
-    echo=settings.DEBUG   # Log SQL queries in debug mode
+    echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **engine_options(settings.database_url, "sync")
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the API routes, services and worker (asyncpg / aiosqlite)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=settings.DEBUG,
+    **engine_options(settings.async_database_url, "async", is_async=True)
+)
+
+# Objects stay loaded after commit: attribute access on an AsyncSession
+# must never trigger an implicit (blocking) refresh
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# Postgres SQLSTATE for a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+
+@event.listens_for(Session, "after_begin")
+def apply_statement_timeout(session, transaction, connection):
+    """
+    Bound every statement of a new transaction by the request's remaining time
+
+    Registered on the Session class so sync and async sessions are both
+    covered. Without a request deadline DB_STATEMENT_TIMEOUT applies. SET
+    LOCAL lasts until the transaction ends, so pooled connections are
+    unaffected.
+
+    Raises:
+        DeadlineExceededError: If the deadline has already passed
+    """
+    seconds = deadline.check(what="the database query")
+    if seconds is None:
+        seconds = settings.DB_STATEMENT_TIMEOUT or None
+    elif settings.DB_STATEMENT_TIMEOUT:
+        seconds = min(seconds, settings.DB_STATEMENT_TIMEOUT)
+
+    if seconds and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(seconds * 1000))}")
+
+
+@event.listens_for(engine, "handle_error")
+@event.listens_for(async_engine.sync_engine, "handle_error")
+def translate_statement_timeout(context):
+    """Report a statement cancelled by the request deadline as a deadline error"""
+    error = context.original_exception
+    sqlstate = getattr(error, "pgcode", None) or getattr(error, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED and deadline.remaining() is not None:
+        raise deadline.DeadlineExceededError("Request deadline exceeded during a database query") from error
+
 
-def get_db():
+async def get_db() -> AsyncIterator[AsyncSession]:
     """
     Dependency function to get database session
-    Yields a database session and ensures it's closed after use
+    Yields an async database session and ensures it's closed after use
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
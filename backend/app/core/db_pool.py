@@ -0,0 +1,186 @@
+"""
+Database Connection Pool
+Pool sizing, saturation metrics and background liveness checks for the SQLAlchemy engines
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+from app.core.metrics import Counter, Gauge, Histogram, metrics_registry
+
+pool_checkout_wait = metrics_registry.register(Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent getting a pooled connection, including opening a new one",
+    ("pool",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+))
+pool_checkout_timeouts = metrics_registry.register(Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT because every connection was in use",
+    ("pool",)
+))
+pool_connections = metrics_registry.register(Gauge(
+    "db_pool_connections",
+    "Pooled connections in use and idle, and the most the pool may open (capacity)",
+    ("pool", "state")
+))
+pool_liveness_checks = metrics_registry.register(Counter(
+    "db_pool_liveness_checks_total",
+    "Background pings of idle pooled connections by result",
+    ("pool", "result")
+))
+
+
+class _InstrumentedPoolMixin:
+    """
+    Pool hooks that keep the db_pool_* metrics current
+
+    SQLAlchemy's pool events fire after a connection has been handed out
+    and before it is back in the queue, so neither the wait for a
+    connection nor the idle count after a checkin can be observed from
+    them; the two queue operations are wrapped instead.
+    """
+
+    def _refresh_gauges(self) -> None:
+        """Publish the current in-use and idle counts"""
+        pool_connections.set((self.logging_name, "in_use"), self.checkedout())
+        pool_connections.set((self.logging_name, "idle"), self.checkedin())
+        if self._max_overflow >= 0:
+            pool_connections.set((self.logging_name, "capacity"), self.size() + self._max_overflow)
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_checkout_timeouts.inc((self.logging_name,))
+            raise
+        finally:
+            pool_checkout_wait.observe((self.logging_name,), time.perf_counter() - started_at)
+            self._refresh_gauges()
+
+    def _do_return_conn(self, record) -> None:
+        super()._do_return_conn(record)
+        self._refresh_gauges()
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool for the sync engine, with checkout metrics"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool for the async engine, with checkout metrics"""
+
+
+def engine_options(url: str, name: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Pool keyword arguments for create_engine / create_async_engine
+
+    In-memory SQLite keeps SQLAlchemy's single-connection pool. With
+    DB_POOL_LIVENESS_INTERVAL set, the async engine skips the per-checkout
+    pre-ping and relies on run_liveness_checks instead; the sync engine,
+    used by short scripts without that task, always pre-pings.
+
+    Args:
+        url: Database URL the engine connects to
+        name: Pool label used in metrics ("async" or "sync")
+        is_async: Whether the options are for the async engine
+
+    Returns:
+        Dictionary of engine keyword arguments
+    """
+    options: Dict[str, Any] = {
+        "pool_pre_ping": not (is_async and settings.DB_POOL_LIVENESS_INTERVAL > 0),
+        "pool_logging_name": name
+    }
+    if make_url(url).database in (None, "", ":memory:"):
+        return options
+    options.update(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE
+    )
+    return options
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Connection pool statistics for sizing the pool under load
+
+    Args:
+        engine: Sync engine (use AsyncEngine.sync_engine for the async one)
+
+    Returns:
+        Dictionary with the pool settings, in-use/idle counts and checkout timeouts
+    """
+    pool = engine.pool
+    stats = {
+        "pool_class": type(pool).__name__,
+        "pre_ping": bool(getattr(pool, "_pre_ping", False)),
+        "liveness_interval": settings.DB_POOL_LIVENESS_INTERVAL
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            recycle=pool._recycle,
+            in_use=pool.checkedout(),
+            idle=pool.checkedin(),
+            checkout_timeouts=int(pool_checkout_timeouts.value((pool.logging_name,)))
+        )
+    return stats
+
+
+async def check_liveness(engine: AsyncEngine) -> int:
+    """
+    Ping each idle pooled connection once
+
+    Connections are checked out one at a time; the pool hands them out
+    oldest-returned first, so a round visits every idle connection while
+    holding at most one. A failed ping is a disconnect, on which
+    SQLAlchemy invalidates the whole pool: every older connection is
+    replaced at its next checkout instead of failing a request.
+
+    Args:
+        engine: Async engine whose pool is checked
+
+    Returns:
+        Number of connections that answered
+    """
+    pool = engine.sync_engine.pool
+    name = pool.logging_name
+    alive = 0
+    for _ in range(max(1, pool.checkedin())):
+        try:
+            async with engine.connect() as connection:
+                await connection.exec_driver_sql("SELECT 1")
+        except Exception as e:
+            pool_liveness_checks.inc((name, "failed"))
+            print(f"Database liveness check failed: {e}")
+            break
+        pool_liveness_checks.inc((name, "ok"))
+        alive += 1
+    return alive
+
+
+async def run_liveness_checks(engine: AsyncEngine, interval: float) -> None:
+    """
+    Check the pool every `interval` seconds until cancelled
+
+    Args:
+        engine: Async engine whose pool is checked
+        interval: Seconds between rounds
+    """
+    while True:
+        await asyncio.sleep(interval)
+        await check_liveness(engine)
@@ -0,0 +1,150 @@
+"""
+Request Deadlines
+Per-request time budget shared by the routes, services, LLM client and database
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.ai.errors import LLMUnavailableError
+from app.core.config import settings
+
+# Header clients use to shorten (or, up to REQUEST_TIMEOUT_MAX, extend) a route's default
+DEADLINE_HEADER = "X-Request-Timeout"
+
+# time.monotonic() by which the current request must be answered (None = no deadline)
+current_deadline: ContextVar[Optional[float]] = ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceededError(LLMUnavailableError):
+    """
+    The request's deadline has passed, or leaves too little time for the next step
+
+    A subclass of LLMUnavailableError so that every layer that already
+    passes fast-fail LLM rejections through unwrapped does the same for
+    deadlines, and the routes answer with its status code (504).
+    """
+
+    status_code = 504
+
+
+def set_deadline(seconds: float) -> None:
+    """
+    Give the current request `seconds` from now to finish
+
+    Args:
+        seconds: Time budget in seconds
+    """
+    current_deadline.set(time.monotonic() + seconds)
+
+
+def clear_deadline() -> None:
+    """Lift the deadline for the rest of the current request (e.g. once a stream is flowing)"""
+    current_deadline.set(None)
+
+
+@contextmanager
+def lifted() -> Iterator[None]:
+    """
+    Run a block without the request deadline, restoring it afterwards
+
+    For work that must finish once started, such as persisting an LLM
+    result that has already been paid for.
+    """
+    token = current_deadline.set(None)
+    try:
+        yield
+    finally:
+        current_deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """
+    Seconds left before the current request's deadline
+
+    Returns:
+        Remaining seconds (negative once passed), or None without a deadline
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check(needed: float = 0.0, what: str = "the request") -> Optional[float]:
+    """
+    Refuse work that cannot finish before the deadline
+
+    Args:
+        needed: Seconds the next step is expected to take
+        what: Description of the step, for the error message
+
+    Returns:
+        Remaining seconds, or None without a deadline
+
+    Raises:
+        DeadlineExceededError: If less than `needed` seconds are left
+    """
+    left = remaining()
+    if left is None:
+        return None
+    if left <= 0:
+        raise DeadlineExceededError(f"Request deadline exceeded before {what}")
+    if left < needed:
+        raise DeadlineExceededError(
+            f"Not enough time left for {what} ({left:.1f}s left, about {needed:.1f}s needed)"
+        )
+    return left
+
+
+def budget(limit: float) -> float:
+    """
+    A time limit shortened to fit the remaining deadline
+
+    Args:
+        limit: The step's own limit in seconds
+
+    Returns:
+        min(limit, remaining seconds), or limit without a deadline
+    """
+    left = remaining()
+    return limit if left is None else max(0.0, min(limit, left))
+
+
+def request_deadline(default_seconds: float) -> Callable:
+    """
+    Build a route dependency that starts the request's deadline
+
+    The client may send `X-Request-Timeout: <seconds>` to use a different
+    budget, capped at REQUEST_TIMEOUT_MAX.
+
+    Args:
+        default_seconds: The route's budget when the header is absent
+
+    Returns:
+        Async dependency returning the budget in seconds
+    """
+    async def dependency(request: Request) -> float:
+        seconds = default_seconds
+        header = request.headers.get(DEADLINE_HEADER)
+        if header is not None:
+            try:
+                seconds = float(header)
+            except ValueError:
+                seconds = 0.0
+            if not seconds > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{DEADLINE_HEADER} must be a positive number of seconds"
+                )
+        seconds = min(seconds, settings.REQUEST_TIMEOUT_MAX)
+        # Async dependencies run in the endpoint's context, so the route and
+        # everything it awaits see this value
+        set_deadline(seconds)
+        return seconds
+
+    return dependency
@@ -0,0 +1,40 @@
+"""
+Role Catalog Model
+Tracks the roles and durations pre-generated by the offline catalog builder
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Float, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+
+class RoleCatalogEntry(Base):
+    """
+    One (role, duration) pair of the pre-generated catalog and its build status
+
+    The generated content lives in the pinned GenerationTemplate it points to.
+    """
+    __tablename__ = "role_catalog"
+    __table_args__ = (
+        UniqueConstraint("role_key", "duration_days", "prompt_version", name="uq_role_catalog_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    role_key = Column(String, nullable=False)
+    role_name = Column(String, nullable=False)
+    duration_days = Column(Integer, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, ready, failed
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    build_seconds = Column(Float, nullable=True)
+    template_id = Column(Integer, ForeignKey("generation_templates.id", ondelete="SET NULL"), nullable=True)
+    built_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    template = relationship("GenerationTemplate")
+
+    def __repr__(self):
+        return f"<RoleCatalogEntry(id={self.id}, role_key={self.role_key}, days={self.duration_days}, status={self.status})>"
@@ -0,0 +1,46 @@
+"""
+Generation Job Model
+Durable queue of roadmap / daily-plan generations run by the worker process
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+
+class GenerationJob(Base):
+    """
+    One queued LLM generation and its outcome
+
+    Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED, so
+    any number of worker processes can drain the table without handing the
+    same job to two of them.
+    """
+    __tablename__ = "generation_jobs"
+    __table_args__ = (
+        Index("ix_generation_jobs_claim", "status", "run_after", "id"),
+        Index("ix_generation_jobs_user_status", "user_id", "status"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    kind = Column(String, nullable=False)  # roadmap, daily_plan
+    status = Column(String, nullable=False, default="queued")  # queued, running, succeeded, failed
+    payload = Column(Text, nullable=False)  # JSON request body
+    result = Column(Text, nullable=True)  # JSON response body once succeeded
+    error = Column(Text, nullable=True)
+    error_status = Column(Integer, nullable=True)  # HTTP status the result endpoint answers with on failure
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    run_after = Column(DateTime, nullable=False, server_default=func.now())
+    locked_at = Column(DateTime, nullable=True)  # claim time, for reclaiming jobs of dead workers
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Relationships
+    user = relationship("User")
+
+    def __repr__(self):
+        return f"<GenerationJob(id={self.id}, kind={self.kind}, status={self.status})>"
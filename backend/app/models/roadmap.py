@@ -3,7 +3,7 @@ Roadmap Models
 Defines Roadmap, DailyPlan, and TopicProgress tables
 """
 
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -14,6 +14,9 @@ class Roadmap(Base):
     Roadmap model for career learning paths
     """
     __tablename__ = "roadmaps"
+    __table_args__ = (
+        Index("ix_roadmaps_user_role_id", "user_role_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_role_id = Column(Integer, ForeignKey("user_roles.id", ondelete="CASCADE"), nullable=False)
@@ -32,6 +35,9 @@ class DailyPlan(Base):
     Daily Plan model for daily learning tasks
     """
     __tablename__ = "daily_plans"
+    __table_args__ = (
+        Index("ix_daily_plans_user_role_id_day_number", "user_role_id", "day_number"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_role_id = Column(Integer, ForeignKey("user_roles.id", ondelete="CASCADE"), nullable=False)
@@ -52,6 +58,9 @@ class TopicProgress(Base):
     Topic Progress model for tracking learning progress
     """
     __tablename__ = "topic_progress"
+    __table_args__ = (
+        Index("ix_topic_progress_daily_plan_id", "daily_plan_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     daily_plan_id = Column(Integer, ForeignKey("daily_plans.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,60 @@
+"""
+Generation Template Models
+Defines the shared roadmap / daily-plan template cache tables
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.base import Base
+
+
+class GenerationTemplate(Base):
+    """
+    Generated roadmap and daily plan shared by every user who picks the same
+    (normalised role, duration, prompt version)
+    """
+    __tablename__ = "generation_templates"
+    __table_args__ = (
+        UniqueConstraint("role_key", "duration_days", "prompt_version", name="uq_generation_templates_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    role_key = Column(String, nullable=False)
+    duration_days = Column(Integer, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    roadmap_text = Column(Text, nullable=True)
+    roadmap_generated_at = Column(DateTime, nullable=True)
+    daily_plan_generated_at = Column(DateTime, nullable=True)
+    pinned = Column(Boolean, nullable=False, default=False, server_default="false")  # built by the catalog CLI, never expires
+    created_at = Column(DateTime, server_default=func.now())
+
+    # Relationships
+    daily_plans = relationship(
+        "TemplateDailyPlan",
+        back_populates="template",
+        cascade="all, delete-orphan",
+        order_by="TemplateDailyPlan.day_number"
+    )
+
+    def __repr__(self):
+        return f"<GenerationTemplate(id={self.id}, role_key={self.role_key}, days={self.duration_days})>"
+
+
+class TemplateDailyPlan(Base):
+    """
+    One day of a template daily plan, copied into daily_plans on a cache hit
+    """
+    __tablename__ = "template_daily_plans"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    template_id = Column(Integer, ForeignKey("generation_templates.id", ondelete="CASCADE"), nullable=False, index=True)
+    day_number = Column(Integer, nullable=False)
+    topic = Column(Text, nullable=False)
+    estimated_hours = Column(Integer, nullable=False)
+
+    # Relationships
+    template = relationship("GenerationTemplate", back_populates="daily_plans")
+
+    def __repr__(self):
+        return f"<TemplateDailyPlan(id={self.id}, template_id={self.template_id}, day={self.day_number})>"
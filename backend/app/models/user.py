@@ -3,7 +3,7 @@ User Model
 Defines the User and UserRole tables
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.base import Base
@@ -34,6 +34,10 @@ class UserRole(Base):
     User Role model for role-based access control
     """
     __tablename__ = "user_roles"
+    __table_args__ = (
+        # One learning goal per role name and user, whatever the capitalisation
+        Index("uq_user_roles_user_id_role_name", "user_id", text("lower(role_name)"), unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
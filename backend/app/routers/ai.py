@@ -3,11 +3,19 @@ AI Router
 Handles AI-powered endpoints for roadmap generation, daily plans, and topic teaching
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+import asyncio
+import json
+import math
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Any, AsyncIterator, Awaitable, Optional, TypeVar
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.deadline import clear_deadline, request_deadline
+from app.core.metrics import Counter, metrics_registry
 from app.models.user import User, UserRole
 from app.models.roadmap import DailyPlan, Roadmap
 from app.utils.jwt import get_current_user
@@ -18,30 +26,183 @@ from app.schemas.ai import (
     DailyPlanResponse,
     DailyPlanItem,
     TeachTopicRequest,
-    TeachTopicResponse
+    TeachTopicsRequest,
+    TeachTopicResponse,
+    JobAcceptedResponse,
+    JobStatusResponse
 )
 from app.services.ai_service import AIService
+from app.services.job_service import JobService, TooManyJobsError
+from app.services.prefetch_service import PrefetchService
+from app.ai.admission import current_llm_user
+from app.ai.errors import LLMUnavailableError
+from app.ai.groq_client import groq_client
 
 router = APIRouter(prefix="/ai", tags=["AI & LLM"])
 
+T = TypeVar("T")
+
+# Non-standard status (nginx convention) logged when the client went away first
+CLIENT_CLOSED_REQUEST = 499
+
+client_disconnects = metrics_registry.register(Counter(
+    "ai_client_disconnects_total",
+    "AI requests abandoned by the client before the response was complete",
+    ("route",)
+))
+
+# Headers that keep proxies from buffering server-sent events
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no"
+}
+
+
+def _sse_event(event: str, data: Any) -> str:
+    """
+    Format a single server-sent event
+    
+    Args:
+        event: Event name ("delta", "done" or "error")
+        data: JSON-serializable payload
+        
+    Returns:
+        Encoded SSE frame
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _unavailable_exception(error: LLMUnavailableError) -> HTTPException:
+    """
+    Convert a fast-fail LLM rejection into an HTTP error with Retry-After
+    
+    Args:
+        error: Rejection raised before any upstream call was made
+        
+    Returns:
+        HTTPException carrying the rejection status and Retry-After header
+    """
+    retry_after = max(1, math.ceil(error.retry_after or 1))
+    return HTTPException(
+        status_code=error.status_code,
+        detail=str(error),
+        headers={"Retry-After": str(retry_after)}
+    )
+
+
+class ClientDisconnected(Exception):
+    """The client closed the connection while the route was still working"""
+
+
+async def _cancel_on_disconnect(
+    request: Request,
+    work: Awaitable[T],
+    route: str,
+    db: Optional[AsyncSession] = None
+) -> T:
+    """
+    Await work, cancelling it if the client disconnects first
+    
+    Cancellation reaches the in-flight upstream LLM request (and releases
+    its admission slot); anything the work wrote to `db` is rolled back.
+    
+    Args:
+        request: Incoming request, whose body has already been read
+        work: Route's LLM / database work
+        route: Metrics label for the route
+        db: Session to roll back when the work is cancelled
+        
+    Returns:
+        Result of work
+        
+    Raises:
+        ClientDisconnected: If the client went away before work finished
+    """
+    async def wait_for_disconnect() -> None:
+        # Once the body is consumed, receive() only returns on disconnect
+        while (await request.receive())["type"] != "http.disconnect":
+            pass
+    
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(wait_for_disconnect())
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            if db is not None:
+                await db.rollback()
+        watcher.cancel()
+    
+    if task.cancelled():
+        client_disconnects.inc((route,))
+        raise ClientDisconnected()
+    return task.result()
+
+
+async def _enqueue_job(kind: str, payload: dict, user_id: int, db: AsyncSession) -> JSONResponse:
+    """
+    Queue a background generation and build the 202 response
+    
+    Args:
+        kind: Job kind ("roadmap" or "daily_plan")
+        payload: Request body without the background flag
+        user_id: Current user ID
+        db: Database session
+        
+    Returns:
+        202 Accepted response with the job ID and polling URLs
+        
+    Raises:
+        HTTPException: 429 if the user has too many unfinished jobs
+    """
+    try:
+        job = await JobService.enqueue(user_id, kind, payload, db)
+    except TooManyJobsError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": "10"}
+        )
+    
+    status_url = f"{router.prefix}/jobs/{job.id}"
+    accepted = JobAcceptedResponse(
+        job_id=job.id,
+        kind=job.kind,
+        status=job.status,
+        status_url=status_url,
+        result_url=f"{status_url}/result"
+    )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=accepted.model_dump(),
+        headers={"Location": status_url}
+    )
+
 
 @router.post(
     "/generate-roadmap",
     response_model=RoadmapResponse,
+    responses={202: {"model": JobAcceptedResponse, "description": "Queued (background: true)"}},
     status_code=status.HTTP_201_CREATED,
     summary="Generate Career Roadmap",
     description="Use AI to generate a comprehensive career roadmap with required skills and learning path"
 )
 async def generate_roadmap(
     request: RoadmapGenerateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_ROADMAP))
 ):
     """
     Generate a career roadmap using AI
     
     - **role_name**: Job role or career path (e.g., "Full Stack Developer")
     - **duration_days**: Number of days for the learning plan (1-365)
+    - **regenerate**: Skip the shared template cache (default: false)
+    - **background**: Queue the generation and return 202 with a job ID (default: false)
     
     The AI will generate:
     - Required skills for the role
@@ -50,20 +211,34 @@ async def generate_roadmap(
     
     Returns the generated roadmap stored in the database.
     """
+    if request.background:
+        return await _enqueue_job("roadmap", request.model_dump(exclude={"background"}), current_user.id, db)
+    
+    current_llm_user.set(current_user.id)
     try:
-        roadmap = await AIService.generate_roadmap(
-            role_name=request.role_name,
-            duration_days=request.duration_days,
-            user_id=current_user.id,
+        roadmap = await _cancel_on_disconnect(
+            http_request,
+            AIService.generate_roadmap(
+                role_name=request.role_name,
+                duration_days=request.duration_days,
+                user_id=current_user.id,
+                db=db,
+                regenerate=request.regenerate
+            ),
+            route="generate_roadmap",
             db=db
         )
         return roadmap
     
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -71,22 +246,81 @@ async def generate_roadmap(
         )
 
 
+@router.post(
+    "/generate-roadmap/stream",
+    summary="Generate Career Roadmap (Streaming)",
+    description="Stream the AI roadmap generation as server-sent events, then persist the final roadmap",
+    response_class=StreamingResponse
+)
+async def generate_roadmap_stream(
+    request: RoadmapGenerateRequest,
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_ROADMAP))
+):
+    """
+    Generate a career roadmap using AI, streaming partial output
+    
+    Emits `delta` events with `{"content": ...}` as tokens arrive, then a
+    single `done` event carrying the stored roadmap (same shape as
+    `/ai/generate-roadmap`), or an `error` event if generation fails.
+    """
+    current_llm_user.set(current_user.id)
+    try:
+        groq_client.ensure_available()
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
+    
+    user_id = current_user.id
+    
+    async def event_stream() -> AsyncIterator[str]:
+        # The stream outlives the request dependencies, so it owns its session
+        async with AsyncSessionLocal() as db:
+            try:
+                async for event, payload in AIService.stream_roadmap(
+                    role_name=request.role_name,
+                    duration_days=request.duration_days,
+                    user_id=user_id,
+                    db=db,
+                    regenerate=request.regenerate
+                ):
+                    if event == "delta":
+                        # Output is flowing: the deadline only bounded the wait for it
+                        clear_deadline()
+                        yield _sse_event("delta", {"content": payload})
+                    else:
+                        roadmap = RoadmapResponse.model_validate(payload)
+                        yield _sse_event("done", roadmap.model_dump(mode="json"))
+            except asyncio.CancelledError:
+                # Client went away: the upstream stream is cancelled and nothing is committed
+                client_disconnects.inc(("generate_roadmap_stream",))
+                raise
+            except Exception as e:
+                yield _sse_event("error", {"detail": f"Failed to generate roadmap: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post(
     "/generate-daily-plan",
     response_model=DailyPlanResponse,
+    responses={202: {"model": JobAcceptedResponse, "description": "Queued (background: true)"}},
     status_code=status.HTTP_201_CREATED,
     summary="Generate Daily Learning Plan",
     description="Use AI to generate a day-by-day learning plan for a specific role and timeframe"
 )
 async def generate_daily_plan(
     request: DailyPlanGenerateRequest,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    http_request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_DAILY_PLAN))
 ):
     """
     Generate a daily learning plan using AI
     
     - **user_role_id**: User role ID (contains role and duration info from roadmap)
+    - **regenerate**: Skip the shared template cache (default: false)
+    - **background**: Queue the generation and return 202 with a job ID (default: false)
     
     The AI will generate a structured day-by-day plan with:
     - Daily topics building progressively
@@ -95,12 +329,13 @@ async def generate_daily_plan(
     
     If a plan already exists for this role, it will be regenerated based on the current duration.
     """
+    current_llm_user.set(current_user.id)
     try:
         # Check if user owns this user_role
-        user_role = db.query(UserRole).filter(
+        user_role = await db.scalar(select(UserRole).where(
             UserRole.id == request.user_role_id,
             UserRole.user_id == current_user.id
-        ).first()
+        ))
         
         if not user_role:
             raise HTTPException(
@@ -108,11 +343,23 @@ async def generate_daily_plan(
                 detail="User role not found or does not belong to you"
             )
         
-        daily_plans = await AIService.generate_daily_plan(
-            user_role_id=request.user_role_id,
+        if request.background:
+            return await _enqueue_job("daily_plan", request.model_dump(exclude={"background"}), current_user.id, db)
+        
+        daily_plans = await _cancel_on_disconnect(
+            http_request,
+            AIService.generate_daily_plan(
+                user_role_id=request.user_role_id,
+                db=db,
+                regenerate=request.regenerate
+            ),
+            route="generate_daily_plan",
             db=db
         )
         
+        # Warm the explanations of the first days in the background
+        PrefetchService.schedule_plans(user_role, daily_plans)
+        
         # Convert to response schema
         plan_items = [
             DailyPlanItem(
@@ -131,11 +378,17 @@ async def generate_daily_plan(
             plans=plan_items
         )
     
+    except HTTPException:
+        raise
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -151,7 +404,9 @@ async def generate_daily_plan(
 )
 async def teach_topic(
     request: TeachTopicRequest,
-    current_user: User = Depends(get_current_user)
+    http_request: Request,
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_TEACH))
 ):
     """
     Get an educational explanation of a topic using AI
@@ -166,10 +421,15 @@ async def teach_topic(
     
     This endpoint does NOT store results in the database - it returns the explanation directly.
     """
+    current_llm_user.set(current_user.id)
     try:
-        teaching_data = await AIService.teach_topic(
-            topic=request.topic,
-            context=request.context
+        teaching_data = await _cancel_on_disconnect(
+            http_request,
+            AIService.teach_topic(
+                topic=request.topic,
+                context=request.context
+            ),
+            route="teach_topic"
         )
         
         return TeachTopicResponse(
@@ -179,6 +439,10 @@ async def teach_topic(
             resources=teaching_data.get("resources", [])
         )
     
+    except ClientDisconnected:
+        return Response(status_code=CLIENT_CLOSED_REQUEST)
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -186,6 +450,173 @@ async def teach_topic(
         )
 
 
+@router.post(
+    "/teach-topic/stream",
+    summary="AI Topic Teaching (Streaming)",
+    description="Stream an AI explanation of a topic as server-sent events",
+    response_class=StreamingResponse
+)
+async def teach_topic_stream(
+    request: TeachTopicRequest,
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_TEACH))
+):
+    """
+    Get an educational explanation of a topic, streaming partial output
+    
+    Emits `delta` events with `{"content": ...}` as tokens arrive, then a
+    single `done` event carrying the validated explanation (same shape as
+    `/ai/teach-topic`), or an `error` event if generation fails.
+    """
+    current_llm_user.set(current_user.id)
+    try:
+        groq_client.ensure_available()
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
+    
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            async for event, payload in AIService.stream_teach_topic(
+                topic=request.topic,
+                context=request.context
+            ):
+                if event == "delta":
+                    # Output is flowing: the deadline only bounded the wait for it
+                    clear_deadline()
+                    yield _sse_event("delta", {"content": payload})
+                else:
+                    teaching = TeachTopicResponse(
+                        topic=payload.get("topic", request.topic),
+                        explanation=payload.get("explanation", ""),
+                        examples=payload.get("examples", []),
+                        resources=payload.get("resources", [])
+                    )
+                    yield _sse_event("done", teaching.model_dump(mode="json"))
+        except asyncio.CancelledError:
+            client_disconnects.inc(("teach_topic_stream",))
+            raise
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Failed to generate topic explanation: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post(
+    "/teach-topics",
+    summary="AI Topic Teaching (Batch)",
+    description="Explain several topics at once, streaming each explanation as NDJSON when it is ready",
+    response_class=StreamingResponse
+)
+async def teach_topics(
+    request: TeachTopicsRequest,
+    current_user: User = Depends(get_current_user),
+    deadline_seconds: float = Depends(request_deadline(settings.REQUEST_TIMEOUT_TEACH))
+):
+    """
+    Get educational explanations for a list of topics
+    
+    - **topics**: 1-20 topics (e.g. a week of daily-plan topics)
+    - **context**: Optional additional context for every explanation
+    
+    The response is `application/x-ndjson` with one line per topic, in the
+    order they finish:
+    `{"index": 0, "topic": "...", "status": "ok", "result": {...}}` where
+    `result` has the `/ai/teach-topic` shape, or
+    `{"index": 1, "topic": "...", "status": "error", "detail": "..."}`.
+    Cached topics come first; the rest share multi-topic LLM calls.
+    """
+    current_llm_user.set(current_user.id)
+    try:
+        groq_client.ensure_available()
+    except LLMUnavailableError as e:
+        raise _unavailable_exception(e)
+    
+    async def lines() -> AsyncIterator[str]:
+        try:
+            async for index, payload, error in AIService.teach_topics(request.topics, request.context):
+                topic = request.topics[index]
+                if error is not None:
+                    line = {"index": index, "topic": topic, "status": "error", "detail": str(error)}
+                else:
+                    teaching = TeachTopicResponse(
+                        topic=payload.get("topic") or topic,
+                        explanation=payload.get("explanation", ""),
+                        examples=payload.get("examples", []),
+                        resources=payload.get("resources", [])
+                    )
+                    line = {"index": index, "topic": topic, "status": "ok", "result": teaching.model_dump(mode="json")}
+                yield json.dumps(line) + "\n"
+        except asyncio.CancelledError:
+            client_disconnects.inc(("teach_topics",))
+            raise
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=SSE_HEADERS)
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=JobStatusResponse,
+    summary="Get Generation Job Status",
+    description="Poll a background roadmap or daily-plan generation job"
+)
+async def get_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the status of a background generation job
+    
+    Status moves from `queued` to `running` and ends as `succeeded` or
+    `failed`; a job whose attempt failed transiently goes back to `queued`.
+    """
+    job = await JobService.get_job(job_id, current_user.id, db)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or does not belong to you"
+        )
+    return job
+
+
+@router.get(
+    "/jobs/{job_id}/result",
+    summary="Get Generation Job Result",
+    description="Fetch the result of a finished background generation job"
+)
+async def get_job_result(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the result of a background generation job
+    
+    - **succeeded**: the same body `/ai/generate-roadmap` or `/ai/generate-daily-plan` returns
+    - **failed**: the error status and detail the synchronous route would have returned
+    - **queued / running**: 202 with the job status and a Retry-After header
+    """
+    job = await JobService.get_job(job_id, current_user.id, db)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found or does not belong to you"
+        )
+    
+    if job.status == "succeeded":
+        return JSONResponse(content=json.loads(job.result))
+    if job.status == "failed":
+        raise HTTPException(
+            status_code=job.error_status or status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=job.error
+        )
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=JobStatusResponse.model_validate(job).model_dump(mode="json"),
+        headers={"Retry-After": str(max(1, math.ceil(settings.JOB_POLL_INTERVAL)))}
+    )
+
+
 @router.get(
     "/daily-plans",
     response_model=List[DailyPlanResponse],
@@ -193,7 +624,7 @@ async def teach_topic(
     description="Fetch all daily plans for the current user grouped by user_role_id"
 )
 async def get_daily_plans(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -203,7 +634,9 @@ async def get_daily_plans(
     """
     try:
         # Get all user roles for this user
-        user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
+        user_roles = (await db.scalars(
+            select(UserRole).where(UserRole.user_id == current_user.id)
+        )).all()
         
         if not user_roles:
             return []
@@ -218,9 +651,9 @@ async def get_daily_plans(
         # Fetch daily plans for each unique role
         all_plans = []
         for user_role in unique_roles.values():
-            daily_plans = db.query(DailyPlan).filter(
+            daily_plans = (await db.scalars(select(DailyPlan).where(
                 DailyPlan.user_role_id == user_role.id
-            ).order_by(DailyPlan.day_number).all()
+            ).order_by(DailyPlan.day_number))).all()
             
             if daily_plans:
                 plan_items = [
@@ -259,7 +692,7 @@ async def get_daily_plans(
 )
 async def delete_daily_plan(
     user_role_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -272,10 +705,10 @@ async def delete_daily_plan(
     """
     try:
         # Check if user owns this user_role
-        user_role = db.query(UserRole).filter(
+        user_role = await db.scalar(select(UserRole).where(
             UserRole.id == user_role_id,
             UserRole.user_id == current_user.id
-        ).first()
+        ))
         
         if not user_role:
             raise HTTPException(
@@ -286,14 +719,14 @@ async def delete_daily_plan(
         role_name = user_role.role_name
         
         # Delete daily plans
-        db.query(DailyPlan).filter(DailyPlan.user_role_id == user_role_id).delete()
+        await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == user_role_id))
         
         # Delete roadmap
-        db.query(Roadmap).filter(Roadmap.user_role_id == user_role_id).delete()
+        await db.execute(delete(Roadmap).where(Roadmap.user_role_id == user_role_id))
         
         # Delete user role
-        db.delete(user_role)
-        db.commit()
+        await db.delete(user_role)
+        await db.commit()
         
         return {
             "message": f"Successfully deleted daily plan for {role_name}",
@@ -303,7 +736,7 @@ async def delete_daily_plan(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete daily plan: {str(e)}"
@@ -318,7 +751,7 @@ async def delete_daily_plan(
 )
 async def delete_roadmap(
     user_role_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -331,10 +764,10 @@ async def delete_roadmap(
     """
     try:
         # Check if user owns this user_role
-        user_role = db.query(UserRole).filter(
+        user_role = await db.scalar(select(UserRole).where(
             UserRole.id == user_role_id,
             UserRole.user_id == current_user.id
-        ).first()
+        ))
         
         if not user_role:
             raise HTTPException(
@@ -345,14 +778,14 @@ async def delete_roadmap(
         role_name = user_role.role_name
         
         # Delete daily plans
-        db.query(DailyPlan).filter(DailyPlan.user_role_id == user_role_id).delete()
+        await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == user_role_id))
         
         # Delete roadmap
-        db.query(Roadmap).filter(Roadmap.user_role_id == user_role_id).delete()
+        await db.execute(delete(Roadmap).where(Roadmap.user_role_id == user_role_id))
         
         # Delete user role
-        db.delete(user_role)
-        db.commit()
+        await db.delete(user_role)
+        await db.commit()
         
         return {
             "message": f"Successfully deleted roadmap for {role_name}",
@@ -362,7 +795,7 @@ async def delete_roadmap(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete roadmap: {str(e)}"
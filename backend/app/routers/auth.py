@@ -3,9 +3,12 @@ Authentication Router
 Handles user registration, login, and authentication
 """
 
+import asyncio
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from datetime import timedelta
 
@@ -27,7 +30,7 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
     summary="Register a new user",
     description="Create a new user account with email, username, and password"
 )
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Register a new user
     
@@ -40,7 +43,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """
     
     # Check if email already exists
-    existing_user_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_user_email = await db.scalar(select(User).where(User.email == user_data.email))
     if existing_user_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -48,15 +51,15 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if username already exists
-    existing_user_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_user_username = await db.scalar(select(User).where(User.username == user_data.username))
     if existing_user_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
         )
     
-    # Hash the password
-    hashed_password = hash_password(user_data.password)
+    # Hash the password (bcrypt is deliberately slow; keep it off the event loop)
+    hashed_password = await asyncio.to_thread(hash_password, user_data.password)
     
     try:
         # Create new user
@@ -68,8 +71,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
         
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         
         # Assign default role with proper duration_days
         default_role = UserRole(
@@ -78,18 +81,18 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             duration_days=365
         )
         db.add(default_role)
-        db.commit()
+        await db.commit()
         
         return new_user
         
     except IntegrityError as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Database integrity error. User registration failed."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"User registration failed: {str(e)}"
@@ -102,9 +105,9 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     summary="User login",
     description="Authenticate user and return JWT access token"
 )
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     User login
@@ -116,10 +119,10 @@ def login(
     """
     
     # Find user by username
-    user = db.query(User).filter(User.username == form_data.username).first()
+    user = await db.scalar(select(User).where(User.username == form_data.username))
     
     # Verify user exists and password is correct
-    if not user or not verify_password(form_data.password, user.password_hash):
+    if not user or not await asyncio.to_thread(verify_password, form_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -152,7 +155,10 @@ def login(
     summary="Get current user",
     description="Get details of the currently authenticated user"
 )
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get current authenticated user details
     
@@ -160,4 +166,6 @@ def get_current_user_info(current_user: User = Depends(get_current_user)):
     
     Returns user details including roles
     """
+    # Async sessions cannot lazy-load, so load the roles explicitly
+    await db.refresh(current_user, ["roles"])
     return current_user
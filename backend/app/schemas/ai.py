@@ -3,7 +3,7 @@ AI Schemas
 Pydantic models for AI-related requests and responses
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional
 from datetime import datetime
 
@@ -12,6 +12,8 @@ class RoadmapGenerateRequest(BaseModel):
     """Schema for roadmap generation request"""
     role_name: str = Field(..., min_length=2, max_length=200, description="Job role or career path")
     duration_days: int = Field(..., ge=1, le=365, description="Number of days for the learning plan (1-365)")
+    regenerate: bool = Field(False, description="Ignore the shared template cache and generate a new roadmap")
+    background: bool = Field(False, description="Queue the generation and return 202 with a job ID to poll")
     
     class Config:
         json_schema_extra = {
@@ -36,6 +38,8 @@ class RoadmapResponse(BaseModel):
 class DailyPlanGenerateRequest(BaseModel):
     """Schema for daily plan generation request"""
     user_role_id: int = Field(..., description="User role ID to associate the plan with")
+    regenerate: bool = Field(False, description="Ignore the shared template cache and generate a new plan")
+    background: bool = Field(False, description="Queue the generation and return 202 with a job ID to poll")
     
     class Config:
         json_schema_extra = {
@@ -80,6 +84,29 @@ class TeachTopicRequest(BaseModel):
         }
 
 
+class TeachTopicsRequest(BaseModel):
+    """Schema for batch topic teaching request"""
+    topics: List[str] = Field(..., min_length=1, max_length=20, description="Topics to learn about (1-20)")
+    context: Optional[str] = Field(None, max_length=1000, description="Optional additional context for every explanation")
+    
+    @field_validator("topics")
+    @classmethod
+    def check_topics(cls, topics: List[str]) -> List[str]:
+        """Each topic must be 2-500 characters"""
+        for topic in topics:
+            if not 2 <= len(topic.strip()) <= 500:
+                raise ValueError("Each topic must be between 2 and 500 characters")
+        return [topic.strip() for topic in topics]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "topics": ["Python decorators", "SQL joins", "Docker networking"],
+                "context": "Beginner level"
+            }
+        }
+
+
 class TeachTopicResponse(BaseModel):
     """Schema for topic teaching response"""
     topic: str
@@ -100,3 +127,27 @@ class TeachTopicResponse(BaseModel):
                 ]
             }
         }
+
+
+class JobAcceptedResponse(BaseModel):
+    """Schema for a queued generation job (202 Accepted)"""
+    job_id: int
+    kind: str
+    status: str
+    status_url: str
+    result_url: str
+
+
+class JobStatusResponse(BaseModel):
+    """Schema for generation job status"""
+    id: int
+    kind: str
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
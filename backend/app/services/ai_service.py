@@ -3,15 +3,70 @@ AI Service
 Business logic for AI-powered features
 """
 
+import asyncio
 import json
-from typing import Dict, Any, List
-from sqlalchemy.orm import Session
+import math
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+from pydantic import ValidationError
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
+from app.ai.admission import current_llm_user
+from app.ai.cache import TTLCache
+from app.ai.errors import LLMUnavailableError
 from app.ai.groq_client import groq_client
+from app.ai.json_stream import JSONArrayStreamParser
+from app.ai.prefetch import BackgroundPrefetcher
 from app.ai.prompts import PromptTemplates
+from app.ai.response_schemas import (
+    DAILY_PLAN_ENTRY_SCHEMA,
+    DAILY_PLAN_SCHEMA,
+    ROADMAP_SCHEMA,
+    TEACH_TOPIC_SCHEMA
+)
+from app.ai.token_budget import TokenBudget, TokenBudgetExceededError
 from app.models.roadmap import Roadmap, DailyPlan
 from app.models.user import UserRole
+from app.core import deadline
+from app.core.config import settings
+from app.services.template_store import TemplateStore
+
+# Shared cache of teach-topic explanations (topics recur across users' daily plans)
+teach_topic_cache = TTLCache(
+    max_bytes=settings.TEACH_CACHE_MAX_BYTES,
+    ttl=settings.TEACH_CACHE_TTL_SECONDS,
+    stale_ttl=settings.TEACH_CACHE_STALE_SECONDS
+)
+
+# Learns output tokens per daily-plan entry to size max_tokens per call
+daily_plan_budget = TokenBudget(
+    tokens_per_entry=settings.DAILY_PLAN_TOKENS_PER_DAY,
+    overhead_tokens=20,
+    margin=settings.DAILY_PLAN_TOKEN_MARGIN,
+    context_window=settings.LLM_CONTEXT_WINDOW,
+    max_output_tokens=settings.LLM_MAX_OUTPUT_TOKENS
+)
+
+# Learns output tokens per explanation to size multi-topic teach prompts
+teach_topic_budget = TokenBudget(
+    tokens_per_entry=settings.TEACH_TOPIC_TOKENS,
+    overhead_tokens=10,
+    margin=1.25,
+    context_window=settings.LLM_CONTEXT_WINDOW,
+    max_output_tokens=settings.LLM_MAX_OUTPUT_TOKENS
+)
+
+# Warms teach_topic_cache for users' upcoming plan days (fed by PrefetchService)
+teach_topic_prefetcher = BackgroundPrefetcher(
+    name="teach_topic",
+    loader=lambda key, item: AIService.prefetch_teach_topic(key, *item),
+    is_cached=teach_topic_cache.contains,
+    max_pending=settings.TEACH_PREFETCH_MAX_PENDING,
+    min_interval=settings.TEACH_PREFETCH_MIN_INTERVAL,
+    max_utilization=settings.TEACH_PREFETCH_MAX_UTILIZATION
+)
 
 
 class AIService:
@@ -20,16 +75,163 @@ class AIService:
     """
     
     @staticmethod
-    async def generate_roadmap(role_name: str, duration_days: int, user_id: int, db: Session) -> Roadmap:
+    async def _release_connection(db: AsyncSession) -> None:
+        """
+        End the session's read transaction before waiting on the LLM
+        
+        The connection goes back to the pool until the final write
+        transaction; loaded objects stay usable because sessions do not
+        expire them on commit.
+        
+        Args:
+            db: Database session
+        """
+        await db.commit()
+    
+    @staticmethod
+    async def _lock_user_role(user_id: int, role_name: str, db: AsyncSession) -> Optional[UserRole]:
+        """
+        Find a user's learning goal by role name, locked until commit
+        
+        Role names match case-insensitively, like the unique index on
+        (user_id, lower(role_name)) that serves this lookup.
+        
+        Args:
+            user_id: Current user ID
+            role_name: The job role or career path
+            db: Database session
+            
+        Returns:
+            The UserRole, or None if the user has no such goal
+        """
+        return await db.scalar(select(UserRole).where(
+            UserRole.user_id == user_id,
+            func.lower(UserRole.role_name) == role_name.lower()
+        ).limit(1).with_for_update())
+    
+    @staticmethod
+    async def _replace_roadmap(
+        role_name: str,
+        duration_days: int,
+        user_id: int,
+        roadmap_text: str,
+        db: AsyncSession
+    ) -> Roadmap:
+        """
+        Swap in a new roadmap for a learning goal in one short transaction
+        
+        Creates the UserRole, or resets the existing one (new duration, old
+        roadmap and daily plans deleted), and inserts the roadmap. Nothing
+        changes if any step fails.
+        
+        Args:
+            role_name: The job role or career path
+            duration_days: Duration in days for the learning plan
+            user_id: Current user ID
+            roadmap_text: Roadmap JSON text
+            db: Database session
+            
+        Returns:
+            Created Roadmap object
+        """
+        try:
+            # Check if UserRole already exists for this user and role (locked until commit)
+            user_role = await AIService._lock_user_role(user_id, role_name, db)
+            created = False
+            
+            if user_role is None:
+                # Create new UserRole entry for this learning goal
+                user_role = UserRole(
+                    user_id=user_id,
+                    role_name=role_name,
+                    duration_days=duration_days
+                )
+                try:
+                    async with db.begin_nested():
+                        db.add(user_role)
+                        await db.flush()  # Get the ID
+                    created = True
+                except IntegrityError:
+                    # A concurrent request created the same goal since the lookup
+                    user_role = await AIService._lock_user_role(user_id, role_name, db)
+                    if user_role is None:
+                        raise
+            
+            if not created:
+                # Update existing UserRole with new duration
+                user_role.duration_days = duration_days
+                # Delete old roadmap and daily plans for this role
+                await db.execute(delete(Roadmap).where(Roadmap.user_role_id == user_role.id))
+                await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == user_role.id))
+            
+            roadmap = Roadmap(
+                user_role_id=user_role.id,
+                roadmap_text=roadmap_text
+            )
+            db.add(roadmap)
+            await db.flush()
+            await db.refresh(roadmap, ["generated_at"])
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+        
+        return roadmap
+    
+    @staticmethod
+    async def _persist_roadmap(
+        role_name: str,
+        duration_days: int,
+        user_id: int,
+        roadmap_data: Dict[str, Any],
+        db: AsyncSession
+    ) -> Roadmap:
+        """
+        Store a freshly generated roadmap and share it as a template
+        
+        The LLM result has already been paid for, so the writes are not cut
+        short by the request deadline (DB_STATEMENT_TIMEOUT still applies).
+        
+        Args:
+            role_name: The job role or career path
+            duration_days: Duration in days for the learning plan
+            user_id: Current user ID
+            roadmap_data: Parsed roadmap JSON from the LLM
+            db: Database session
+            
+        Returns:
+            Created Roadmap object
+        """
+        # Convert to JSON string for storage
+        roadmap_text = json.dumps(roadmap_data, indent=2)
+        with deadline.lifted():
+            roadmap = await AIService._replace_roadmap(role_name, duration_days, user_id, roadmap_text, db)
+            await TemplateStore.save_roadmap(role_name, duration_days, roadmap_text, db)
+        return roadmap
+    
+    @staticmethod
+    async def generate_roadmap(
+        role_name: str,
+        duration_days: int,
+        user_id: int,
+        db: AsyncSession,
+        regenerate: bool = False
+    ) -> Roadmap:
         """
         Generate a career roadmap using LLM and store in database
         Auto-creates or updates UserRole entry for the user
         
+        A fresh shared template for the same role and duration is copied
+        instead of calling the LLM, unless regenerate is set. No transaction
+        is open while the LLM runs: the old roadmap is swapped for the new
+        one in a single short transaction afterwards.
+        
         Args:
             role_name: The job role or career path
             duration_days: Duration in days for the learning plan
             user_id: Current user ID
             db: Database session
+            regenerate: Skip the template cache and call the LLM
             
         Returns:
             Created Roadmap object
@@ -37,81 +239,113 @@ class AIService:
         Raises:
             Exception: If LLM generation or database operation fails
         """
-        # Check if UserRole already exists for this user and role
-        user_role = db.query(UserRole).filter(
-            UserRole.user_id == user_id,
-            UserRole.role_name == role_name
-        ).first()
-        
-        if user_role:
-            # Update existing UserRole with new duration
-            user_role.duration_days = duration_days
-            # Delete old roadmap and daily plans for this role
-            db.query(Roadmap).filter(Roadmap.user_role_id == user_role.id).delete()
-            db.query(DailyPlan).filter(DailyPlan.user_role_id == user_role.id).delete()
-        else:
-            # Create new UserRole entry for this learning goal
-            user_role = UserRole(
-                user_id=user_id,
-                role_name=role_name,
-                duration_days=duration_days
-            )
-            db.add(user_role)
+        if not regenerate:
+            template_text = await TemplateStore.get_roadmap_text(role_name, duration_days, db)
+            if template_text:
+                return await AIService._replace_roadmap(role_name, duration_days, user_id, template_text, db)
         
-        db.flush()  # Get the ID without committing
+        await AIService._release_connection(db)
         
         # Generate prompt
         prompt = PromptTemplates.roadmap_generation(role_name, duration_days)
         
         # Get LLM response
         try:
-            roadmap_data = await groq_client.generate_json_completion(prompt, temperature=0.7)
+            roadmap_data = await groq_client.generate_json_completion(
+                prompt, temperature=0.7, schema=ROADMAP_SCHEMA, operation="roadmap"
+            )
+        except LLMUnavailableError:
+            raise
         except Exception as e:
-            db.rollback()
             raise Exception(f"Failed to generate roadmap: {str(e)}")
         
-        # Convert to JSON string for storage
-        roadmap_text = json.dumps(roadmap_data, indent=2)
+        return await AIService._persist_roadmap(role_name, duration_days, user_id, roadmap_data, db)
+    
+    @staticmethod
+    async def stream_roadmap(
+        role_name: str,
+        duration_days: int,
+        user_id: int,
+        db: AsyncSession,
+        regenerate: bool = False
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Generate a career roadmap while streaming the LLM output
         
-        # Create roadmap in database
-        roadmap = Roadmap(
-            user_role_id=user_role.id,
-            roadmap_text=roadmap_text
-        )
+        The assembled response is parsed and persisted exactly like
+        generate_roadmap once the stream completes. A template cache hit is
+        returned as a single "done" event.
         
-        db.add(roadmap)
-        db.commit()
-        db.refresh(roadmap)
+        Args:
+            role_name: The job role or career path
+            duration_days: Duration in days for the learning plan
+            user_id: Current user ID
+            db: Database session
+            regenerate: Skip the template cache and call the LLM
+            
+        Yields:
+            ("delta", text) for each token delta, then ("done", Roadmap)
+            
+        Raises:
+            Exception: If LLM generation or database operation fails
+        """
+        if not regenerate:
+            template_text = await TemplateStore.get_roadmap_text(role_name, duration_days, db)
+            if template_text:
+                yield "done", await AIService._replace_roadmap(role_name, duration_days, user_id, template_text, db)
+                return
         
-        return roadmap
+        await AIService._release_connection(db)
+        
+        prompt = PromptTemplates.roadmap_generation(role_name, duration_days)
+        
+        chunks = []
+        try:
+            async for delta in groq_client.stream_completion(prompt, temperature=0.7, operation="roadmap"):
+                chunks.append(delta)
+                yield "delta", delta
+            roadmap_data = groq_client.parse_structured_response("".join(chunks), ROADMAP_SCHEMA)
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate roadmap: {str(e)}")
+        
+        yield "done", await AIService._persist_roadmap(role_name, duration_days, user_id, roadmap_data, db)
     
     @staticmethod
     async def generate_daily_plan(
         user_role_id: int,
-        db: Session
+        db: AsyncSession,
+        regenerate: bool = False
     ) -> List[DailyPlan]:
         """
         Generate a daily learning plan using LLM and store in database
         
+        The response is streamed and parsed incrementally, and a stream that
+        ends early keeps the days it already produced. Plans longer than
+        DAILY_PLAN_SEGMENT_DAYS are generated as parallel segments. A fresh
+        shared template for the same role and duration is bulk-copied instead,
+        unless regenerate is set. The current plan stays in place while the
+        LLM runs, with no transaction open, and is swapped for the new one in
+        a single short transaction.
+        
         Args:
             user_role_id: User role ID to associate with (contains role_name and duration)
             db: Database session
+            regenerate: Skip the template cache and call the LLM
             
         Returns:
             List of created DailyPlan objects
             
         Raises:
+            TokenBudgetExceededError: If a single LLM call cannot fit the model limits
             Exception: If LLM generation or database operation fails
         """
         # Fetch user_role to get role_name and duration_days
-        user_role = db.query(UserRole).filter(UserRole.id == user_role_id).first()
+        user_role = await db.get(UserRole, user_role_id)
         if not user_role:
             raise ValueError(f"UserRole with id {user_role_id} not found")
         
-        # Delete existing daily plans for this user_role_id to avoid duplicates
-        db.query(DailyPlan).filter(DailyPlan.user_role_id == user_role_id).delete()
-        db.commit()
-        
         # Extract role_name and duration_days from UserRole
         role_name = user_role.role_name
         duration_days = user_role.duration_days
@@ -120,69 +354,377 @@ class AIService:
         if duration_days < 1 or duration_days > 365:
             raise ValueError("Duration must be between 1 and 365 days")
         
-        # Generate prompt
+        if not regenerate:
+            template_plans = await TemplateStore.copy_daily_plan(role_name, duration_days, user_role_id, db)
+            if template_plans:
+                return template_plans
+        
+        # Long plans follow the roadmap's phases; read them while the connection is held
+        segmented = duration_days > settings.DAILY_PLAN_SEGMENT_DAYS
+        phases = await AIService._learning_path(user_role_id, db) if segmented else []
+        await AIService._release_connection(db)
+        
+        if segmented:
+            daily_plans, complete = await AIService.generate_plan_segments(
+                role_name, duration_days, phases, user_role_id
+            )
+        else:
+            daily_plans, complete = await AIService._stream_daily_plan(user_role)
+        
+        # The plan has already been paid for; don't let the deadline discard it
+        with deadline.lifted():
+            await AIService._replace_daily_plans(user_role_id, daily_plans, db)
+            if complete:
+                await TemplateStore.save_daily_plan(role_name, duration_days, daily_plans, db)
+        
+        return daily_plans
+    
+    @staticmethod
+    async def _stream_daily_plan(user_role: UserRole) -> Tuple[List[DailyPlan], bool]:
+        """
+        Generate a daily plan with one streamed LLM call
+        
+        Args:
+            user_role: UserRole the plan belongs to
+            
+        Returns:
+            (DailyPlan objects to insert, whether every day came from the LLM)
+        """
+        user_role_id = user_role.id
+        role_name = user_role.role_name
+        duration_days = user_role.duration_days
+        
+        # Generate prompt and size the output budget for this duration
         prompt = PromptTemplates.daily_plan_generation(role_name, duration_days)
+        max_tokens = daily_plan_budget.max_tokens_for(prompt, duration_days)
+        
+        # Stream the LLM response, building each day as soon as it parses
+        parser = JSONArrayStreamParser("daily_plan")
+        daily_plans = []
+        output_parts = []
+        usage = {}
         
-        # Get LLM response
         try:
-            plan_data = await groq_client.generate_json_completion(prompt, temperature=0.7, max_tokens=3000)
+            async for delta in groq_client.stream_completion(
+                prompt, temperature=0.7, max_tokens=max_tokens, operation="daily_plan", usage=usage
+            ):
+                output_parts.append(delta)
+                for day_item in parser.feed(delta):
+                    # Ignore anything beyond the requested duration
+                    if len(daily_plans) >= duration_days:
+                        continue
+                    daily_plan = AIService._build_daily_plan(user_role_id, day_item)
+                    if daily_plan is not None:
+                        daily_plans.append(daily_plan)
+        except LLMUnavailableError:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to generate daily plan: {str(e)}")
+            if not daily_plans:
+                raise Exception(f"Failed to generate daily plan: {str(e)}")
+            # Keep the days that were already generated and pad the rest below
+            print(f"Daily plan stream ended early after {len(daily_plans)} days: {e}")
         
-        # Validate response structure
-        if "daily_plan" not in plan_data:
+        accepted = len(daily_plans)
+        if accepted == 0 and not parser.found_array:
             raise Exception("LLM response missing 'daily_plan' field")
         
-        # Create daily plan entries
-        daily_plans = []
-        llm_daily_plan = plan_data.get("daily_plan", [])
-        
-        # Ensure we have exactly duration_days entries
-        if len(llm_daily_plan) > duration_days:
-            # Trim if LLM generated too many
-            llm_daily_plan = llm_daily_plan[:duration_days]
-        elif len(llm_daily_plan) < duration_days:
-            # Pad if LLM generated too few
-            last_day = len(llm_daily_plan)
-            for day_num in range(last_day + 1, duration_days + 1):
-                llm_daily_plan.append({
-                    "day": day_num,
-                    "topic": f"Advanced {role_name} Concepts - Day {day_num}",
-                    "estimated_hours": 4
-                })
+        daily_plan_budget.observe("".join(output_parts), accepted, usage.get("completion_tokens"))
         
-        for day_item in llm_daily_plan:
-            try:
-                daily_plan = DailyPlan(
-                    user_role_id=user_role_id,
-                    day_number=day_item.get("day", 0),
-                    topic=day_item.get("topic", ""),
-                    estimated_hours=int(day_item.get("estimated_hours", 3))
-                )
-                daily_plans.append(daily_plan)
-            except (KeyError, ValueError) as e:
-                # Skip invalid entries but log them
-                print(f"Skipping invalid daily plan entry: {day_item}. Error: {e}")
-                continue
+        # Only complete LLM plans are shared; padded ones are regenerated next time
+        complete = accepted == duration_days
+        
+        # Pad if LLM generated too few
+        for day_num in range(accepted + 1, duration_days + 1):
+            daily_plans.append(DailyPlan(
+                user_role_id=user_role_id,
+                day_number=day_num,
+                topic=f"Advanced {role_name} Concepts - Day {day_num}",
+                estimated_hours=4
+            ))
         
         if not daily_plans:
             raise Exception("No valid daily plans generated")
         
-        # Bulk insert
-        db.add_all(daily_plans)
-        db.commit()
+        return daily_plans, complete
+    
+    @staticmethod
+    async def _learning_path(user_role_id: int, db: AsyncSession) -> List[Dict[str, Any]]:
+        """
+        Read the learning_path phases of a UserRole's latest roadmap
+        
+        Args:
+            user_role_id: User role ID
+            db: Database session
+            
+        Returns:
+            List of phase dicts, empty if there is no usable roadmap
+        """
+        roadmap = await db.scalar(select(Roadmap).where(
+            Roadmap.user_role_id == user_role_id
+        ).order_by(Roadmap.generated_at.desc()).limit(1))
+        if roadmap is None:
+            return []
+        try:
+            roadmap_data = json.loads(roadmap.roadmap_text)
+        except (ValueError, TypeError):
+            return []
+        return AIService.learning_path_phases(roadmap_data)
+    
+    @staticmethod
+    def learning_path_phases(roadmap_data: Any) -> List[Dict[str, Any]]:
+        """
+        Extract the learning_path phases from parsed roadmap data
         
-        # Refresh all objects
-        for plan in daily_plans:
-            db.refresh(plan)
+        Args:
+            roadmap_data: Parsed roadmap JSON
+            
+        Returns:
+            List of phase dicts, empty if there are none
+        """
+        learning_path = roadmap_data.get("learning_path") if isinstance(roadmap_data, dict) else None
+        if not isinstance(learning_path, list):
+            return []
+        return [phase for phase in learning_path if isinstance(phase, dict)]
+    
+    @staticmethod
+    def _plan_segments(duration_days: int, phases: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Split a plan into day ranges of at most DAILY_PLAN_SEGMENT_DAYS
         
-        return daily_plans
+        When the roadmap has learning_path phases, days are shared out in
+        proportion to each phase's duration_weeks and segments never cross a
+        phase boundary.
+        
+        Args:
+            duration_days: Plan duration in days
+            phases: Roadmap learning_path phases (may be empty)
+            
+        Returns:
+            Ordered list of {"start_day", "end_day", "phase", "topics"} dicts
+        """
+        phases = phases[:duration_days]
+        
+        if phases:
+            weights = []
+            for phase in phases:
+                try:
+                    weights.append(max(float(phase.get("duration_weeks") or 1), 0.1))
+                except (TypeError, ValueError):
+                    weights.append(1.0)
+            # Every phase gets one day, the rest is split by largest remainder
+            extra = duration_days - len(phases)
+            shares = [extra * weight / sum(weights) for weight in weights]
+            phase_days = [1 + int(share) for share in shares]
+            by_remainder = sorted(
+                range(len(phases)), key=lambda i: shares[i] - int(shares[i]), reverse=True
+            )
+            for i in by_remainder[:duration_days - sum(phase_days)]:
+                phase_days[i] += 1
+        else:
+            phases = [{}]
+            phase_days = [duration_days]
+        
+        segments = []
+        start_day = 1
+        for phase, days in zip(phases, phase_days):
+            count = math.ceil(days / settings.DAILY_PLAN_SEGMENT_DAYS)
+            for i in range(count):
+                length = days // count + (1 if i < days % count else 0)
+                topics = phase.get("topics")
+                segments.append({
+                    "start_day": start_day,
+                    "end_day": start_day + length - 1,
+                    "phase": phase.get("phase"),
+                    "topics": topics if isinstance(topics, list) else None
+                })
+                start_day += length
+        return segments
+    
+    @staticmethod
+    async def _generate_segment(
+        prompt: str,
+        max_tokens: int,
+        semaphore: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate the daily_plan entries of one segment
+        
+        Args:
+            prompt: Segment prompt
+            max_tokens: Output token budget for the segment
+            semaphore: Limits how many segments run at once
+            
+        Returns:
+            Parsed daily_plan entries
+        """
+        usage = {}
+        async with semaphore:
+            response_text = await groq_client.generate_completion(
+                prompt, temperature=0.7, max_tokens=max_tokens, json_mode=True,
+                operation="daily_plan_segment", usage=usage
+            )
+        data = groq_client.parse_structured_response(response_text, DAILY_PLAN_SCHEMA)
+        
+        daily_plan_budget.observe(response_text, len(data["daily_plan"]), usage.get("completion_tokens"))
+        return data["daily_plan"]
+    
+    @staticmethod
+    async def generate_plan_segments(
+        role_name: str,
+        duration_days: int,
+        phases: List[Dict[str, Any]],
+        user_role_id: Optional[int] = None
+    ) -> Tuple[List[DailyPlan], bool]:
+        """
+        Generate a daily plan as concurrently generated day ranges
+        
+        Segments run with bounded parallelism, then are stitched into one
+        continuous sequence: repeated topics are dropped, days are renumbered
+        and short or failed segments are padded in place. Nothing is written
+        to the database.
+        
+        Args:
+            role_name: The job role or career path
+            duration_days: Plan duration in days
+            phases: Roadmap learning_path phases used to split the plan
+            user_role_id: UserRole the rows will belong to (None for templates)
+            
+        Returns:
+            (unsaved DailyPlan objects ordered by day, whether every day came from the LLM)
+            
+        Raises:
+            LLMUnavailableError: If any segment is rejected by the upstream guards
+            Exception: If every segment fails
+        """
+        segments = AIService._plan_segments(duration_days, phases)
+        
+        # Build every prompt first so an oversized segment fails before any call
+        calls = []
+        for segment in segments:
+            prompt = PromptTemplates.daily_plan_segment(
+                role_name,
+                duration_days,
+                segment["start_day"],
+                segment["end_day"],
+                segment["phase"],
+                segment["topics"]
+            )
+            days = segment["end_day"] - segment["start_day"] + 1
+            calls.append((prompt, daily_plan_budget.max_tokens_for(prompt, days)))
+        
+        # A user's segments count against their own admission limit
+        concurrency = settings.DAILY_PLAN_SEGMENT_CONCURRENCY
+        if current_llm_user.get() is not None:
+            concurrency = min(concurrency, settings.LLM_MAX_CONCURRENCY_PER_USER)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        results = await asyncio.gather(
+            *(AIService._generate_segment(prompt, max_tokens, semaphore) for prompt, max_tokens in calls),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, LLMUnavailableError):
+                raise result
+        if all(isinstance(result, BaseException) for result in results):
+            raise Exception(f"Failed to generate daily plan: {str(results[0])}")
+        
+        daily_plans = []
+        seen_topics = set()
+        complete = True
+        for segment, items in zip(segments, results):
+            days = segment["end_day"] - segment["start_day"] + 1
+            if isinstance(items, BaseException):
+                print(f"Daily plan segment {segment['start_day']}-{segment['end_day']} failed: {items}")
+                items = []
+            
+            accepted = 0
+            for day_item in items:
+                if accepted >= days:
+                    break
+                topic_key = " ".join(str(day_item.get("topic", "")).split()).casefold()
+                if not topic_key or topic_key in seen_topics:
+                    continue
+                daily_plan = AIService._build_daily_plan(user_role_id, day_item)
+                if daily_plan is None:
+                    continue
+                seen_topics.add(topic_key)
+                daily_plan.day_number = len(daily_plans) + 1
+                daily_plans.append(daily_plan)
+                accepted += 1
+            
+            # Pad short segments in place so later phases keep their days
+            for _ in range(accepted, days):
+                complete = False
+                day_num = len(daily_plans) + 1
+                daily_plans.append(DailyPlan(
+                    user_role_id=user_role_id,
+                    day_number=day_num,
+                    topic=f"Advanced {role_name} Concepts - Day {day_num}",
+                    estimated_hours=4
+                ))
+        
+        return daily_plans, complete
+    
+    @staticmethod
+    def _build_daily_plan(user_role_id: int, day_item: Dict[str, Any]) -> Optional[DailyPlan]:
+        """
+        Build a DailyPlan row from one parsed daily_plan entry
+        
+        Args:
+            user_role_id: User role ID the plan belongs to
+            day_item: Parsed {"day", "topic", "estimated_hours"} entry
+            
+        Returns:
+            DailyPlan object, or None if the entry is invalid
+        """
+        try:
+            entry = DAILY_PLAN_ENTRY_SCHEMA.validate_python(day_item)
+        except ValidationError as e:
+            # Skip invalid entries but log them
+            print(f"Skipping invalid daily plan entry: {day_item}. Error: {e.errors()[0]['msg']}")
+            return None
+        
+        return DailyPlan(
+            user_role_id=user_role_id,
+            day_number=entry.day,
+            topic=entry.topic,
+            estimated_hours=entry.estimated_hours
+        )
+    
+    @staticmethod
+    async def _replace_daily_plans(user_role_id: int, daily_plans: List[DailyPlan], db: AsyncSession) -> None:
+        """
+        Swap a UserRole's daily plan for new rows in one short transaction
+        
+        Args:
+            user_role_id: User role ID the plan belongs to
+            daily_plans: New DailyPlan objects
+            db: Database session
+            
+        Raises:
+            ValueError: If the UserRole was deleted while the plan was generated
+        """
+        try:
+            # Lock the role so concurrent regenerations swap one after the other
+            locked = await db.scalar(
+                select(UserRole.id).where(UserRole.id == user_role_id).with_for_update()
+            )
+            if locked is None:
+                raise ValueError(f"UserRole with id {user_role_id} not found")
+            await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == user_role_id))
+            db.add_all(daily_plans)
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
     
     @staticmethod
     async def teach_topic(topic: str, context: str = None) -> Dict[str, Any]:
         """
         Get an educational explanation of a topic using LLM
         
+        Results are served from the in-process teach-topic cache when possible.
+        
         Args:
             topic: The topic to explain
             context: Optional additional context for the explanation
@@ -190,6 +732,57 @@ class AIService:
         Returns:
             Dictionary with explanation, examples, and resources
             
+        Raises:
+            Exception: If LLM generation fails
+        """
+        key = AIService.teach_topic_cache_key(topic, context)
+        teach_topic_prefetcher.record_lookup(key)
+        teaching_data = await teach_topic_cache.get_or_load(
+            key,
+            lambda: AIService._generate_teaching(topic, context)
+        )
+        return dict(teaching_data)
+    
+    @staticmethod
+    async def prefetch_teach_topic(key: str, topic: str, context: Optional[str] = None) -> None:
+        """
+        Load a topic's explanation into the cache without counting a user lookup
+        
+        Args:
+            key: Cache key of (topic, context)
+            topic: The topic to explain
+            context: The context the key was built with
+        """
+        await teach_topic_cache.get_or_load(key, lambda: AIService._generate_teaching(topic, context))
+    
+    @staticmethod
+    def teach_topic_cache_key(topic: str, context: str = None) -> str:
+        """
+        Build the teach-topic cache key from the normalised topic and context
+        
+        Args:
+            topic: The topic to explain
+            context: Optional additional context
+            
+        Returns:
+            Cache key string
+        """
+        normalized_topic = " ".join(topic.split()).casefold()
+        normalized_context = " ".join((context or "").split()).casefold()
+        return f"{normalized_topic}\x1f{normalized_context}"
+    
+    @staticmethod
+    async def _generate_teaching(topic: str, context: str = None) -> Dict[str, Any]:
+        """
+        Call the LLM for a teach-topic explanation (cache loader)
+        
+        Args:
+            topic: The topic to explain
+            context: Optional additional context for the explanation
+            
+        Returns:
+            Validated teaching data
+            
         Raises:
             Exception: If LLM generation fails
         """
@@ -198,14 +791,221 @@ class AIService:
         
         # Get LLM response
         try:
-            teaching_data = await groq_client.generate_json_completion(prompt, temperature=0.7)
+            return await groq_client.generate_json_completion(
+                prompt, temperature=0.7, hedge=True, schema=TEACH_TOPIC_SCHEMA, operation="teach_topic"
+            )
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise Exception(f"Failed to generate topic explanation: {str(e)}")
+    
+    @staticmethod
+    async def stream_teach_topic(topic: str, context: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Get an educational explanation of a topic while streaming the LLM output
+        
+        Args:
+            topic: The topic to explain
+            context: Optional additional context for the explanation
+            
+        A cached explanation is returned as a single "done" event.
         
-        # Validate response structure
-        required_fields = ["topic", "explanation", "examples", "resources"]
-        for field in required_fields:
-            if field not in teaching_data:
-                teaching_data[field] = [] if field in ["examples", "resources"] else ""
+        Yields:
+            ("delta", text) for each token delta, then ("done", teaching data dict)
+            
+        Raises:
+            Exception: If LLM generation fails
+        """
+        key = AIService.teach_topic_cache_key(topic, context)
+        teach_topic_prefetcher.record_lookup(key)
+        cached = teach_topic_cache.peek(key)
+        if cached is not None:
+            yield "done", dict(cached)
+            return
         
-        return teaching_data
+        prompt = PromptTemplates.teach_topic(topic, context)
+        
+        chunks = []
+        try:
+            async for delta in groq_client.stream_completion(
+                prompt, temperature=0.7, hedge=True, operation="teach_topic"
+            ):
+                chunks.append(delta)
+                yield "delta", delta
+            teaching_data = groq_client.parse_structured_response("".join(chunks), TEACH_TOPIC_SCHEMA)
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to generate topic explanation: {str(e)}")
+        
+        teach_topic_cache.set(key, teaching_data)
+        yield "done", dict(teaching_data)
+    
+    @staticmethod
+    def _pack_topics(topics: List[str], context: str = None) -> List[Tuple[int, int, Optional[str], Optional[int]]]:
+        """
+        Split topics into evenly sized multi-topic prompts that fit the token budget
+        
+        Args:
+            topics: Topics to explain
+            context: Optional additional context
+            
+        Returns:
+            (start, end, prompt, max_tokens) per pack; prompt is None for single-topic packs
+        """
+        limit = max(1, settings.TEACH_BATCH_TOPICS_PER_PROMPT)
+        size = math.ceil(len(topics) / math.ceil(len(topics) / limit))
+        
+        packs = []
+        start = 0
+        while start < len(topics):
+            end = min(len(topics), start + size)
+            prompt = max_tokens = None
+            while end - start > 1:
+                prompt = PromptTemplates.teach_topics(topics[start:end], context)
+                try:
+                    max_tokens = teach_topic_budget.max_tokens_for(prompt, end - start)
+                    break
+                except TokenBudgetExceededError:
+                    prompt = None
+                    end -= 1
+            packs.append((start, end, prompt, max_tokens))
+            start = end
+        return packs
+    
+    @staticmethod
+    async def _teach_pack(
+        keys: List[str],
+        topics: List[str],
+        context: Optional[str],
+        prompt: Optional[str],
+        max_tokens: Optional[int],
+        semaphore: asyncio.Semaphore,
+        results: asyncio.Queue
+    ) -> None:
+        """
+        Explain one pack of topics, putting exactly one (key, data, error) per topic on the queue
+        
+        Explanations are parsed out of the multi-topic stream as each one
+        completes. Topics the model skipped, or that were left when the
+        stream failed, are retried as single-topic calls.
+        
+        Args:
+            keys: Cache keys of the topics
+            topics: Topics to explain
+            context: Optional additional context
+            prompt: Multi-topic prompt, or None to explain the single topic directly
+            max_tokens: Output token budget for the multi-topic prompt
+            semaphore: Limits how many LLM calls the batch has in flight
+            results: Queue receiving per-topic results
+        """
+        async with semaphore:
+            delivered = set()
+            
+            if prompt is not None:
+                parser = JSONArrayStreamParser("topics")
+                output_parts = []
+                usage = {}
+                order = 0
+                try:
+                    async for delta in groq_client.stream_completion(
+                        prompt, temperature=0.7, max_tokens=max_tokens, operation="teach_topics", usage=usage
+                    ):
+                        output_parts.append(delta)
+                        for item in parser.feed(delta):
+                            # Match by the requested id, falling back to the position in the array
+                            slot = item.get("id")
+                            if not isinstance(slot, int) or not 1 <= slot <= len(topics) or slot - 1 in delivered:
+                                slot = order + 1
+                            order += 1
+                            slot -= 1
+                            if slot >= len(topics) or slot in delivered:
+                                continue
+                            try:
+                                data = TEACH_TOPIC_SCHEMA.dump_python(TEACH_TOPIC_SCHEMA.validate_python(item))
+                            except ValidationError:
+                                continue
+                            if not data["explanation"]:
+                                continue
+                            data["topic"] = data["topic"] or topics[slot]
+                            teach_topic_cache.set(keys[slot], data)
+                            delivered.add(slot)
+                            results.put_nowait((keys[slot], data, None))
+                    if delivered:
+                        teach_topic_budget.observe(
+                            "".join(output_parts), len(delivered), usage.get("completion_tokens")
+                        )
+                except Exception as e:
+                    print(f"Multi-topic explanation failed after {len(delivered)}/{len(topics)} topics: {e}")
+            
+            for slot, (key, topic) in enumerate(zip(keys, topics)):
+                if slot in delivered:
+                    continue
+                try:
+                    data = await AIService.teach_topic(topic, context)
+                    results.put_nowait((key, data, None))
+                except Exception as e:
+                    results.put_nowait((key, None, e))
+    
+    @staticmethod
+    async def teach_topics(
+        topics: List[str],
+        context: str = None
+    ) -> AsyncIterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Explain several topics, yielding each explanation as soon as it is ready
+        
+        Cached topics are answered first. The rest are packed into
+        multi-topic prompts where they fit the token budget, and the packs
+        run with bounded concurrency. Repeated topics are explained once.
+        Closing the generator cancels the LLM calls still running.
+        
+        Args:
+            topics: Topics to explain
+            context: Optional additional context applying to every topic
+            
+        Yields:
+            (index in topics, teaching data or None, error or None), in completion order
+        """
+        positions: Dict[str, List[int]] = {}
+        names: Dict[str, str] = {}
+        for index, topic in enumerate(topics):
+            key = AIService.teach_topic_cache_key(topic, context)
+            positions.setdefault(key, []).append(index)
+            names.setdefault(key, topic)
+        
+        misses = []
+        for key, indices in positions.items():
+            teach_topic_prefetcher.record_lookup(key)
+            cached = teach_topic_cache.peek(key)
+            if cached is None:
+                misses.append(key)
+                continue
+            for index in indices:
+                yield index, dict(cached), None
+        if not misses:
+            return
+        
+        # A user's calls count against their own admission limit
+        concurrency = settings.TEACH_BATCH_CONCURRENCY
+        if current_llm_user.get() is not None:
+            concurrency = min(concurrency, settings.LLM_MAX_CONCURRENCY_PER_USER)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        results: asyncio.Queue = asyncio.Queue()
+        
+        miss_topics = [names[key] for key in misses]
+        tasks = [
+            asyncio.create_task(AIService._teach_pack(
+                misses[start:end], miss_topics[start:end], context, prompt, max_tokens, semaphore, results
+            ))
+            for start, end, prompt, max_tokens in AIService._pack_topics(miss_topics, context)
+        ]
+        try:
+            for _ in misses:
+                key, data, error = await results.get()
+                for index in positions[key]:
+                    yield index, dict(data) if data is not None else None, error
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
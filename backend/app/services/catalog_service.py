@@ -0,0 +1,149 @@
+"""
+Role Catalog Service
+Builds pinned roadmap and daily-plan templates for well-known roles
+"""
+
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.groq_client import groq_client
+from app.ai.prompts import PromptTemplates
+from app.ai.response_schemas import ROADMAP_SCHEMA
+from app.core.database import AsyncSessionLocal
+from app.models.catalog import RoleCatalogEntry
+from app.services.ai_service import AIService
+from app.services.template_store import TemplateStore
+
+
+class CatalogService:
+    """
+    Offline pre-generation of the role catalog
+
+    Each entry is built into a pinned GenerationTemplate, which the AI routes
+    copy on request without calling the LLM.
+    """
+
+    @staticmethod
+    async def sync_entries(roles: List[Tuple[str, int]], db: AsyncSession) -> List[RoleCatalogEntry]:
+        """
+        Get or create catalog entries for the current prompt version
+
+        Args:
+            roles: (role name, duration in days) pairs
+            db: Database session
+
+        Returns:
+            RoleCatalogEntry objects in input order (duplicates removed)
+        """
+        entries = []
+        seen = set()
+        for role_name, duration_days in roles:
+            role_key = TemplateStore.role_key(role_name)
+            if (role_key, duration_days) in seen:
+                continue
+            seen.add((role_key, duration_days))
+
+            entry = await db.scalar(select(RoleCatalogEntry).where(
+                RoleCatalogEntry.role_key == role_key,
+                RoleCatalogEntry.duration_days == duration_days,
+                RoleCatalogEntry.prompt_version == PromptTemplates.VERSION
+            ).limit(1))
+            if entry is None:
+                entry = RoleCatalogEntry(
+                    role_key=role_key,
+                    role_name=" ".join(role_name.split()),
+                    duration_days=duration_days,
+                    prompt_version=PromptTemplates.VERSION,
+                    status="pending",
+                    attempts=0
+                )
+                db.add(entry)
+            entries.append(entry)
+        await db.commit()
+        return entries
+
+    @staticmethod
+    def needs_build(entry: RoleCatalogEntry, max_age_hours: float, force: bool = False) -> bool:
+        """
+        Whether an entry should be (re)built in this run
+
+        Args:
+            entry: Catalog entry
+            max_age_hours: Ready entries built more recently than this are skipped
+            force: Rebuild every entry
+
+        Returns:
+            True if the entry must be built
+        """
+        if force or entry.status != "ready" or entry.built_at is None:
+            return True
+        return datetime.utcnow() - entry.built_at > timedelta(hours=max_age_hours)
+
+    @staticmethod
+    async def build_entry(entry_id: int) -> Dict[str, Any]:
+        """
+        Generate and pin the roadmap and daily plan of one catalog entry
+
+        The entry's status is committed as soon as it finishes, so an
+        interrupted run can be resumed. Errors are recorded, not raised.
+
+        Args:
+            entry_id: RoleCatalogEntry ID
+
+        Returns:
+            Dictionary with role_name, duration_days, status, days, seconds and error
+        """
+        started_at = time.monotonic()
+        async with AsyncSessionLocal() as db:
+            entry = await db.get(RoleCatalogEntry, entry_id)
+            role_name = entry.role_name
+            duration_days = entry.duration_days
+            entry.attempts += 1
+            await db.commit()
+
+            result = {
+                "role_name": role_name,
+                "duration_days": duration_days,
+                "status": "ready",
+                "days": 0,
+                "seconds": 0.0,
+                "error": None
+            }
+            try:
+                prompt = PromptTemplates.roadmap_generation(role_name, duration_days)
+                roadmap_data = await groq_client.generate_json_completion(
+                    prompt, temperature=0.7, schema=ROADMAP_SCHEMA, operation="catalog_roadmap"
+                )
+                await TemplateStore.save_roadmap(
+                    role_name, duration_days, json.dumps(roadmap_data, indent=2), db, pin=True
+                )
+
+                daily_plans, complete = await AIService.generate_plan_segments(
+                    role_name,
+                    duration_days,
+                    AIService.learning_path_phases(roadmap_data)
+                )
+                if not complete:
+                    raise Exception("LLM returned an incomplete daily plan")
+                await TemplateStore.save_daily_plan(role_name, duration_days, daily_plans, db, pin=True)
+                result["days"] = len(daily_plans)
+            except Exception as e:
+                await db.rollback()
+                result["status"] = "failed"
+                result["error"] = str(e)
+
+            result["seconds"] = round(time.monotonic() - started_at, 2)
+            template = await TemplateStore.find(role_name, duration_days, db)
+            entry.status = result["status"]
+            entry.error = result["error"]
+            entry.build_seconds = result["seconds"]
+            entry.template_id = template.id if template else None
+            if result["status"] == "ready":
+                entry.built_at = datetime.utcnow()
+            await db.commit()
+            return result
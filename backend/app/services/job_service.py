@@ -0,0 +1,294 @@
+"""
+Generation Job Service
+Durable Postgres-backed queue for roadmap and daily-plan generation
+"""
+
+import asyncio
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.admission import current_llm_user
+from app.ai.errors import LLMUnavailableError
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.job import GenerationJob
+from app.models.roadmap import DailyPlan, Roadmap
+from app.schemas.ai import DailyPlanItem, DailyPlanResponse, RoadmapResponse
+from app.services.ai_service import AIService
+
+JOB_KINDS = ("roadmap", "daily_plan")
+
+
+class TooManyJobsError(Exception):
+    """The user already has the maximum number of unfinished jobs"""
+
+
+class JobService:
+    """
+    Enqueue, claim and run generation jobs
+
+    The API tier only inserts rows; worker.py claims them with
+    SELECT ... FOR UPDATE SKIP LOCKED and runs the same AIService code the
+    synchronous routes use, so results are identical either way.
+    """
+
+    # Longest delay before retrying a job that failed with a transient error
+    MAX_RETRY_DELAY = 300.0
+
+    @staticmethod
+    async def enqueue(user_id: int, kind: str, payload: Dict[str, Any], db: AsyncSession) -> GenerationJob:
+        """
+        Queue a generation for the worker
+
+        Args:
+            user_id: Owner of the job
+            kind: "roadmap" or "daily_plan"
+            payload: Request body the job runs with
+            db: Database session
+
+        Returns:
+            Created GenerationJob
+
+        Raises:
+            TooManyJobsError: If the user has JOB_MAX_PENDING_PER_USER unfinished jobs
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind {kind!r}")
+
+        pending = await db.scalar(select(func.count()).select_from(GenerationJob).where(
+            GenerationJob.user_id == user_id,
+            GenerationJob.status.in_(("queued", "running"))
+        ))
+        if pending >= settings.JOB_MAX_PENDING_PER_USER:
+            raise TooManyJobsError(
+                f"You already have {pending} generation jobs in progress; wait for one to finish"
+            )
+
+        job = GenerationJob(
+            user_id=user_id,
+            kind=kind,
+            status="queued",
+            payload=json.dumps(payload),
+            attempts=0,
+            run_after=datetime.utcnow()
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(job_id: int, user_id: int, db: AsyncSession) -> Optional[GenerationJob]:
+        """
+        Fetch a job owned by the user
+
+        Args:
+            job_id: GenerationJob ID
+            user_id: Current user ID
+            db: Database session
+
+        Returns:
+            The job, or None if it does not exist or belongs to someone else
+        """
+        return await db.scalar(select(GenerationJob).where(
+            GenerationJob.id == job_id,
+            GenerationJob.user_id == user_id
+        ))
+
+    @staticmethod
+    async def claim(worker_id: str) -> Optional[int]:
+        """
+        Claim the oldest runnable job
+
+        Runnable means queued and due, or running under a lease not renewed
+        for JOB_LEASE_SECONDS (its worker died). SKIP LOCKED lets concurrent
+        workers each take a different row without waiting on one another.
+
+        Args:
+            worker_id: Identifier recorded on the claimed job
+
+        Returns:
+            Claimed job ID, or None if nothing is runnable
+        """
+        async with AsyncSessionLocal() as db:
+            while True:
+                now = datetime.utcnow()
+                lease_expired = now - timedelta(seconds=settings.JOB_LEASE_SECONDS)
+                job = await db.scalar(select(GenerationJob).where(
+                    or_(
+                        and_(GenerationJob.status == "queued", GenerationJob.run_after <= now),
+                        and_(GenerationJob.status == "running", GenerationJob.locked_at < lease_expired)
+                    )
+                ).order_by(GenerationJob.id).limit(1).with_for_update(skip_locked=True))
+                if job is None:
+                    await db.rollback()
+                    return None
+
+                if job.attempts >= settings.JOB_MAX_ATTEMPTS:
+                    # Lost its worker on the last attempt
+                    job.status = "failed"
+                    job.error = "Generation did not finish (worker stopped)"
+                    job.error_status = 500
+                    job.finished_at = now
+                    await db.commit()
+                    continue
+
+                job.status = "running"
+                job.attempts += 1
+                job.worker_id = worker_id
+                job.locked_at = now
+                job.started_at = job.started_at or now
+                await db.commit()
+                return job.id
+
+    @staticmethod
+    async def renew_lease(job_id: int, worker_id: str) -> bool:
+        """
+        Move the lease of a running job forward so it is not reclaimed
+
+        Args:
+            job_id: ID returned by claim()
+            worker_id: Worker that claimed the job
+
+        Returns:
+            False if the job is no longer running under this worker
+        """
+        async with AsyncSessionLocal() as db:
+            renewed = await db.execute(update(GenerationJob).where(
+                GenerationJob.id == job_id,
+                GenerationJob.worker_id == worker_id,
+                GenerationJob.status == "running"
+            ).values(locked_at=datetime.utcnow()))
+            await db.commit()
+            return renewed.rowcount == 1
+
+    @staticmethod
+    async def _keep_lease(job_id: int, worker_id: str) -> None:
+        """Renew a job's lease every JOB_HEARTBEAT_SECONDS until cancelled"""
+        while True:
+            await asyncio.sleep(settings.JOB_HEARTBEAT_SECONDS)
+            try:
+                if not await JobService.renew_lease(job_id, worker_id):
+                    print(f"⚠️  Job {job_id} lease lost; another worker may have claimed it")
+                    return
+            except Exception as e:
+                print(f"⚠️  Could not renew lease of job {job_id}: {e}")
+
+    @staticmethod
+    def _roadmap_result(roadmap: Roadmap) -> Dict[str, Any]:
+        """Response body of a finished roadmap job (same as /ai/generate-roadmap)"""
+        return RoadmapResponse.model_validate(roadmap).model_dump(mode="json")
+
+    @staticmethod
+    def _daily_plan_result(daily_plans: List[DailyPlan]) -> Dict[str, Any]:
+        """Response body of a finished daily-plan job (same as /ai/generate-daily-plan)"""
+        plan_items = [DailyPlanItem.model_validate(plan) for plan in daily_plans]
+        return DailyPlanResponse(
+            message=f"Successfully generated {len(plan_items)}-day learning plan",
+            total_days=len(plan_items),
+            plans=plan_items
+        ).model_dump(mode="json")
+
+    @staticmethod
+    def retry_delay(attempts: int, retry_after: Optional[float] = None) -> float:
+        """
+        Seconds to wait before the next attempt of a failed job
+
+        Args:
+            attempts: Attempts made so far
+            retry_after: Server-suggested delay, if any
+
+        Returns:
+            Delay in seconds (exponential from 5s, capped at MAX_RETRY_DELAY)
+        """
+        delay = 5.0 * 2 ** max(0, attempts - 1)
+        if retry_after:
+            delay = max(delay, retry_after)
+        return min(delay, JobService.MAX_RETRY_DELAY)
+
+    @staticmethod
+    async def run(job_id: int) -> str:
+        """
+        Run a claimed job and store its result or error
+
+        Validation errors fail the job with 400. Other errors, including
+        fast-fail LLM rejections (circuit open, admission limits), are retried
+        with backoff until JOB_MAX_ATTEMPTS is reached; a rejection waits at
+        least its Retry-After. The job's lease is renewed while it runs.
+
+        Args:
+            job_id: ID returned by claim()
+
+        Returns:
+            Final status of this attempt ("succeeded", "queued" or "failed")
+        """
+        async with AsyncSessionLocal() as db:
+            job = await db.get(GenerationJob, job_id)
+            if job is None:
+                return "failed"
+            heartbeat = asyncio.create_task(JobService._keep_lease(job_id, job.worker_id))
+            try:
+                return await JobService._run_claimed(job, db)
+            finally:
+                heartbeat.cancel()
+
+    @staticmethod
+    async def _run_claimed(job: GenerationJob, db: AsyncSession) -> str:
+        """Body of run(): generate, then store the result or schedule a retry"""
+        job_id = job.id
+        payload = json.loads(job.payload)
+        current_llm_user.set(job.user_id)
+
+        error_status = 500
+        retry_after = None
+        try:
+            if job.kind == "roadmap":
+                roadmap = await AIService.generate_roadmap(
+                    role_name=payload["role_name"],
+                    duration_days=payload["duration_days"],
+                    user_id=job.user_id,
+                    db=db,
+                    regenerate=payload.get("regenerate", False)
+                )
+                result = JobService._roadmap_result(roadmap)
+            else:
+                daily_plans = await AIService.generate_daily_plan(
+                    user_role_id=payload["user_role_id"],
+                    db=db,
+                    regenerate=payload.get("regenerate", False)
+                )
+                result = JobService._daily_plan_result(daily_plans)
+        except ValueError as e:
+            error, error_status, retryable = str(e), 400, False
+        except LLMUnavailableError as e:
+            error, error_status, retryable = str(e), e.status_code, True
+            retry_after = e.retry_after
+        except Exception as e:
+            error, retryable = str(e), True
+        else:
+            job.status = "succeeded"
+            job.result = json.dumps(result)
+            job.error = None
+            job.error_status = None
+            job.finished_at = datetime.utcnow()
+            await db.commit()
+            return job.status
+
+        await db.rollback()
+        job = await db.get(GenerationJob, job_id, populate_existing=True)
+        job.error = error
+        if retryable and job.attempts < settings.JOB_MAX_ATTEMPTS:
+            job.status = "queued"
+            delay = JobService.retry_delay(job.attempts, retry_after)
+            job.run_after = datetime.utcnow() + timedelta(seconds=math.ceil(delay))
+        else:
+            job.status = "failed"
+            job.error_status = error_status
+            job.finished_at = datetime.utcnow()
+        await db.commit()
+        return job.status
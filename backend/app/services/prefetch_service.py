@@ -0,0 +1,151 @@
+"""
+Prefetch Service
+Finds the upcoming daily-plan topics of active users and queues them for prefetching
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, select
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.roadmap import DailyPlan
+from app.models.user import UserRole
+from app.services.ai_service import AIService, teach_topic_prefetcher
+
+# Longest plan duration accepted by the API; older roles have no current day
+MAX_PLAN_DAYS = 365
+
+
+class PrefetchService:
+    """
+    Feed teach_topic_prefetcher with the topics users are about to open
+
+    A plan's day 1 is the day its role was created, so "today" for a role
+    is the number of days since then. The next TEACH_PREFETCH_DAYS topics
+    (today included) are queued right after a plan is generated and again
+    on every periodic sweep of active plans.
+    """
+
+    @staticmethod
+    def current_day(created_at: Optional[datetime], now: Optional[datetime] = None) -> int:
+        """
+        Plan day the user is on
+
+        Args:
+            created_at: When the user role was created
+            now: Current UTC time (defaults to now)
+
+        Returns:
+            1-based day number
+        """
+        if created_at is None:
+            return 1
+        now = now or datetime.utcnow()
+        return max(1, (now - created_at).days + 1)
+
+    @staticmethod
+    def _submit(topics: List[str], context: Optional[str] = None) -> int:
+        """
+        Queue topics under the cache keys of (topic, context)
+
+        The key and the prefetched explanation are built from the same
+        context, so a prefetch only ever answers teach-topic calls that
+        send that context. Plan topics have none, matching the learn page
+        when its context field is left empty.
+
+        Returns:
+            Number of topics queued
+        """
+        queued = 0
+        for topic in topics:
+            key = AIService.teach_topic_cache_key(topic, context)
+            if teach_topic_prefetcher.submit(key, (topic, context)):
+                queued += 1
+        return queued
+
+    @staticmethod
+    def schedule_plans(user_role: UserRole, daily_plans: List[DailyPlan]) -> int:
+        """
+        Queue the upcoming topics of a freshly generated plan
+
+        Args:
+            user_role: Role the plan belongs to
+            daily_plans: The plan's DailyPlan rows
+
+        Returns:
+            Number of topics queued
+        """
+        if not settings.TEACH_PREFETCH_ENABLED:
+            return 0
+        today = PrefetchService.current_day(user_role.created_at)
+        upcoming = sorted(
+            (plan for plan in daily_plans if today <= plan.day_number < today + settings.TEACH_PREFETCH_DAYS),
+            key=lambda plan: plan.day_number
+        )
+        return PrefetchService._submit([plan.topic for plan in upcoming])
+
+    @staticmethod
+    async def upcoming_topics() -> List[str]:
+        """
+        Topics of the next few days of every active plan, nearest days first
+
+        A plan is active while its current day is within its duration. Only
+        the TEACH_PREFETCH_MAX_ROLES most recently created roles are scanned.
+
+        Returns:
+            Topics in the order they should be prefetched
+        """
+        now = datetime.utcnow()
+        async with AsyncSessionLocal() as db:
+            roles = (await db.execute(select(UserRole.id, UserRole.created_at, UserRole.duration_days).where(
+                UserRole.created_at >= now - timedelta(days=MAX_PLAN_DAYS),
+                UserRole.daily_plans.any()
+            ).order_by(UserRole.created_at.desc()).limit(settings.TEACH_PREFETCH_MAX_ROLES))).all()
+
+            windows = {}
+            for role_id, created_at, duration_days in roles:
+                today = PrefetchService.current_day(created_at, now)
+                if today <= duration_days:
+                    windows[role_id] = today
+            if not windows:
+                return []
+
+            rows = (await db.execute(select(DailyPlan.user_role_id, DailyPlan.day_number, DailyPlan.topic).where(or_(*[
+                and_(
+                    DailyPlan.user_role_id == role_id,
+                    DailyPlan.day_number >= today,
+                    DailyPlan.day_number < today + settings.TEACH_PREFETCH_DAYS
+                )
+                for role_id, today in windows.items()
+            ])))).all()
+
+        ordered = sorted(
+            (day_number - windows[role_id], topic) for role_id, day_number, topic in rows
+        )
+        return [topic for _, topic in ordered]
+
+    @staticmethod
+    async def sweep() -> int:
+        """
+        Queue the upcoming topics of all active plans
+
+        Returns:
+            Number of topics queued
+        """
+        topics = await PrefetchService.upcoming_topics()
+        return PrefetchService._submit(topics)
+
+    @staticmethod
+    async def run_sweeps() -> None:
+        """Sweep active plans every TEACH_PREFETCH_SWEEP_SECONDS until cancelled"""
+        while True:
+            try:
+                queued = await PrefetchService.sweep()
+                if queued:
+                    print(f"Queued {queued} teach topics for prefetching")
+            except Exception as e:
+                print(f"Teach-topic prefetch sweep failed: {e}")
+            await asyncio.sleep(settings.TEACH_PREFETCH_SWEEP_SECONDS)
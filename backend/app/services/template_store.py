@@ -0,0 +1,275 @@
+"""
+Template Store
+Cross-user cache of generated roadmaps and daily plans stored in the database
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import delete, insert, literal, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.ai.prompts import PromptTemplates
+from app.core.config import settings
+from app.models.roadmap import DailyPlan
+from app.models.template import GenerationTemplate, TemplateDailyPlan
+
+
+class TemplateStore:
+    """
+    Content-addressed store of generated content
+
+    Templates are keyed by (normalised role, duration, prompt version), so any
+    user asking for the same learning goal is served by copying rows instead
+    of calling the LLM again. Pinned templates are built by the offline role
+    catalog and are served regardless of age or TEMPLATE_CACHE_ENABLED.
+    """
+
+    @staticmethod
+    def role_key(role_name: str) -> str:
+        """
+        Normalise a role name for template lookups
+
+        Args:
+            role_name: Role name as entered by the user
+
+        Returns:
+            Case-folded role name with collapsed whitespace
+        """
+        return " ".join(role_name.split()).casefold()
+
+    @staticmethod
+    def _is_fresh(template: GenerationTemplate, generated_at: Optional[datetime]) -> bool:
+        """
+        Whether template content generated at the given time may still be served
+
+        Args:
+            template: Template the content belongs to
+            generated_at: UTC generation timestamp
+
+        Returns:
+            True if present and pinned or within TEMPLATE_CACHE_MAX_AGE_HOURS (0 = no expiry)
+        """
+        if generated_at is None:
+            return False
+        if template.pinned or settings.TEMPLATE_CACHE_MAX_AGE_HOURS <= 0:
+            return True
+        max_age = timedelta(hours=settings.TEMPLATE_CACHE_MAX_AGE_HOURS)
+        return datetime.utcnow() - generated_at <= max_age
+
+    @staticmethod
+    async def find(role_name: str, duration_days: int, db: AsyncSession) -> Optional[GenerationTemplate]:
+        """
+        Look up the template for a learning goal
+
+        Args:
+            role_name: Role name (normalised internally)
+            duration_days: Plan duration in days
+            db: Database session
+
+        Returns:
+            GenerationTemplate or None
+        """
+        template = await TemplateStore._lookup(role_name, duration_days, db)
+        if template is None or not (template.pinned or settings.TEMPLATE_CACHE_ENABLED):
+            return None
+        return template
+
+    @staticmethod
+    async def _lookup(role_name: str, duration_days: int, db: AsyncSession) -> Optional[GenerationTemplate]:
+        """Fetch the template row for a key, whether or not it may be served"""
+        return await db.scalar(select(GenerationTemplate).where(
+            GenerationTemplate.role_key == TemplateStore.role_key(role_name),
+            GenerationTemplate.duration_days == duration_days,
+            GenerationTemplate.prompt_version == PromptTemplates.VERSION
+        ).limit(1))
+
+    @staticmethod
+    async def get_roadmap_text(role_name: str, duration_days: int, db: AsyncSession) -> Optional[str]:
+        """
+        Fetch a fresh cached roadmap
+
+        Args:
+            role_name: Role name
+            duration_days: Plan duration in days
+            db: Database session
+
+        Returns:
+            Stored roadmap JSON text, or None on a miss
+        """
+        template = await TemplateStore.find(role_name, duration_days, db)
+        if template is None or not template.roadmap_text:
+            return None
+        if not TemplateStore._is_fresh(template, template.roadmap_generated_at):
+            return None
+        return template.roadmap_text
+
+    @staticmethod
+    async def copy_daily_plan(
+        role_name: str,
+        duration_days: int,
+        user_role_id: int,
+        db: AsyncSession
+    ) -> Optional[List[DailyPlan]]:
+        """
+        Replace a UserRole's daily plan with a fresh template
+
+        The old rows are deleted and the template rows copied server-side
+        with a single INSERT ... SELECT, in one transaction.
+
+        Args:
+            role_name: Role name
+            duration_days: Plan duration in days
+            user_role_id: UserRole receiving the plan
+            db: Database session
+
+        Returns:
+            Created DailyPlan objects ordered by day, or None on a miss
+        """
+        template = await TemplateStore.find(role_name, duration_days, db)
+        if template is None or not TemplateStore._is_fresh(template, template.daily_plan_generated_at):
+            return None
+
+        source = select(
+            literal(user_role_id),
+            TemplateDailyPlan.day_number,
+            TemplateDailyPlan.topic,
+            TemplateDailyPlan.estimated_hours
+        ).where(TemplateDailyPlan.template_id == template.id)
+
+        async with db.begin_nested() as savepoint:
+            await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == user_role_id))
+            result = await db.execute(
+                insert(DailyPlan).from_select(
+                    ["user_role_id", "day_number", "topic", "estimated_hours"],
+                    source
+                )
+            )
+            copied = bool(result.rowcount)
+            if not copied:
+                # Empty template: keep the current plan
+                await savepoint.rollback()
+        if not copied:
+            await db.rollback()
+            return None
+
+        daily_plans = list(await db.scalars(select(DailyPlan).where(
+            DailyPlan.user_role_id == user_role_id
+        ).order_by(DailyPlan.day_number)))
+        await db.commit()
+        return daily_plans
+
+    @staticmethod
+    async def _get_or_create(role_name: str, duration_days: int, db: AsyncSession) -> GenerationTemplate:
+        """Return the template row for a key, creating it if needed (inside a savepoint)"""
+        template = await TemplateStore._lookup(role_name, duration_days, db)
+        if template is None:
+            template = GenerationTemplate(
+                role_key=TemplateStore.role_key(role_name),
+                duration_days=duration_days,
+                prompt_version=PromptTemplates.VERSION
+            )
+            db.add(template)
+            await db.flush()
+        return template
+
+    @staticmethod
+    async def save_roadmap(
+        role_name: str,
+        duration_days: int,
+        roadmap_text: str,
+        db: AsyncSession,
+        pin: bool = False
+    ) -> None:
+        """
+        Store a freshly generated roadmap as the template for its key
+
+        Database errors are rolled back and logged, not raised: the template
+        cache is best-effort. Catalog saves (pin set) are the exception, so
+        the builder can mark the entry failed. Pinned templates are only
+        replaced when pin is set. The session's transaction is always ended.
+
+        Args:
+            role_name: Role name
+            duration_days: Plan duration in days
+            roadmap_text: Roadmap JSON text
+            db: Database session
+            pin: Mark the template as a catalog entry
+
+        Raises:
+            SQLAlchemyError: If a catalog save fails
+        """
+        if not (pin or settings.TEMPLATE_CACHE_ENABLED):
+            return
+        try:
+            async with db.begin_nested():
+                template = await TemplateStore._get_or_create(role_name, duration_days, db)
+                if pin or not template.pinned:
+                    template.pinned = template.pinned or pin
+                    template.roadmap_text = roadmap_text
+                    template.roadmap_generated_at = datetime.utcnow()
+            await db.commit()
+        except SQLAlchemyError as e:
+            # E.g. another request stored the same key concurrently
+            await db.rollback()
+            if pin:
+                raise
+            print(f"Skipping roadmap template save for {role_name!r}: {e}")
+
+    @staticmethod
+    async def save_daily_plan(
+        role_name: str,
+        duration_days: int,
+        daily_plans: List[DailyPlan],
+        db: AsyncSession,
+        pin: bool = False
+    ) -> None:
+        """
+        Store a freshly generated daily plan as the template for its key
+
+        Database errors are rolled back and logged, not raised: the template
+        cache is best-effort. Catalog saves (pin set) are the exception, so
+        the builder can mark the entry failed. Pinned templates are only
+        replaced when pin is set. The session's transaction is always ended.
+
+        Args:
+            role_name: Role name
+            duration_days: Plan duration in days
+            daily_plans: Generated DailyPlan rows
+            db: Database session
+            pin: Mark the template as a catalog entry
+
+        Raises:
+            SQLAlchemyError: If a catalog save fails
+        """
+        if not (pin or settings.TEMPLATE_CACHE_ENABLED):
+            return
+        rows = [
+            {
+                "day_number": plan.day_number,
+                "topic": plan.topic,
+                "estimated_hours": plan.estimated_hours
+            }
+            for plan in daily_plans
+        ]
+        try:
+            async with db.begin_nested():
+                template = await TemplateStore._get_or_create(role_name, duration_days, db)
+                if pin or not template.pinned:
+                    template.pinned = template.pinned or pin
+                    await db.execute(delete(TemplateDailyPlan).where(
+                        TemplateDailyPlan.template_id == template.id
+                    ))
+                    await db.execute(
+                        insert(TemplateDailyPlan),
+                        [dict(row, template_id=template.id) for row in rows]
+                    )
+                    template.daily_plan_generated_at = datetime.utcnow()
+            await db.commit()
+        except SQLAlchemyError as e:
+            # E.g. another request stored the same key concurrently
+            await db.rollback()
+            if pin:
+                raise
+            print(f"Skipping daily plan template save for {role_name!r}: {e}")
@@ -8,7 +8,8 @@ from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.database import get_db
 from app.models.user import User
@@ -72,9 +73,9 @@ def verify_token(token: str) -> Optional[str]:
         return None
 
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token
@@ -101,8 +102,14 @@ def get_current_user(
         raise credentials_exception
     
     # Get user from database
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if user is None:
         raise credentials_exception
     
+    # End the lookup's transaction so the connection goes back to the pool;
+    # routes that go on to await the LLM must not hold it meanwhile, and
+    # later queries on this session start a new transaction (commit, unlike
+    # rollback, leaves the loaded user usable)
+    await db.commit()
+    
     return user
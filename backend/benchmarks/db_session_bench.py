@@ -0,0 +1,236 @@
+"""
+Database Session Benchmark
+Sync Session on the event loop vs AsyncSession under a mixed request load
+
+Usage (from backend/):
+    python benchmarks/db_session_bench.py [--database-url URL] [--requests 2000] [--rate 100]
+
+Simulated requests arrive at a fixed rate and each runs one query the AI
+routes issue (plan reads, plan rewrites, or an occasional slow query) from
+its own task, the way an `async def` route does. Latency is measured from
+arrival. A ticker standing in for an LLM stream records how
+late the event loop wakes it up. Defaults to a throwaway SQLite file; point
+--database-url at a scratch Postgres database for production-like numbers.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+sys.path.append(".")
+
+# Slow query: a server-side loop, portable between SQLite and Postgres
+SLOW_QUERY = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < {rows}) "
+    "SELECT count(*) FROM c"
+)
+
+# How often the stream ticker expects to run (seconds)
+TICK = 0.01
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0 when empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed(session_factory, roles: int, days: int) -> List[int]:
+    """Create a user with `roles` roles of `days` plan rows each, unless already seeded"""
+    from app.models.roadmap import DailyPlan
+    from app.models.user import User, UserRole
+
+    with session_factory() as db:
+        ids = [role_id for (role_id,) in db.query(UserRole.id).all()]
+        if len(ids) >= roles:
+            return ids[:roles]
+        user = User(email="bench@example.com", username="bench", password_hash="x", full_name="Bench")
+        db.add(user)
+        db.flush()
+        for i in range(roles):
+            role = UserRole(user_id=user.id, role_name=f"Role {i}", duration_days=days)
+            db.add(role)
+            db.flush()
+            db.add_all(
+                DailyPlan(user_role_id=role.id, day_number=d, topic=f"Topic {d}", estimated_hours=3)
+                for d in range(1, days + 1)
+            )
+        db.commit()
+        return [role_id for (role_id,) in db.query(UserRole.id).all()]
+
+
+def plan_workload(count: int, write_ratio: float, slow_every: int) -> List[str]:
+    """Request kinds in a fixed random order, so both modes run the same mix"""
+    rng = random.Random(42)
+    kinds = []
+    for i in range(count):
+        if slow_every and i % slow_every == 0:
+            kinds.append("slow")
+        elif rng.random() < write_ratio:
+            kinds.append("write")
+        else:
+            kinds.append("read")
+    return kinds
+
+
+def sync_request(kind: str, role_id: int, days: int, slow_rows: int) -> None:
+    """One request's database work on a blocking Session"""
+    from sqlalchemy import delete, select, text
+    from app.core.database import SessionLocal
+    from app.models.roadmap import DailyPlan
+
+    with SessionLocal() as db:
+        if kind == "read":
+            db.scalars(select(DailyPlan).where(
+                DailyPlan.user_role_id == role_id
+            ).order_by(DailyPlan.day_number)).all()
+        elif kind == "write":
+            db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == role_id))
+            db.add_all(
+                DailyPlan(user_role_id=role_id, day_number=d, topic=f"Topic {d}", estimated_hours=3)
+                for d in range(1, days + 1)
+            )
+            db.commit()
+        else:
+            db.execute(text(SLOW_QUERY.format(rows=slow_rows))).scalar()
+
+
+async def async_request(kind: str, role_id: int, days: int, slow_rows: int) -> None:
+    """The same database work on an AsyncSession"""
+    from sqlalchemy import delete, select, text
+    from app.core.database import AsyncSessionLocal
+    from app.models.roadmap import DailyPlan
+
+    async with AsyncSessionLocal() as db:
+        if kind == "read":
+            (await db.scalars(select(DailyPlan).where(
+                DailyPlan.user_role_id == role_id
+            ).order_by(DailyPlan.day_number))).all()
+        elif kind == "write":
+            await db.execute(delete(DailyPlan).where(DailyPlan.user_role_id == role_id))
+            db.add_all(
+                DailyPlan(user_role_id=role_id, day_number=d, topic=f"Topic {d}", estimated_hours=3)
+                for d in range(1, days + 1)
+            )
+            await db.commit()
+        else:
+            (await db.execute(text(SLOW_QUERY.format(rows=slow_rows)))).scalar()
+
+
+async def run_mode(
+    label: str,
+    request: Callable,
+    kinds: List[str],
+    role_ids: List[int],
+    args: argparse.Namespace
+) -> Dict[str, float]:
+    """Send the workload at a fixed arrival rate alongside a stream ticker"""
+    latencies: Dict[str, List[float]] = {"read": [], "write": [], "slow": []}
+    lags: List[float] = []
+    done = asyncio.Event()
+    errors = 0
+
+    async def ticker() -> None:
+        while not done.is_set():
+            started_at = time.monotonic()
+            await asyncio.sleep(TICK)
+            lags.append(time.monotonic() - started_at - TICK)
+
+    async def handle(kind: str, role_id: int, arrived_at: float) -> None:
+        nonlocal errors
+        try:
+            result = request(kind, role_id, args.days, args.slow_rows)
+            if asyncio.iscoroutine(result):
+                await result
+        except Exception:
+            errors += 1
+        # Measured from arrival, so time spent waiting for a blocked loop counts
+        latencies[kind].append(time.monotonic() - arrived_at)
+
+    tick_task = asyncio.create_task(ticker())
+    started_at = time.monotonic()
+    tasks = []
+    for i, kind in enumerate(kinds):
+        arrives_at = started_at + i / args.rate
+        delay = arrives_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(handle(kind, role_ids[i % len(role_ids)], arrives_at)))
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started_at
+    done.set()
+    await tick_task
+
+    fast = latencies["read"] + latencies["write"]
+    stats = {
+        "req_per_s": len(kinds) / elapsed,
+        "fast_p50_ms": percentile(fast, 50) * 1000,
+        "fast_p99_ms": percentile(fast, 99) * 1000,
+        "slow_p50_ms": percentile(latencies["slow"], 50) * 1000,
+        "lag_p99_ms": percentile(lags, 99) * 1000,
+        "lag_max_ms": max(lags, default=0.0) * 1000,
+        "errors": errors
+    }
+    print(
+        f"   {label:<18} {stats['req_per_s']:9.0f} {stats['fast_p50_ms']:9.1f} {stats['fast_p99_ms']:9.1f} "
+        f"{stats['slow_p50_ms']:9.1f} {stats['lag_p99_ms']:10.1f} {stats['lag_max_ms']:10.1f} {errors:6d}"
+    )
+    return stats
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from app.core.base import Base
+    from app.core.database import SessionLocal, async_engine, engine
+    import app.models  # noqa: F401  (register every table)
+
+    Base.metadata.create_all(engine)
+    role_ids = seed(SessionLocal, args.roles, args.days)
+    kinds = plan_workload(args.requests, args.write_ratio, args.slow_every)
+
+    print("=" * 84)
+    print(
+        f"{engine.dialect.name}: {args.requests} requests at {args.rate:g}/s, "
+        f"{args.write_ratio:.0%} writes, 1 slow query every {args.slow_every}"
+    )
+    print("=" * 84)
+    print(f"   {'session':<18} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'slow ms':>9} {'lag p99':>10} {'lag max':>10} {'errors':>6}")
+    for _ in range(args.rounds):
+        await run_mode("sync Session", sync_request, kinds, role_ids, args)
+        await run_mode("AsyncSession", async_request, kinds, role_ids, args)
+    print("\np50/p99: read and write requests; slow: the slow query; lag: how late the stream ticker ran")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database sessions")
+    parser.add_argument("--database-url", default=None,
+                        help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run (default: 2000)")
+    parser.add_argument("--rate", type=float, default=100.0, help="Requests arriving per second (default: 100)")
+    parser.add_argument("--write-ratio", type=float, default=0.2, help="Share of plan rewrites (default: 0.2)")
+    parser.add_argument("--slow-every", type=int, default=50, help="One slow query per N requests (default: 50)")
+    parser.add_argument("--slow-rows", type=int, default=200000, help="Rows the slow query counts (default: 200000)")
+    parser.add_argument("--roles", type=int, default=200, help="Seeded user roles (default: 200)")
+    parser.add_argument("--days", type=int, default=30, help="Plan rows per role (default: 30)")
+    parser.add_argument("--rounds", type=int, default=2, help="Runs of each mode, alternating (default: 2)")
+    args = parser.parse_args()
+
+    # The app reads its database from settings; point it at the scratch database
+    # before app.core.database is imported
+    os.environ["DATABASE_URL"] = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "db_session_bench.db")
+    )
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Index Benchmark
+Query plans and latency of the hot query paths before and after the c7e2a4b9d1f3 indexes
+
+Usage (from backend/):
+    python benchmarks/index_bench.py [--database-url URL] [--roles 35000] [--days 30]
+
+Seeds a scratch database (by default 35,000 roles x 30 days = 1.05M daily
+plan rows, with roadmaps and some topic progress), drops the migration's
+indexes, and times the queries the AI routes issue: a role's plan, the
+prefetch window, the role lookup by name, the roadmap, and deleting a
+role's plan (rolled back). It prints each query's plan (EXPLAIN on
+Postgres, EXPLAIN QUERY PLAN on SQLite), then builds the indexes and
+repeats. Defaults to a throwaway SQLite file; point --database-url at a
+scratch Postgres database for production-like numbers. An already seeded
+database is reused.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+sys.path.append(".")
+
+# Indexes added by migration c7e2a4b9d1f3
+NEW_INDEXES = (
+    "ix_daily_plans_user_role_id_day_number",
+    "ix_roadmaps_user_role_id",
+    "ix_topic_progress_daily_plan_id",
+    "uq_user_roles_user_id_role_name",
+)
+
+# Hot queries, as issued by the services and routes
+QUERIES = {
+    "role plan": (
+        "SELECT id, day_number, topic, estimated_hours FROM daily_plans "
+        "WHERE user_role_id = :role_id ORDER BY day_number"
+    ),
+    "prefetch window": (
+        "SELECT user_role_id, day_number, topic FROM daily_plans "
+        "WHERE user_role_id = :role_id AND day_number >= :day AND day_number < :day + 3"
+    ),
+    "role by name": (
+        "SELECT id, duration_days FROM user_roles "
+        "WHERE user_id = :user_id AND lower(role_name) = lower(:role_name)"
+    ),
+    "roadmap": "SELECT id, roadmap_text FROM roadmaps WHERE user_role_id = :role_id",
+}
+
+# Deleting a plan: its topic progress first (the FK cascade on Postgres), then the days
+DELETE_PLAN = (
+    "DELETE FROM topic_progress WHERE daily_plan_id IN "
+    "(SELECT id FROM daily_plans WHERE user_role_id = :role_id)",
+    "DELETE FROM daily_plans WHERE user_role_id = :role_id",
+)
+
+ROLES_PER_USER = 7
+CHUNK = 20000
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (0 when empty)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def new_indexes() -> List:
+    """The migration's Index objects, taken from the models"""
+    from app.core.base import Base
+
+    return [
+        index
+        for table in Base.metadata.sorted_tables
+        for index in table.indexes
+        if index.name in NEW_INDEXES
+    ]
+
+
+def insert_chunked(connection, statement, rows) -> None:
+    """executemany in chunks, so the parameter lists stay bounded"""
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == CHUNK:
+            connection.execute(statement, batch)
+            batch = []
+    if batch:
+        connection.execute(statement, batch)
+
+
+def seed(engine, roles: int, days: int, progress_every: int) -> Tuple[int, int]:
+    """
+    Fill the scratch database unless it already holds plans
+
+    Returns:
+        (user count, role count) in the database
+    """
+    from sqlalchemy import func, insert, select, text
+    from app.models.roadmap import DailyPlan, Roadmap
+    from app.models.user import User, UserRole
+
+    with engine.begin() as connection:
+        if connection.scalar(select(func.count()).select_from(DailyPlan)):
+            return (
+                connection.scalar(select(func.max(User.id))),
+                connection.scalar(select(func.max(UserRole.id)))
+            )
+
+        users = (roles + ROLES_PER_USER - 1) // ROLES_PER_USER
+        started_at = time.monotonic()
+        insert_chunked(connection, insert(User), (
+            {"id": u, "email": f"bench{u}@example.com", "username": f"bench{u}",
+             "password_hash": "x", "full_name": f"Bench {u}"}
+            for u in range(1, users + 1)
+        ))
+        insert_chunked(connection, insert(UserRole), (
+            {"id": r, "user_id": (r - 1) // ROLES_PER_USER + 1,
+             "role_name": f"Role {r % ROLES_PER_USER}", "duration_days": days}
+            for r in range(1, roles + 1)
+        ))
+        insert_chunked(connection, insert(Roadmap), (
+            {"user_role_id": r, "roadmap_text": "{}"} for r in range(1, roles + 1)
+        ))
+        insert_chunked(connection, insert(DailyPlan), (
+            {"user_role_id": r, "day_number": d, "topic": f"Topic {d}", "estimated_hours": 3}
+            for r in range(1, roles + 1)
+            for d in range(1, days + 1)
+        ))
+        connection.execute(text(
+            "INSERT INTO topic_progress (daily_plan_id, is_completed) "
+            "SELECT id, :done FROM daily_plans WHERE id % :every = 0"
+        ), {"done": True, "every": progress_every})
+        print(f"Seeded {roles * days:,} plan rows in {time.monotonic() - started_at:.1f}s")
+    return users, roles
+
+
+def analyze(engine) -> None:
+    """Refresh planner statistics"""
+    from sqlalchemy import text
+
+    with engine.begin() as connection:
+        connection.execute(text("ANALYZE"))
+
+
+def explain(engine, sql: str, params: Dict) -> List[str]:
+    """The database's plan for one query"""
+    from sqlalchemy import text
+
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as connection:
+        rows = connection.execute(text(prefix + sql), params).all()
+    # SQLite: (id, parent, notused, detail); Postgres: one text column
+    return [str(row[-1]) for row in rows]
+
+
+def time_queries(engine, users: int, roles: int, days: int, lookups: int) -> Dict[str, List[float]]:
+    """Run every hot query `lookups` times with random parameters"""
+    from sqlalchemy import text
+
+    rng = random.Random(42)
+    samples: Dict[str, List[float]] = {name: [] for name in list(QUERIES) + ["delete plan"]}
+    with engine.connect() as connection:
+        for _ in range(lookups):
+            role_id = rng.randint(1, roles)
+            params = {
+                "role_id": role_id,
+                "day": rng.randint(1, days),
+                "user_id": rng.randint(1, users),
+                "role_name": f"ROLE {rng.randrange(ROLES_PER_USER)}"
+            }
+            for name, sql in QUERIES.items():
+                started_at = time.perf_counter()
+                connection.execute(text(sql), params).all()
+                samples[name].append(time.perf_counter() - started_at)
+            connection.commit()
+
+            started_at = time.perf_counter()
+            for sql in DELETE_PLAN:
+                connection.execute(text(sql), params)
+            samples["delete plan"].append(time.perf_counter() - started_at)
+            connection.rollback()
+    return samples
+
+
+def report(label: str, engine, users: int, roles: int, args: argparse.Namespace) -> Dict[str, float]:
+    """Print the plans and latency table for the current set of indexes"""
+    sample = {"role_id": roles // 2, "day": 5, "user_id": users // 2, "role_name": "Role 3"}
+    print("\n" + "=" * 72)
+    print(label)
+    print("=" * 72)
+    if not args.no_explain:
+        for name, sql in list(QUERIES.items()) + [("delete plan", DELETE_PLAN[0])]:
+            print(f"-- {name}")
+            for line in explain(engine, sql, sample):
+                print(f"   {line}")
+
+    samples = time_queries(engine, users, roles, args.days, args.lookups)
+    print(f"\n   {'query':<18} {'p50 ms':>9} {'p99 ms':>9}")
+    p50s = {}
+    for name, values in samples.items():
+        p50s[name] = percentile(values, 50) * 1000
+        print(f"   {name:<18} {p50s[name]:9.2f} {percentile(values, 99) * 1000:9.2f}")
+    return p50s
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the hot-path indexes")
+    parser.add_argument("--database-url", default=None,
+                        help="Scratch database (default: a temporary SQLite file)")
+    parser.add_argument("--roles", type=int, default=35000, help="Seeded user roles (default: 35000)")
+    parser.add_argument("--days", type=int, default=30, help="Plan rows per role (default: 30)")
+    parser.add_argument("--progress-every", type=int, default=5,
+                        help="One topic_progress row per N plan rows (default: 5)")
+    parser.add_argument("--lookups", type=int, default=200, help="Timed runs of each query (default: 200)")
+    parser.add_argument("--no-explain", action="store_true", help="Skip printing query plans")
+    args = parser.parse_args()
+
+    # The app reads its database from settings; point it at the scratch database
+    # before app.core.database is imported
+    os.environ["DATABASE_URL"] = args.database_url or (
+        "sqlite:///" + os.path.join(tempfile.mkdtemp(), "index_bench.db")
+    )
+
+    from sqlalchemy import text
+    from app.core.base import Base
+    from app.core.database import engine
+    import app.models  # noqa: F401  (register every table)
+
+    Base.metadata.create_all(engine)
+    indexes = new_indexes()
+    # Seeding without the indexes is faster, and leaves the "before" state
+    with engine.begin() as connection:
+        for index in indexes:
+            # Not index.drop(checkfirst=True): expression indexes cannot be reflected
+            connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+    users, roles = seed(engine, args.roles, args.days, args.progress_every)
+    analyze(engine)
+    before = report(f"{engine.dialect.name}: {roles * args.days:,} plan rows, without indexes", engine, users, roles, args)
+
+    started_at = time.monotonic()
+    with engine.begin() as connection:
+        for index in indexes:
+            index.create(connection)
+    print(f"\nBuilt {len(indexes)} indexes in {time.monotonic() - started_at:.1f}s")
+    analyze(engine)
+    after = report(f"{engine.dialect.name}: {roles * args.days:,} plan rows, with indexes", engine, users, roles, args)
+
+    print(f"\n   {'query':<18} {'speedup (p50)':>14}")
+    for name in before:
+        print(f"   {name:<18} {before[name] / max(after[name], 1e-6):13.0f}x")
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
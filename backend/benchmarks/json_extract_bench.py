@@ -0,0 +1,111 @@
+"""
+JSON Extraction Benchmark
+Recovery rate and speed of extract_json vs the previous fence/rfind parser
+
+Usage (from backend/):
+    python benchmarks/json_extract_bench.py [--repeat 2000] [--corpus DIR]
+
+The bundled corpus reconstructs common failure shapes. Point --corpus at the
+directory filled by LLM_MALFORMED_RESPONSE_DIR to replay captured responses.
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.append(".")
+
+from app.ai.json_extract import JSONExtractionError, extract_json
+
+CORPUS_DIR = Path(__file__).parent / "json_corpus"
+
+
+def legacy_parse(response_text: str):
+    """Previous GroqClient.parse_json_response logic, kept for comparison"""
+    response_text = response_text.strip()
+    try:
+        if "```json" in response_text:
+            start = response_text.find("```json") + 7
+            end = response_text.find("```", start)
+            response_text = response_text[start:end].strip()
+        elif "```" in response_text:
+            start = response_text.find("```") + 3
+            end = response_text.find("```", start)
+            response_text = response_text[start:end].strip()
+        return json.loads(response_text, strict=False)
+    except json.JSONDecodeError:
+        last_brace = response_text.rfind('}')
+        if last_brace > 0:
+            return json.loads(response_text[:last_brace + 1], strict=False)
+        raise
+
+
+def recovers(parser, text: str) -> bool:
+    """Whether a parser returns a JSON object for the text"""
+    try:
+        return isinstance(parser(text), dict)
+    except (ValueError, JSONExtractionError):
+        return False
+
+
+def daily_plan_response(days: int) -> str:
+    """A well-formed daily plan response wrapped in a markdown fence"""
+    plan = {
+        "total_days": days,
+        "daily_plan": [
+            {"day": i, "topic": f"Topic {i}: practice \"quoted\" {{braces}} and commas, too", "estimated_hours": 3}
+            for i in range(1, days + 1)
+        ]
+    }
+    return "Here is your plan:\n```json\n" + json.dumps(plan, indent=4) + "\n```\nGood luck!"
+
+
+def bench(label: str, parser, text: str, repeat: int) -> None:
+    """Print microseconds per call for one parser and input"""
+    seconds = timeit.timeit(lambda: parser(text), number=repeat)
+    print(f"   {label:<28} {seconds / repeat * 1e6:10.1f} us/call")
+
+
+def main() -> None:
+    arg_parser = argparse.ArgumentParser(description="Benchmark LLM JSON extraction")
+    arg_parser.add_argument("--repeat", type=int, default=2000, help="Calls per timing (default: 2000)")
+    arg_parser.add_argument("--corpus", type=Path, default=CORPUS_DIR, help="Directory of .txt responses (default: bundled corpus)")
+    args = arg_parser.parse_args()
+
+    corpus = sorted(args.corpus.glob("*.txt"))
+    if not corpus:
+        arg_parser.error(f"no .txt responses in {args.corpus}")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} malformed responses")
+    print("=" * 60)
+    legacy_ok = new_ok = 0
+    for path in corpus:
+        text = path.read_text(encoding="utf-8")
+        old, new = recovers(legacy_parse, text), recovers(lambda t: extract_json(t, expected=dict), text)
+        legacy_ok += old
+        new_ok += new
+        print(f"   {path.name:<40} legacy {'✅' if old else '❌'}  extract {'✅' if new else '❌'}")
+    print(f"\nRecovered: legacy {legacy_ok}/{len(corpus)}, extract_json {new_ok}/{len(corpus)}")
+
+    print("\nTiming")
+    for days in (30, 365):
+        text = daily_plan_response(days)
+        number = args.repeat if days <= 30 else max(1, args.repeat // 10)
+        print(f" well-formed {days}-day plan ({len(text)} chars)")
+        bench("legacy", legacy_parse, text, number)
+        bench("extract_json (fast path)", extract_json, text, number)
+
+        broken = text.replace('"estimated_hours": 3\n', '"estimated_hours": 3,\n')[:-300]
+        print(" same plan with trailing commas, truncated")
+        bench("extract_json (repair)", extract_json, broken, number)
+
+    corpus_texts = [path.read_text(encoding="utf-8") for path in corpus]
+    number = max(1, args.repeat // 10)
+    seconds = timeit.timeit(lambda: [extract_json(t) for t in corpus_texts], number=number)
+    print(f" whole corpus: {seconds / number / len(corpus_texts) * 1e6:.1f} us/response")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Role Catalog Builder
+Pre-generates roadmaps and daily plans for well-known roles (safe to re-run nightly)
+
+Usage:
+    python build_catalog.py --roles "Data Scientist" "Backend Developer" --durations 30 90
+    python build_catalog.py --file roles.txt --concurrency 4 --rate 20
+
+A roles file has one role per line, optionally followed by its own durations
+("Data Scientist: 30, 60"); blank lines and lines starting with # are ignored.
+Entries already built within --max-age-hours are skipped, so an interrupted
+run picks up where it stopped.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.append(".")
+
+from app.ai.groq_client import groq_client
+from app.core.database import AsyncSessionLocal, async_engine
+from app.services.catalog_service import CatalogService
+
+
+class RateLimiter:
+    """
+    Spaces out entry starts to at most `per_minute` per minute
+    """
+
+    def __init__(self, per_minute: float):
+        self.interval = 60.0 / per_minute if per_minute > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        """Block until the next start slot"""
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+
+
+def parse_roles(args: argparse.Namespace) -> List[Tuple[str, int]]:
+    """
+    Collect (role, duration) pairs from the command line and roles file
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        List of (role name, duration in days) pairs
+    """
+    lines = list(args.roles or [])
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            lines.extend(line.strip() for line in f)
+
+    pairs = []
+    for line in lines:
+        if not line or line.startswith("#"):
+            continue
+        role_name, _, durations = line.partition(":")
+        days = [int(d) for d in durations.replace(",", " ").split()] or args.durations
+        for duration_days in days:
+            if not 1 <= duration_days <= 365:
+                raise SystemExit(f"Invalid duration {duration_days} for {role_name.strip()!r} (1-365)")
+            pairs.append((role_name.strip(), duration_days))
+    return pairs
+
+
+async def build(args: argparse.Namespace) -> int:
+    """
+    Build every catalog entry that needs it
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code (1 if any entry failed)
+    """
+    pairs = parse_roles(args)
+    if not pairs:
+        print("❌ No roles given (use --roles or --file)")
+        return 2
+
+    async with AsyncSessionLocal() as db:
+        entries = await CatalogService.sync_entries(pairs, db)
+        todo = [entry.id for entry in entries if CatalogService.needs_build(entry, args.max_age_hours, args.force)]
+
+    print("=" * 60)
+    print(f"ROLE CATALOG: {len(entries)} entries, {len(entries) - len(todo)} up to date, {len(todo)} to build")
+    print("=" * 60)
+    if not todo:
+        return 0
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limiter = RateLimiter(args.rate)
+
+    async def run(entry_id: int) -> dict:
+        async with semaphore:
+            await limiter.wait()
+            result = await CatalogService.build_entry(entry_id)
+        icon = "✅" if result["status"] == "ready" else "❌"
+        detail = f"{result['days']} days" if result["status"] == "ready" else result["error"]
+        print(f"   {icon} {result['role_name']} ({result['duration_days']}d) in {result['seconds']}s: {detail}")
+        return result
+
+    await groq_client.start()
+    started_at = time.monotonic()
+    try:
+        results = await asyncio.gather(*(run(entry_id) for entry_id in todo))
+    finally:
+        await groq_client.close()
+    elapsed = time.monotonic() - started_at
+
+    built = [r for r in results if r["status"] == "ready"]
+    failed = len(results) - len(built)
+    days = sum(r["days"] for r in built)
+    print("\n" + "=" * 60)
+    print(f"Built {len(built)}, failed {failed} in {elapsed:.1f}s")
+    print(f"Throughput: {len(built) / elapsed * 60:.1f} entries/min, {days / elapsed:.1f} plan days/s")
+    print("=" * 60)
+    return 1 if failed else 0
+
+
+async def main_async(args: argparse.Namespace) -> int:
+    try:
+        return await build(args)
+    finally:
+        # Pooled aiosqlite connections each hold a thread that would keep the process alive
+        await async_engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pre-generate the role catalog")
+    parser.add_argument("--roles", nargs="*", help="Role names (optionally 'Role: 30, 90')")
+    parser.add_argument("--file", help="File with one role per line")
+    parser.add_argument("--durations", nargs="+", type=int, default=[30, 60, 90],
+                        help="Plan durations in days for roles without their own (default: 30 60 90)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Entries built at once (default: 4)")
+    parser.add_argument("--rate", type=float, default=30.0,
+                        help="Maximum entries started per minute, 0 for no limit (default: 30)")
+    parser.add_argument("--max-age-hours", type=float, default=20.0,
+                        help="Skip entries built more recently than this (default: 20)")
+    parser.add_argument("--force", action="store_true", help="Rebuild every entry")
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
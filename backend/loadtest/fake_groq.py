@@ -0,0 +1,269 @@
+"""
+Fake Groq Server
+OpenAI-compatible chat completions endpoint with canned CareerPilot responses
+
+Usage (from backend/):
+    python loadtest/fake_groq.py --port 9000 --latency-median 0.8 --latency-p99 4 --tokens-per-second 300
+    LLM_BASE_URL=http://localhost:9000/openai/v1/chat/completions uvicorn main:app
+
+Responses follow the JSON shapes requested by app/ai/prompts.py. Latency,
+token throughput, 5xx/429 injection and malformed output are configurable
+so load tests exercise retries, the circuit breaker and JSON repair.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+CHARS_PER_TOKEN = 4
+
+
+class FakeConfig:
+    """Behaviour knobs of the fake server"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.latency = args.latency
+        self.latency_median = args.latency_median
+        self.latency_p99 = max(args.latency_p99, args.latency_median)
+        self.tokens_per_second = args.tokens_per_second
+        self.error_rate = args.error_rate
+        self.rate_limit_rate = args.rate_limit_rate
+        self.retry_after = args.retry_after
+        self.malformed_rate = args.malformed_rate
+        self.rng = random.Random(args.seed)
+
+    def first_token_delay(self) -> float:
+        """Sample the time before the first token (or headers) in seconds"""
+        if self.latency == "fixed":
+            return self.latency_median
+        if self.latency == "uniform":
+            return self.rng.uniform(0, 2 * self.latency_median)
+        # Log-normal fitted to the median and the 99th percentile
+        sigma = math.log(self.latency_p99 / self.latency_median) / 2.326 if self.latency_median > 0 else 0
+        return self.latency_median * math.exp(self.rng.gauss(0, sigma)) if self.latency_median > 0 else 0.0
+
+    def token_delay(self, tokens: int) -> float:
+        """Seconds needed to generate the given number of tokens"""
+        return tokens / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+ROADMAP_PROMPT = re.compile(r"career roadmap for: (.+)")
+SEGMENT_PROMPT = re.compile(r"writing days (\d+) to (\d+) of a (\d+)-day study plan for: (.+)")
+DAILY_PLAN_PROMPT = re.compile(r"Create a (\d+)-day study plan for: (.+)")
+TEACH_PROMPT = re.compile(r"Explain the following topic: (.+)")
+TEACH_BATCH_PROMPT = re.compile(r"Explain each of the following \d+ topics:\n((?:\d+\. .+\n?)+)")
+
+FOCUS = [
+    "fundamentals", "tooling", "core concepts", "data modelling", "testing", "debugging",
+    "performance", "security", "deployment", "architecture", "best practices", "project work"
+]
+
+
+def daily_plan(role: str, start: int, end: int, rng: random.Random) -> Dict[str, Any]:
+    """Canned daily_plan for an inclusive day range"""
+    return {
+        "total_days": end - start + 1,
+        "daily_plan": [
+            {
+                "day": day,
+                "topic": f"{role} {FOCUS[day % len(FOCUS)]} - part {day}",
+                "estimated_hours": rng.randint(2, 6)
+            }
+            for day in range(start, end + 1)
+        ]
+    }
+
+
+def canned_content(prompt: str, rng: random.Random) -> str:
+    """Pick a response shaped like the one the prompt asks for"""
+    match = ROADMAP_PROMPT.search(prompt)
+    if match:
+        role = match.group(1).strip()
+        return json.dumps({
+            "role": role,
+            "required_skills": [f"{role} skill {i}" for i in range(1, 7)],
+            "learning_path": [
+                {"phase": "Fundamentals", "topics": [f"{role} basics", "Tooling"], "duration_weeks": 4},
+                {"phase": "Intermediate", "topics": ["Core patterns", "Testing"], "duration_weeks": 8},
+                {"phase": "Advanced", "topics": ["Architecture", "Performance"], "duration_weeks": 8}
+            ],
+            "recommended_projects": [f"{role} starter project", f"{role} capstone"]
+        }, indent=4)
+
+    match = SEGMENT_PROMPT.search(prompt)
+    if match:
+        start, end, role = int(match.group(1)), int(match.group(2)), match.group(4).strip()
+        return json.dumps(daily_plan(role, start, end, rng), indent=4)
+
+    match = DAILY_PLAN_PROMPT.search(prompt)
+    if match:
+        days, role = int(match.group(1)), match.group(2).strip()
+        return json.dumps(daily_plan(role, 1, days, rng), indent=4)
+
+    match = TEACH_BATCH_PROMPT.search(prompt)
+    if match:
+        topics = [line.split(". ", 1)[1].strip() for line in match.group(1).splitlines() if ". " in line]
+        return json.dumps({
+            "topics": [dict(teaching(topic), id=i) for i, topic in enumerate(topics, start=1)]
+        }, indent=4)
+
+    match = TEACH_PROMPT.search(prompt)
+    topic = match.group(1).strip() if match else "the requested topic"
+    return json.dumps(teaching(topic))
+
+
+def teaching(topic: str) -> Dict[str, Any]:
+    """Explanation of one topic"""
+    return {
+        "topic": topic,
+        "explanation": f"{topic} explained step by step. " * 12,
+        "examples": [f"{topic} example {i}" for i in range(1, 4)],
+        "resources": [f"https://www.youtube.com/results?search_query={topic.replace(' ', '+')}+tutorial"]
+    }
+
+
+def usage(prompt: str, content: str) -> Dict[str, int]:
+    """Approximate token usage block"""
+    prompt_tokens = len(prompt) // CHARS_PER_TOKEN
+    completion_tokens = len(content) // CHARS_PER_TOKEN
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    """Build the fake server application"""
+    app = FastAPI(title="Fake Groq")
+    stats = {"requests": 0, "streams": 0, "errors": 0, "rate_limited": 0, "malformed": 0}
+
+    async def completions(request: Request):
+        body = await request.json()
+        prompt = body["messages"][-1]["content"]
+        model = body.get("model", "fake-model")
+        stats["requests"] += 1
+
+        await asyncio.sleep(config.first_token_delay())
+
+        roll = config.rng.random()
+        if roll < config.rate_limit_rate:
+            stats["rate_limited"] += 1
+            return JSONResponse(
+                {"error": {"message": "Rate limit reached", "type": "tokens", "code": "rate_limit_exceeded"}},
+                status_code=429,
+                headers={"retry-after": str(config.retry_after)}
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats["errors"] += 1
+            return JSONResponse(
+                {"error": {"message": "Internal server error", "type": "internal_server_error"}},
+                status_code=503
+            )
+
+        content = canned_content(prompt, config.rng)
+        if config.rng.random() < config.malformed_rate:
+            # Truncate mid-document, as if max_tokens was hit
+            stats["malformed"] += 1
+            content = content[:max(1, int(len(content) * config.rng.uniform(0.5, 0.95)))]
+
+        max_tokens = body.get("max_tokens")
+        if max_tokens:
+            content = content[:max_tokens * CHARS_PER_TOKEN]
+
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            stats["streams"] += 1
+            return StreamingResponse(
+                stream_chunks(config, completion_id, created, model, prompt, content),
+                media_type="text/event-stream"
+            )
+
+        await asyncio.sleep(config.token_delay(len(content) // CHARS_PER_TOKEN))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": usage(prompt, content)
+        }
+
+    app.post("/openai/v1/chat/completions")(completions)
+    app.post("/v1/chat/completions")(completions)
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+async def stream_chunks(
+    config: FakeConfig,
+    completion_id: str,
+    created: int,
+    model: str,
+    prompt: str,
+    content: str
+) -> AsyncIterator[bytes]:
+    """Server-sent events in the OpenAI chunk format, paced by token throughput"""
+    def event(delta: Dict[str, Any], finish_reason=None, extra=None) -> bytes:
+        chunk = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+        }
+        if extra:
+            chunk.update(extra)
+        return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+    yield event({"role": "assistant", "content": ""})
+    tokens_per_chunk = 4
+    step = tokens_per_chunk * CHARS_PER_TOKEN
+    for i in range(0, len(content), step):
+        await asyncio.sleep(config.token_delay(tokens_per_chunk))
+        yield event({"content": content[i:i + step]})
+    yield event({}, "stop", {"x_groq": {"id": completion_id, "usage": usage(prompt, content)}})
+    yield b"data: [DONE]\n\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI-compatible Groq server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", choices=["lognormal", "uniform", "fixed"], default="lognormal",
+                        help="Time-to-first-token distribution (default: lognormal)")
+    parser.add_argument("--latency-median", type=float, default=0.5, help="Median time to first token in seconds")
+    parser.add_argument("--latency-p99", type=float, default=3.0, help="99th percentile for the lognormal distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=500.0, help="Generation speed, 0 for instant")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of responses truncated mid-JSON")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(FakeConfig(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Load Generator
+Drives a realistic mix of CareerPilot API traffic and reports latency per endpoint
+
+Usage (from backend/):
+    python loadtest/load_generator.py --base-url http://localhost:8000 --users 20 --duration 60
+    python loadtest/load_generator.py --mix roadmap=1,daily_plan=1,teach=5,teach_stream=1,read=4 --json out.json
+
+Each virtual user registers through /auth/register, logs in and then loops
+over weighted actions until the run ends. Only the public HTTP API is used,
+so the target can be local or remote.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ROLES = [
+    "Backend Developer", "Frontend Developer", "Full Stack Developer", "Data Scientist",
+    "Data Engineer", "DevOps Engineer", "Machine Learning Engineer", "Mobile Developer",
+    "Cloud Architect", "Cybersecurity Analyst", "QA Engineer", "Product Manager"
+]
+DURATIONS = [7, 14, 30, 30, 60, 90]
+TOPICS = [
+    "REST API design principles", "Python decorators", "SQL joins", "Docker networking",
+    "React hooks", "Big-O notation", "Git branching strategies", "Kubernetes pods",
+    "OAuth 2.0 flows", "Database indexing", "Unit testing with pytest", "CSS flexbox"
+]
+DEFAULT_MIX = "roadmap=2,daily_plan=1,teach=4,teach_stream=1,read=4"
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0 for no samples)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+class Recorder:
+    """Collects latencies and status codes per endpoint"""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def record(self, endpoint: str, status: int, seconds: float) -> None:
+        self.latencies[endpoint].append(seconds)
+        self.statuses[endpoint][status] += 1
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        """Summary per endpoint plus totals"""
+        endpoints = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            statuses = self.statuses[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "errors": sum(count for code, count in statuses.items() if code == 0 or code >= 400),
+                "statuses": dict(sorted(statuses.items())),
+                "rps": round(len(samples) / elapsed, 2),
+                "p50": round(percentile(samples, 50), 4),
+                "p95": round(percentile(samples, 95), 4),
+                "p99": round(percentile(samples, 99), 4),
+                "max": round(max(samples), 4)
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        return {
+            "elapsed": round(elapsed, 2),
+            "requests": total,
+            "rps": round(total / elapsed, 2) if elapsed else 0.0,
+            "errors": sum(e["errors"] for e in endpoints.values()),
+            "endpoints": endpoints
+        }
+
+
+class VirtualUser:
+    """One registered user issuing requests in a loop"""
+
+    def __init__(self, index: int, run_id: str, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.username = f"load_{run_id}_{index}"
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.headers: Dict[str, str] = {}
+        self.user_role_ids: List[int] = []
+
+    async def request(self, endpoint: str, method: str, path: str, **kwargs) -> Optional[httpx.Response]:
+        """Send a request and record its latency under the endpoint name"""
+        started_at = time.monotonic()
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(endpoint, 0, time.monotonic() - started_at)
+            return None
+        self.recorder.record(endpoint, response.status_code, time.monotonic() - started_at)
+        return response
+
+    async def stream(self, endpoint: str, path: str, body: Dict[str, Any]) -> None:
+        """Consume a server-sent event stream, recording first-event and total latency"""
+        started_at = time.monotonic()
+        first_at = None
+        status = 0
+        try:
+            async with self.client.stream("POST", path, headers=self.headers, json=body) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if first_at is None and line.startswith("event:"):
+                        first_at = time.monotonic()
+                    if line.startswith("event: error"):
+                        status = 599
+        except httpx.HTTPError:
+            status = 0
+        finished_at = time.monotonic()
+        self.recorder.record(endpoint, status, finished_at - started_at)
+        if first_at is not None:
+            self.recorder.record(f"{endpoint} (first event)", status, first_at - started_at)
+
+    async def sign_up(self, password: str) -> bool:
+        """Register and log in"""
+        await self.request("register", "POST", "/auth/register", json={
+            "email": f"{self.username}@loadtest.example.com",
+            "username": self.username,
+            "password": password,
+            "full_name": "Load Test"
+        })
+        response = await self.request("login", "POST", "/auth/login", data={
+            "username": self.username,
+            "password": password
+        })
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        return True
+
+    async def roadmap(self) -> None:
+        response = await self.request("roadmap", "POST", "/ai/generate-roadmap", json={
+            "role_name": self.rng.choice(ROLES),
+            "duration_days": self.rng.choice(DURATIONS)
+        })
+        if response is not None and response.status_code == 201:
+            self.user_role_ids.append(response.json()["user_role_id"])
+
+    async def daily_plan(self) -> None:
+        if not self.user_role_ids:
+            await self.roadmap()
+            return
+        await self.request("daily_plan", "POST", "/ai/generate-daily-plan", json={
+            "user_role_id": self.rng.choice(self.user_role_ids)
+        })
+
+    async def teach(self) -> None:
+        await self.request("teach", "POST", "/ai/teach-topic", json={"topic": self.rng.choice(TOPICS)})
+
+    async def teach_stream(self) -> None:
+        await self.stream("teach_stream", "/ai/teach-topic/stream", {"topic": self.rng.choice(TOPICS)})
+
+    async def teach_batch(self) -> None:
+        """Consume an NDJSON teach-topics stream, recording first-line and total latency"""
+        body = {"topics": self.rng.sample(TOPICS, self.rng.randint(3, 7))}
+        started_at = time.monotonic()
+        first_at = None
+        status = 0
+        try:
+            async with self.client.stream("POST", "/ai/teach-topics", headers=self.headers, json=body) as response:
+                status = response.status_code
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    if first_at is None:
+                        first_at = time.monotonic()
+                    if '"status": "error"' in line:
+                        status = 599
+        except httpx.HTTPError:
+            status = 0
+        self.recorder.record("teach_batch", status, time.monotonic() - started_at)
+        if first_at is not None:
+            self.recorder.record("teach_batch (first topic)", status, first_at - started_at)
+
+    async def roadmap_stream(self) -> None:
+        await self.stream("roadmap_stream", "/ai/generate-roadmap/stream", {
+            "role_name": self.rng.choice(ROLES),
+            "duration_days": self.rng.choice(DURATIONS)
+        })
+
+    async def read(self) -> None:
+        if self.rng.random() < 0.5:
+            await self.request("read_plans", "GET", "/ai/daily-plans")
+        else:
+            await self.request("read_me", "GET", "/auth/me")
+
+    async def run(self, mix: Dict[str, float], deadline: float, think_time: float) -> None:
+        actions = list(mix)
+        weights = [mix[action] for action in actions]
+        while time.monotonic() < deadline:
+            action = self.rng.choices(actions, weights)[0]
+            await getattr(self, action)()
+            if think_time > 0:
+                await asyncio.sleep(self.rng.expovariate(1 / think_time))
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse 'action=weight,...' into a weight map"""
+    mix = {}
+    for part in text.split(","):
+        action, _, weight = part.partition("=")
+        action = action.strip()
+        if not hasattr(VirtualUser, action) or action in ("run", "request", "stream", "sign_up"):
+            raise SystemExit(f"Unknown action {action!r}")
+        mix[action] = float(weight or 1)
+    return mix
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print("\n" + "=" * 96)
+    print(f"{'endpoint':<28}{'reqs':>7}{'errors':>8}{'rps':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  statuses")
+    print("-" * 96)
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:<28}{row['requests']:>7}{row['errors']:>8}{row['rps']:>8}"
+            f"{row['p50']:>10.3f}{row['p95']:>10.3f}{row['p99']:>10.3f}{row['max']:>10.3f}  {row['statuses']}"
+        )
+    print("-" * 96)
+    print(f"Total: {report['requests']} requests in {report['elapsed']}s = {report['rps']} req/s, {report['errors']} errors")
+    print("=" * 96)
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    run_id = uuid.uuid4().hex[:8]
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users * 2, max_keepalive_connections=args.users)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        users = [
+            VirtualUser(i, run_id, client, recorder, random.Random(None if args.seed is None else args.seed + i))
+            for i in range(args.users)
+        ]
+        signed_up = await asyncio.gather(*(user.sign_up(args.password) for user in users))
+        users = [user for user, ok in zip(users, signed_up) if ok]
+        print(f"Registered {len(users)}/{args.users} users (run {run_id}), running for {args.duration}s: {mix}")
+        if not users:
+            raise SystemExit("No users could log in")
+
+        # Only the steady-state phase counts towards the report
+        recorder.latencies.clear()
+        recorder.statuses.clear()
+        started_at = time.monotonic()
+        await asyncio.gather(*(user.run(mix, started_at + args.duration, args.think_time) for user in users))
+        elapsed = time.monotonic() - started_at
+
+    return recorder.report(elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the CareerPilot API")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users (default: 10)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of steady-state load (default: 60)")
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"Weighted actions: roadmap, roadmap_stream, daily_plan, teach, teach_stream, teach_batch, read (default: {DEFAULT_MIX})")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean pause between a user's requests (default: 0.5)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout in seconds")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible mixes")
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,46 @@ CareerPilot AI Backend - Main Application
 FastAPI application with authentication and database integration
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.core.config import settings
+from app.core.database import async_engine
+from app.core.db_pool import pool_stats, run_liveness_checks
+from app.core.metrics import metrics_registry
 from app.routers import auth, ai
+from app.ai.groq_client import groq_client
+from app.services.ai_service import daily_plan_budget, teach_topic_cache, teach_topic_prefetcher
+from app.services.prefetch_service import PrefetchService
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan - opens shared resources on startup
+    and releases them on shutdown
+    """
+    await groq_client.start()
+    sweeper = None
+    if settings.TEACH_PREFETCH_ENABLED:
+        teach_topic_prefetcher.start()
+        sweeper = asyncio.create_task(PrefetchService.run_sweeps())
+    liveness = None
+    if settings.DB_POOL_LIVENESS_INTERVAL > 0:
+        liveness = asyncio.create_task(
+            run_liveness_checks(async_engine, settings.DB_POOL_LIVENESS_INTERVAL)
+        )
+    yield
+    for task in (sweeper, liveness):
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+    await teach_topic_prefetcher.close()
+    await groq_client.close()
+    await async_engine.dispose()
+
 
 # Create FastAPI application instance
 app = FastAPI(
@@ -14,7 +50,8 @@ app = FastAPI(
     version=settings.APP_VERSION,
     description="Backend API for CareerPilot AI - Your personalized career roadmap assistant",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -54,3 +91,49 @@ def health_check():
         "app": settings.APP_NAME,
         "version": settings.APP_VERSION
     }
+
+
+@app.get("/health/llm", tags=["Health"])
+async def llm_health_check():
+    """
+    LLM client health - connection pool and circuit breaker state
+    
+    Runs on the event loop, like /metrics: the stats walk structures
+    (the breaker's call window, admission queues) that in-flight calls
+    mutate there.
+    """
+    return {
+        "model": groq_client.model,
+        "pool": groq_client.pool_stats(),
+        "circuit_breaker": groq_client.circuit_breaker.stats(),
+        "admission": groq_client.admission.stats(),
+        "single_flight": groq_client.single_flight.stats(),
+        "hedging": groq_client.hedge_policy.stats(),
+        "teach_topic_cache": teach_topic_cache.stats(),
+        "teach_topic_prefetch": teach_topic_prefetcher.stats(),
+        "daily_plan_budget": daily_plan_budget.stats()
+    }
+
+
+@app.get("/health/db", tags=["Health"])
+async def db_health_check():
+    """
+    Database health - connection pool usage and settings
+    
+    Runs on the event loop, where the instrumented pool updates its counts.
+    """
+    return {
+        "dialect": async_engine.dialect.name,
+        "pool": pool_stats(async_engine.sync_engine)
+    }
+
+
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """
+    Prometheus metrics - LLM call latency, token usage and outcomes
+    
+    Runs on the event loop (not the threadpool) so rendering never races
+    the metric updates made by in-flight requests.
+    """
+    return Response(content=metrics_registry.render(), media_type=metrics_registry.CONTENT_TYPE)
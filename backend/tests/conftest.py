@@ -0,0 +1,41 @@
+"""
+Test Configuration
+Points the app at a throwaway SQLite database before it is imported
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("LLM_API_KEY", "test-key")
+os.environ["TEACH_PREFETCH_ENABLED"] = "False"
+
+import pytest  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+import app.models  # noqa: E402,F401  (register every table)
+from app.core.base import Base  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import engine  # noqa: E402
+
+
+@pytest.fixture
+def async_sessions():
+    """
+    AsyncSession factory for tests that drive services directly
+
+    Each test runs its own event loop (asyncio.run), so the factory uses an
+    unpooled engine: pooled aiosqlite connections belong to the loop that
+    opened them.
+    """
+    Base.metadata.create_all(engine)
+    return async_sessionmaker(
+        create_async_engine(settings.async_database_url, poolclass=NullPool),
+        autoflush=False,
+        expire_on_commit=False
+    )
@@ -0,0 +1,182 @@
+"""
+Admission Control Tests
+Global concurrency cap, FIFO queue, per-user caps and fast rejection
+"""
+
+import asyncio
+
+import pytest
+
+from app.ai.admission import AdmissionController, current_llm_user
+from app.ai.errors import AdmissionRejectedError
+
+
+def make_controller(**overrides):
+    options = dict(max_concurrent=1, max_per_user=2, max_queue=10, max_queue_seconds=5.0)
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def test_queued_calls_are_admitted_in_arrival_order():
+    controller = make_controller()
+    order = []
+
+    async def call(name, user_id=None):
+        async with controller.admit(user_id):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        first = asyncio.create_task(call("first"))
+        await asyncio.sleep(0)
+        tasks = []
+        for name in ("second", "third", "fourth"):
+            tasks.append(asyncio.create_task(call(name)))
+            await asyncio.sleep(0)
+        await asyncio.gather(first, *tasks)
+
+    asyncio.run(run())
+
+    assert order == ["first", "second", "third", "fourth"]
+    assert controller.stats()["admitted"] == 4
+
+
+def test_user_over_their_cap_gets_429():
+    controller = make_controller(max_concurrent=5, max_per_user=2)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold(user_id):
+            async with controller.admit(user_id):
+                await release.wait()
+
+        holders = [asyncio.create_task(hold(7)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(AdmissionRejectedError) as error:
+                async with controller.admit(7):
+                    pass
+            # Other users are unaffected
+            async with controller.admit(8):
+                pass
+        finally:
+            release.set()
+            await asyncio.gather(*holders)
+        return error.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 429
+    assert controller.stats()["rejected_user_limit"] == 1
+    assert controller.stats()["users_active"] == 0
+
+
+def test_default_user_comes_from_the_request_context():
+    controller = make_controller(max_concurrent=5, max_per_user=1)
+
+    async def run():
+        current_llm_user.set(3)
+        async with controller.admit():
+            with pytest.raises(AdmissionRejectedError):
+                controller.check(3)
+
+    asyncio.run(run())
+
+
+def test_full_queue_is_rejected_immediately_with_503():
+    controller = make_controller(max_concurrent=1, max_queue=1)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        queued = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(AdmissionRejectedError) as error:
+                async with controller.admit():
+                    pass
+        finally:
+            release.set()
+            await asyncio.gather(running, queued)
+        return error.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 503
+    assert controller.stats()["rejected_queue_full"] == 1
+
+
+def test_queue_wait_is_bounded():
+    controller = make_controller(max_concurrent=1, max_queue_seconds=5.0)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.admit():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(AdmissionRejectedError) as error:
+                async with controller.admit(max_wait=0.05):
+                    pass
+        finally:
+            release.set()
+            await running
+        return error.value
+
+    error = asyncio.run(run())
+
+    assert error.status_code == 503
+    assert controller.stats()["rejected_queue_timeout"] == 1
+    assert controller.stats()["queue_depth"] == 0
+
+
+def test_cancelled_waiter_gives_its_place_to_the_next():
+    controller = make_controller(max_concurrent=1)
+    order = []
+
+    async def call(name):
+        async with controller.admit():
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        first = asyncio.create_task(call("first"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(call("cancelled"))
+        await asyncio.sleep(0)
+        last = asyncio.create_task(call("last"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+
+    asyncio.run(run())
+
+    assert order == ["first", "last"]
+    assert controller.stats()["active"] == 0
+
+
+def test_hold_user_counts_without_taking_a_slot():
+    controller = make_controller(max_concurrent=1, max_per_user=1)
+
+    async def run():
+        with controller.hold_user(5):
+            assert controller.stats()["active"] == 0
+            with pytest.raises(AdmissionRejectedError):
+                with controller.hold_user(5):
+                    pass
+            # A call started without a user still gets the global slot
+            async with controller.admit(None):
+                assert controller.stats()["active"] == 1
+        assert controller.stats()["users_active"] == 0
+
+    asyncio.run(run())
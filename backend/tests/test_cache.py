@@ -0,0 +1,154 @@
+"""
+Result Cache Tests
+LRU eviction by size, TTL expiry, stale-while-revalidate and stampede protection
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai import cache as cache_module
+from app.ai.cache import ENTRY_OVERHEAD_BYTES, TTLCache
+from app.core import deadline
+
+
+class Clock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def loader_for(value, calls, delay=0.0):
+    async def load():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+    return load
+
+
+def test_fresh_entry_is_a_hit(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+    calls = []
+
+    async def run():
+        first = await cache.get_or_load("k", loader_for({"v": 1}, calls))
+        second = await cache.get_or_load("k", loader_for({"v": 2}, calls))
+        return first, second
+
+    assert asyncio.run(run()) == ({"v": 1}, {"v": 1})
+    assert calls == [{"v": 1}]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_stale_entry_is_served_while_one_refresh_runs(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+    calls = []
+
+    async def run():
+        cache.set("k", "old")
+        clock.now += 61
+        served = [await cache.get_or_load("k", loader_for("new", calls, delay=0.01)) for _ in range(3)]
+        await asyncio.gather(*cache._background)
+        return served
+
+    assert asyncio.run(run()) == ["old", "old", "old"]
+    assert calls == ["new"]
+    assert cache.peek("k") == "new"
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_refresh_outlives_the_request_that_triggered_it(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+    calls = []
+
+    async def request():
+        deadline.set_deadline(0.02)
+        return await cache.get_or_load("k", loader_for("new", calls, delay=0.1))
+
+    async def run():
+        cache.set("k", "old")
+        clock.now += 61
+        served = await request()
+        await asyncio.gather(*cache._background)
+        return served
+
+    assert asyncio.run(run()) == "old"
+    assert cache.peek("k") == "new"
+    assert cache.stats()["refresh_failures"] == 0
+
+
+def test_failed_refresh_keeps_the_stale_value(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+
+    async def broken():
+        raise RuntimeError("upstream down")
+
+    async def run():
+        cache.set("k", "old")
+        clock.now += 61
+        served = await cache.get_or_load("k", broken)
+        await asyncio.gather(*cache._background)
+        return served
+
+    assert asyncio.run(run()) == "old"
+    assert cache.stats()["refresh_failures"] == 1
+
+
+def test_dead_entry_is_reloaded(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+    calls = []
+
+    async def run():
+        cache.set("k", "old")
+        clock.now += 121
+        return await cache.get_or_load("k", loader_for("new", calls))
+
+    assert asyncio.run(run()) == "new"
+    assert cache.stats()["misses"] == 1
+
+
+def test_concurrent_misses_share_one_load(clock):
+    cache = TTLCache(max_bytes=10_000, ttl=60, stale_ttl=60)
+    calls = []
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load("k", loader_for("v", calls, delay=0.02)) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["v"] * 10
+    assert calls == ["v"]
+
+
+def test_least_recently_used_entry_is_evicted_by_size(clock):
+    entry_size = len('"aaaa"') + ENTRY_OVERHEAD_BYTES
+    cache = TTLCache(max_bytes=entry_size * 2, ttl=60, stale_ttl=60)
+    cache.set("a", "aaaa")
+    cache.set("b", "bbbb")
+    cache._lookup("a", clock.now)
+    cache.set("c", "cccc")
+
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert cache.contains("c")
+    assert cache.stats()["bytes"] == entry_size * 2
+    assert cache.stats()["evictions"] == 1
+
+
+def test_value_larger_than_the_budget_is_not_stored(clock):
+    cache = TTLCache(max_bytes=100, ttl=60, stale_ttl=60)
+    cache.set("big", "x" * 1000)
+
+    assert not cache.contains("big")
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,164 @@
+"""
+Circuit Breaker Tests
+Opening on error and slow-call rates, half-open probing and fast failure
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.ai import circuit_breaker as circuit_breaker_module
+from app.ai.circuit_breaker import CircuitBreaker
+from app.ai.errors import CircuitOpenError, LLMUpstreamError
+from app.ai.groq_client import GroqClient
+
+
+class Clock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit_breaker_module, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def make_breaker(**overrides):
+    options = dict(
+        window_seconds=30.0,
+        min_calls=4,
+        error_rate_threshold=0.5,
+        slow_call_seconds=5.0,
+        slow_call_rate_threshold=0.8,
+        open_seconds=10.0,
+        half_open_max_calls=2
+    )
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+def call(breaker, success=True, latency=0.1):
+    breaker.acquire()
+    breaker.record(success=success, latency=latency)
+
+
+def test_stays_closed_below_min_calls(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        call(breaker, success=False)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_opens_on_error_rate_and_fails_fast(clock):
+    breaker = make_breaker()
+    for success in (True, False, True, False):
+        call(breaker, success=success)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.check()
+    assert error.value.retry_after == pytest.approx(10.0)
+    assert error.value.status_code == 503
+    assert breaker.stats()["rejected_calls"] == 1
+
+
+def test_opens_on_slow_call_rate(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, latency=6.0)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_old_outcomes_leave_the_window(clock):
+    breaker = make_breaker()
+    for _ in range(3):
+        call(breaker, success=False)
+    clock.now += 31
+    call(breaker, success=False)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_calls"] == 1
+
+
+def test_half_open_probes_close_the_breaker(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, success=False)
+    clock.now += 10
+
+    breaker.acquire()
+    breaker.acquire()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.acquire()
+
+    breaker.record(success=True, latency=0.1)
+    breaker.record(success=True, latency=0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["window_calls"] == 0
+
+
+def test_failed_probe_reopens(clock):
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, success=False)
+    clock.now += 10
+
+    call(breaker, success=False)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_after() == pytest.approx(10.0)
+    assert breaker.times_opened == 2
+
+
+def test_released_probe_frees_its_slot(clock):
+    breaker = make_breaker(half_open_max_calls=1)
+    for _ in range(4):
+        call(breaker, success=False)
+    clock.now += 10
+
+    breaker.acquire()
+    breaker.release()
+    breaker.acquire()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_client_stops_calling_an_unhealthy_upstream():
+    requests = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500, json={"error": "down"})
+
+    async def run():
+        client = GroqClient()
+        client.retry_policy.max_attempts = 1
+        client.circuit_breaker = make_breaker(min_calls=2)
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        errors = []
+        try:
+            for attempt in range(4):
+                try:
+                    await client.generate_completion(f"prompt {attempt}")
+                except (LLMUpstreamError, CircuitOpenError) as e:
+                    errors.append(type(e))
+        finally:
+            await client.close()
+        return errors
+
+    errors = asyncio.run(run())
+
+    assert errors == [LLMUpstreamError, LLMUpstreamError, CircuitOpenError, CircuitOpenError]
+    assert len(requests) == 2
@@ -0,0 +1,76 @@
+"""
+Connection Release Tests
+No pooled database connection is held while a route waits on the LLM
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.models  # noqa: F401  (register every table)
+import main
+from app.ai.groq_client import groq_client
+from app.core.base import Base
+from app.core.database import async_engine, engine
+
+LLM_SECONDS = 0.3
+
+TEACH = {"topic": "T", "explanation": "E", "examples": ["e"], "resources": ["r"]}
+ROADMAP = {
+    "role": "Dev",
+    "required_skills": ["a"],
+    "learning_path": [{"phase": "Fundamentals", "topics": ["x"], "duration_weeks": 1}],
+    "recommended_projects": ["p"]
+}
+
+
+@pytest.fixture
+def client():
+    """Logged-in client whose LLM calls record the pool's checked-out count"""
+    Base.metadata.create_all(engine)
+    checked_out = []
+
+    async def slow_llm(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        checked_out.append(async_engine.sync_engine.pool.checkedout())
+        await asyncio.sleep(LLM_SECONDS)
+        text = json.dumps(ROADMAP if "career roadmap" in body["messages"][0]["content"] else TEACH)
+        if body.get("stream"):
+            chunk = json.dumps({"choices": [{"delta": {"content": text}}]})
+            return httpx.Response(
+                200,
+                content=f"data: {chunk}\n\ndata: [DONE]\n\n".encode(),
+                headers={"content-type": "text/event-stream"}
+            )
+        return httpx.Response(200, json={
+            "choices": [{"message": {"content": text}}],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 20, "total_tokens": 30}
+        })
+
+    with TestClient(main.app) as test_client:
+        groq_client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(slow_llm))
+        test_client.post("/auth/register", json={
+            "email": "pool@example.com", "username": "pool", "password": "password1", "full_name": "Pool"
+        })
+        token = test_client.post(
+            "/auth/login", data={"username": "pool", "password": "password1"}
+        ).json()["access_token"]
+        test_client.headers["Authorization"] = f"Bearer {token}"
+        test_client.checked_out = checked_out
+        yield test_client
+
+
+@pytest.mark.parametrize("path, payload", [
+    ("/ai/teach-topic", {"topic": "Connection pooling"}),
+    ("/ai/teach-topic/stream", {"topic": "Transaction isolation"}),
+    ("/ai/generate-roadmap", {"role_name": "Pool Dev", "duration_days": 5}),
+])
+def test_no_connection_checked_out_during_llm_call(client, path, payload):
+    response = client.post(path, json=payload)
+
+    assert response.status_code in (200, 201)
+    assert client.checked_out, "the LLM was not called"
+    assert client.checked_out == [0] * len(client.checked_out)
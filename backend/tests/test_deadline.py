@@ -0,0 +1,243 @@
+"""
+Request Deadline Tests
+Budget arithmetic, the X-Request-Timeout header, statement_timeout and LLM call refusal
+"""
+
+import asyncio
+import contextvars
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.ai.groq_client import GroqClient
+from app.core import database, deadline
+from app.core.config import settings
+
+
+class Clock:
+    """Manually advanced stand-in for time.monotonic"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(deadline, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def in_context():
+    """Run a function in a copy of the current context so deadlines do not leak between tests"""
+    def run(function, *args):
+        return contextvars.copy_context().run(function, *args)
+    return run
+
+
+def test_no_deadline_means_no_limit(in_context):
+    def body():
+        assert deadline.remaining() is None
+        assert deadline.check(100) is None
+        assert deadline.budget(30) == 30
+
+    in_context(body)
+
+
+def test_budget_is_cut_to_the_time_left(clock, in_context):
+    def body():
+        deadline.set_deadline(10)
+        clock.now += 4
+        assert deadline.remaining() == pytest.approx(6)
+        assert deadline.budget(30) == pytest.approx(6)
+        assert deadline.budget(2) == 2
+        clock.now += 10
+        assert deadline.budget(30) == 0
+
+    in_context(body)
+
+
+def test_check_refuses_steps_that_cannot_finish(clock, in_context):
+    def body():
+        deadline.set_deadline(5)
+        assert deadline.check(3) == pytest.approx(5)
+        with pytest.raises(deadline.DeadlineExceededError, match="Not enough time"):
+            deadline.check(6, "the slow step")
+        clock.now += 5
+        with pytest.raises(deadline.DeadlineExceededError) as error:
+            deadline.check()
+        assert error.value.status_code == 504
+
+    in_context(body)
+
+
+def test_lifted_restores_the_deadline(clock, in_context):
+    def body():
+        deadline.set_deadline(5)
+        with deadline.lifted():
+            assert deadline.remaining() is None
+        assert deadline.remaining() == pytest.approx(5)
+
+    in_context(body)
+
+
+@pytest.fixture
+def deadline_client(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX", 100.0)
+    app = FastAPI()
+
+    @app.get("/budget")
+    async def budget(seconds: float = Depends(deadline.request_deadline(30.0))):
+        return {"seconds": seconds, "remaining": deadline.remaining()}
+
+    return TestClient(app)
+
+
+def test_route_default_applies_without_header(deadline_client):
+    body = deadline_client.get("/budget").json()
+
+    assert body["seconds"] == 30.0
+    assert 29 < body["remaining"] <= 30
+
+
+@pytest.mark.parametrize("header, seconds", [("5", 5.0), ("2.5", 2.5), ("1000", 100.0)])
+def test_header_sets_the_budget_up_to_the_cap(deadline_client, header, seconds):
+    response = deadline_client.get("/budget", headers={deadline.DEADLINE_HEADER: header})
+
+    assert response.json()["seconds"] == seconds
+
+
+@pytest.mark.parametrize("header", ["soon", "0", "-3", "nan"])
+def test_invalid_header_is_rejected(deadline_client, header):
+    response = deadline_client.get("/budget", headers={deadline.DEADLINE_HEADER: header})
+
+    assert response.status_code == 400
+
+
+class FakeConnection:
+    """Records the SQL apply_statement_timeout sends"""
+
+    def __init__(self, dialect):
+        self.dialect = SimpleNamespace(name=dialect)
+        self.statements = []
+
+    def exec_driver_sql(self, statement):
+        self.statements.append(statement)
+
+
+def test_statement_timeout_follows_the_deadline(clock, in_context, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 30.0)
+    connection = FakeConnection("postgresql")
+
+    def body():
+        deadline.set_deadline(2.5)
+        database.apply_statement_timeout(None, None, connection)
+
+    in_context(body)
+
+    assert connection.statements == ["SET LOCAL statement_timeout = 2500"]
+
+
+def test_statement_timeout_default_and_cap(clock, in_context, monkeypatch):
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT", 30.0)
+    without_deadline = FakeConnection("postgresql")
+    long_deadline = FakeConnection("postgresql")
+
+    def body():
+        database.apply_statement_timeout(None, None, without_deadline)
+        deadline.set_deadline(120)
+        database.apply_statement_timeout(None, None, long_deadline)
+
+    in_context(body)
+
+    assert without_deadline.statements == ["SET LOCAL statement_timeout = 30000"]
+    assert long_deadline.statements == ["SET LOCAL statement_timeout = 30000"]
+
+
+def test_statement_timeout_is_postgres_only(clock, in_context):
+    connection = FakeConnection("sqlite")
+
+    def body():
+        deadline.set_deadline(5)
+        database.apply_statement_timeout(None, None, connection)
+
+    in_context(body)
+
+    assert connection.statements == []
+
+
+def test_transaction_is_refused_after_the_deadline(clock, in_context):
+    def body():
+        deadline.set_deadline(1)
+        clock.now += 2
+        database.apply_statement_timeout(None, None, FakeConnection("postgresql"))
+
+    with pytest.raises(deadline.DeadlineExceededError):
+        in_context(body)
+
+
+class QueryCanceledError(Exception):
+    """Driver error as raised by psycopg2 for a cancelled statement"""
+    pgcode = database.QUERY_CANCELED
+
+
+def test_cancelled_statement_becomes_a_deadline_error(clock, in_context):
+    cancelled = SimpleNamespace(original_exception=QueryCanceledError("canceling statement due to statement timeout"))
+
+    def body():
+        database.translate_statement_timeout(cancelled)  # no deadline: left to the caller
+        deadline.set_deadline(5)
+        database.translate_statement_timeout(cancelled)
+
+    with pytest.raises(deadline.DeadlineExceededError):
+        in_context(body)
+
+
+def test_llm_call_is_refused_without_enough_time():
+    requests = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "done"}}]})
+
+    async def run():
+        client = GroqClient()
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        try:
+            deadline.set_deadline(settings.REQUEST_MIN_LLM_SECONDS / 2)
+            with pytest.raises(deadline.DeadlineExceededError):
+                await client.generate_completion("prompt")
+            deadline.set_deadline(settings.REQUEST_MIN_LLM_SECONDS + 5)
+            return await client.generate_completion("prompt")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == "done"
+    assert len(requests) == 1
+
+
+def test_slow_llm_call_is_cut_off_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_MIN_LLM_SECONDS", 0.0)
+
+    async def upstream(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(5)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "late"}}]})
+
+    async def run():
+        client = GroqClient()
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        try:
+            deadline.set_deadline(0.1)
+            await client.generate_completion("prompt")
+        finally:
+            await client.close()
+
+    with pytest.raises(deadline.DeadlineExceededError):
+        asyncio.run(run())
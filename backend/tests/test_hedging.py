@@ -0,0 +1,162 @@
+"""
+Hedged Request Tests
+Per-operation hedge delays and the primary/backup race
+"""
+
+import asyncio
+
+import pytest
+
+from app.ai.hedging import HedgePolicy, LatencyTracker
+
+
+def make_policy(**overrides):
+    options = dict(percentile=95, min_delay=0.01, default_delay=0.05, min_samples=5, max_rate=1.0)
+    options.update(overrides)
+    return HedgePolicy(**options)
+
+
+async def answer(value, seconds, log=None):
+    try:
+        await asyncio.sleep(seconds)
+    except asyncio.CancelledError:
+        if log is not None:
+            log.append(f"{value} cancelled")
+        raise
+    return value
+
+
+async def fail(message, seconds=0.0):
+    await asyncio.sleep(seconds)
+    raise RuntimeError(message)
+
+
+def test_percentile_uses_nearest_rank():
+    tracker = LatencyTracker(100)
+    for seconds in range(1, 101):
+        tracker.record(float(seconds))
+
+    assert tracker.percentile(50) == 50.0
+    assert tracker.percentile(95) == 95.0
+    assert tracker.percentile(100) == 100.0
+    assert LatencyTracker(10).percentile(95) is None
+
+
+def test_default_delay_until_enough_samples():
+    policy = make_policy(default_delay=5.0, min_delay=0.5)
+    for _ in range(4):
+        policy.record_completion("teach_topic", 2.0)
+    assert policy.completion_delay("teach_topic") == 5.0
+
+    policy.record_completion("teach_topic", 2.0)
+    assert policy.completion_delay("teach_topic") == 2.0
+
+    # Faster calls push the old samples out of the window; the floor still applies
+    for _ in range(policy.window):
+        policy.record_completion("teach_topic", 0.1)
+    assert policy.completion_delay("teach_topic") == 0.5
+
+
+def test_delays_are_kept_per_operation():
+    policy = make_policy(default_delay=5.0)
+    for _ in range(10):
+        policy.record_completion("teach_topics", 30.0)
+        policy.record_completion("teach_topic", 1.5)
+        policy.record_first_token("teach_topic", 0.4)
+
+    assert policy.completion_delay("teach_topic") == 1.5
+    assert policy.completion_delay("teach_topics") == 30.0
+    assert policy.first_token_delay("teach_topic") == 0.4
+    assert policy.first_token_delay("roadmap") == 5.0
+
+    operations = policy.stats()["operations"]
+    assert operations["teach_topic"] == {
+        "completion_delay": 1.5,
+        "completion_samples": 10,
+        "first_token_delay": 0.4,
+        "first_token_samples": 10
+    }
+    assert operations["teach_topics"]["completion_delay"] == 30.0
+
+
+def test_race_uses_the_operations_delay():
+    policy = make_policy(default_delay=5.0)
+    for _ in range(5):
+        policy.record_completion("fast_op", 0.02)
+        policy.record_completion("slow_op", 5.0)
+
+    async def run(operation):
+        return await policy.race(lambda: answer("primary", 0.2), lambda: answer("hedge", 0.01), operation)
+
+    assert asyncio.run(run("fast_op")) == "hedge"
+    assert asyncio.run(run("slow_op")) == "primary"
+    assert policy.stats()["hedges_fired"] == 1
+
+
+def test_fast_primary_is_not_hedged():
+    policy = make_policy()
+    started = []
+
+    async def hedge():
+        started.append(True)
+        return "hedge"
+
+    assert asyncio.run(policy.race(lambda: answer("primary", 0.0), hedge)) == "primary"
+    assert started == []
+
+
+def test_losing_call_is_cancelled():
+    policy = make_policy()
+    log = []
+
+    async def run():
+        result = await policy.race(lambda: answer("primary", 1.0, log), lambda: answer("hedge", 0.01, log))
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == "hedge"
+    assert log == ["primary cancelled"]
+    assert policy.stats()["hedge_wins"] == 1
+
+
+def test_hedge_rate_is_capped():
+    policy = make_policy(max_rate=0.0)
+
+    assert asyncio.run(policy.race(lambda: answer("primary", 0.1), lambda: answer("hedge", 0.0))) == "primary"
+    assert policy.stats()["hedges_fired"] == 0
+
+
+def test_failed_hedge_falls_back_to_the_primary():
+    policy = make_policy()
+
+    assert asyncio.run(policy.race(lambda: answer("primary", 0.1), lambda: fail("hedge broke"))) == "primary"
+
+
+def test_primary_error_is_raised_when_both_fail():
+    policy = make_policy()
+
+    with pytest.raises(RuntimeError, match="primary broke"):
+        asyncio.run(policy.race(lambda: fail("primary broke", 0.1), lambda: fail("hedge broke")))
+
+
+def test_first_item_race_keeps_the_faster_stream_and_closes_the_other():
+    policy = make_policy()
+    closed = []
+
+    async def stream(name, first_delay):
+        try:
+            await asyncio.sleep(first_delay)
+            yield f"{name}-1"
+            yield f"{name}-2"
+        finally:
+            closed.append(name)
+
+    async def run():
+        winner, first = await policy.race_first_item(
+            lambda: stream("primary", 1.0), lambda: stream("hedge", 0.01), "teach_topic"
+        )
+        rest = [item async for item in winner]
+        return first, rest
+
+    assert asyncio.run(run()) == ("hedge-1", ["hedge-2"])
+    assert sorted(closed) == ["hedge", "primary"]
@@ -0,0 +1,137 @@
+"""
+Generation Job Tests
+Claiming, lease renewal and retry accounting of background jobs
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete
+
+from app.ai.errors import CircuitOpenError
+from app.core.config import settings
+from app.models.job import GenerationJob
+from app.services import job_service
+from app.services.ai_service import AIService
+from app.services.job_service import JobService
+
+
+@pytest.fixture
+def jobs(async_sessions, monkeypatch):
+    """Point JobService at the test database and start from an empty queue"""
+    monkeypatch.setattr(job_service, "AsyncSessionLocal", async_sessions)
+
+    async def clear():
+        async with async_sessions() as db:
+            await db.execute(delete(GenerationJob))
+            await db.commit()
+
+    asyncio.run(clear())
+    return async_sessions
+
+
+def add_job(sessions, **overrides):
+    fields = dict(
+        user_id=1,
+        kind="roadmap",
+        status="queued",
+        payload='{"role_name": "Data Engineer", "duration_days": 30}',
+        attempts=0,
+        run_after=datetime.utcnow() - timedelta(seconds=1)
+    )
+    fields.update(overrides)
+
+    async def add():
+        async with sessions() as db:
+            job = GenerationJob(**fields)
+            db.add(job)
+            await db.commit()
+            return job.id
+    return asyncio.run(add())
+
+
+def get_job(sessions, job_id):
+    async def get():
+        async with sessions() as db:
+            return await db.get(GenerationJob, job_id)
+    return asyncio.run(get())
+
+
+def make_due(sessions, job_id):
+    async def update():
+        async with sessions() as db:
+            (await db.get(GenerationJob, job_id)).run_after = datetime.utcnow() - timedelta(seconds=1)
+            await db.commit()
+    asyncio.run(update())
+
+
+def test_each_claim_takes_a_different_due_job(jobs):
+    first = add_job(jobs)
+    second = add_job(jobs)
+    add_job(jobs, run_after=datetime.utcnow() + timedelta(hours=1))
+
+    claimed = [asyncio.run(JobService.claim(f"worker-{n}")) for n in range(3)]
+
+    assert claimed == [first, second, None]
+    job = get_job(jobs, first)
+    assert (job.status, job.attempts, job.worker_id) == ("running", 1, "worker-0")
+
+
+def test_job_with_an_expired_lease_is_reclaimed(jobs):
+    stale = datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+    job_id = add_job(jobs, status="running", attempts=1, worker_id="dead", locked_at=stale)
+
+    assert asyncio.run(JobService.claim("alive")) == job_id
+    assert get_job(jobs, job_id).attempts == 2
+
+
+def test_renewed_lease_is_not_reclaimed(jobs):
+    stale = datetime.utcnow() - timedelta(seconds=settings.JOB_LEASE_SECONDS + 1)
+    job_id = add_job(jobs, status="running", attempts=1, worker_id="slow", locked_at=stale)
+
+    assert asyncio.run(JobService.renew_lease(job_id, "slow"))
+    assert not asyncio.run(JobService.renew_lease(job_id, "other"))
+    assert asyncio.run(JobService.claim("alive")) is None
+
+
+def test_running_job_renews_its_lease(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_HEARTBEAT_SECONDS", 0.02)
+    job_id = add_job(jobs)
+    asyncio.run(JobService.claim("worker"))
+    claimed_at = get_job(jobs, job_id).locked_at
+    seen = {}
+
+    async def slow_generation(**kwargs):
+        await asyncio.sleep(0.2)
+        async with jobs() as db:
+            seen["locked_at"] = (await db.get(GenerationJob, job_id)).locked_at
+        raise ValueError("stop here")
+
+    monkeypatch.setattr(AIService, "generate_roadmap", slow_generation)
+
+    assert asyncio.run(JobService.run(job_id)) == "failed"
+    assert seen["locked_at"] > claimed_at
+
+
+def test_rejections_use_up_attempts(jobs, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_MAX_ATTEMPTS", 2)
+
+    async def rejected(**kwargs):
+        raise CircuitOpenError("LLM unavailable", retry_after=30.0)
+
+    monkeypatch.setattr(AIService, "generate_roadmap", rejected)
+    job_id = add_job(jobs)
+
+    assert asyncio.run(JobService.claim("worker")) == job_id
+    assert asyncio.run(JobService.run(job_id)) == "queued"
+    # Backs off for at least the breaker's Retry-After
+    assert get_job(jobs, job_id).run_after >= datetime.utcnow() + timedelta(seconds=29)
+
+    make_due(jobs, job_id)
+    assert asyncio.run(JobService.claim("worker")) == job_id
+    assert asyncio.run(JobService.run(job_id)) == "failed"
+
+    job = get_job(jobs, job_id)
+    assert (job.attempts, job.error_status) == (2, 503)
+    assert asyncio.run(JobService.claim("worker")) is None
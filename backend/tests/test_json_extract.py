@@ -0,0 +1,88 @@
+"""
+JSON Extraction Tests
+Recovering the intended JSON value from prose, fences and truncated LLM output
+"""
+
+from pathlib import Path
+
+import pytest
+
+from app.ai.groq_client import GroqClient
+from app.ai.json_extract import JSONExtractionError, extract_json
+from app.ai.response_schemas import DAILY_PLAN_SCHEMA
+
+CORPUS_DIR = Path(__file__).parent.parent / "benchmarks" / "json_corpus"
+
+
+def test_fenced_json_with_prose():
+    text = 'Sure! Here it is:\n```json\n{"topic": "SQL", "examples": ["SELECT 1"]}\n```\nEnjoy.'
+
+    assert extract_json(text) == {"topic": "SQL", "examples": ["SELECT 1"]}
+
+
+def test_value_of_the_expected_shape_wins_over_an_earlier_one():
+    text = '[1] Here is the plan: {"a": 1}'
+
+    assert extract_json(text, expected=dict) == {"a": 1}
+    assert extract_json(text) == [1]
+
+
+def test_first_value_is_kept_when_none_has_the_expected_shape():
+    assert extract_json("Steps: [1, 2] then [3]", expected=dict) == [1, 2]
+
+
+def test_prose_braces_before_the_value_are_skipped():
+    text = 'Each day has {day, topic}. Plan: {"total_days": 1, "daily_plan": []}'
+
+    assert extract_json(text, expected=dict) == {"total_days": 1, "daily_plan": []}
+
+
+def test_trailing_commas_are_dropped():
+    assert extract_json('{"a": [1, 2,], "b": {"c": 3,},}') == {"a": [1, 2], "b": {"c": 3}}
+
+
+def test_brackets_inside_strings_are_ignored():
+    text = '{"tip": "write {{ and ]] literally", "n": 1,'
+
+    assert extract_json(text) == {"tip": "write {{ and ]] literally", "n": 1}
+
+
+def test_truncated_list_drops_the_unfinished_item():
+    text = '{"total_days": 2, "daily_plan": [{"day": 1, "topic": "Intro"}, {"day": 2, "to'
+
+    assert extract_json(text, expected=dict) == {
+        "total_days": 2,
+        "daily_plan": [{"day": 1, "topic": "Intro"}]
+    }
+
+
+def test_truncated_nested_item_is_dropped_whole():
+    text = '{"learning_path": [{"phase": "Basics", "topics": ["a"]}, {"phase": "Advanced", "topics": ["b", "c'
+
+    assert extract_json(text) == {"learning_path": [{"phase": "Basics", "topics": ["a"]}]}
+
+
+def test_truncated_after_a_key():
+    assert extract_json('{"daily_plan": [{"day": 1}], "total_days":') == {"daily_plan": [{"day": 1}]}
+
+
+def test_truncated_top_level_object_keeps_its_complete_members():
+    assert extract_json('{"topic": "Docker", "explanation": "Containers sha') == {"topic": "Docker"}
+
+
+def test_truncated_plan_validates_with_complete_days_only():
+    text = '```json\n{"total_days": 3, "daily_plan": [{"day": 1, "topic": "Intro"}, {"day": 2, "topic": "Var'
+
+    result = GroqClient.parse_structured_response(text, DAILY_PLAN_SCHEMA)
+
+    assert result["daily_plan"] == [{"day": 1, "topic": "Intro"}]
+
+
+def test_text_without_json_raises():
+    with pytest.raises(JSONExtractionError):
+        extract_json("I cannot help with that.")
+
+
+@pytest.mark.parametrize("path", sorted(CORPUS_DIR.glob("*.txt")), ids=lambda path: path.stem)
+def test_corpus_response_is_recovered(path):
+    assert isinstance(extract_json(path.read_text(encoding="utf-8"), expected=dict), dict)
@@ -0,0 +1,62 @@
+"""
+JSON Stream Parser Tests
+Array elements are emitted as soon as they are complete, whatever the chunking
+"""
+
+import json
+
+from app.ai.json_stream import JSONArrayStreamParser
+
+PLAN = {
+    "role": "Backend Developer",
+    "daily_plan": [
+        {"day": 1, "topic": "HTTP {basics}", "resources": ["RFC \"9110\""]},
+        {"day": 2, "topic": "SQL ] joins", "resources": []},
+        {"day": 3, "topic": "Caching", "details": {"level": 2}},
+    ],
+    "notes": [{"day": 99}]
+}
+
+
+def feed_in_chunks(text, size):
+    parser = JSONArrayStreamParser("daily_plan")
+    batches = [parser.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    return parser, batches
+
+
+def test_elements_match_a_full_parse_for_any_chunk_size():
+    text = "Here is the plan:\n```json\n" + json.dumps(PLAN) + "\n```"
+    for size in (1, 2, 7, 64, len(text)):
+        parser, batches = feed_in_chunks(text, size)
+
+        assert [day for batch in batches for day in batch] == PLAN["daily_plan"]
+        assert parser.finished
+
+
+def test_element_is_emitted_by_the_chunk_that_closes_it():
+    parser = JSONArrayStreamParser("daily_plan")
+
+    assert parser.feed('{"daily_plan": [{"day": 1, "topic": "A"') == []
+    assert parser.feed('}, {"day": 2') == [{"day": 1, "topic": "A"}]
+    assert parser.feed(', "topic": "B"}]}') == [{"day": 2, "topic": "B"}]
+
+
+def test_nothing_after_the_array_is_emitted():
+    parser = JSONArrayStreamParser("daily_plan")
+    parser.feed('{"daily_plan": [{"day": 1}]')
+
+    assert parser.feed(', "notes": [{"day": 99}]}') == []
+
+
+def test_undecodable_element_is_skipped():
+    parser = JSONArrayStreamParser("daily_plan")
+
+    assert parser.feed('{"daily_plan": [{"day": 1, oops}, {"day": 2}]}') == [{"day": 2}]
+
+
+def test_consumed_text_is_discarded():
+    parser = JSONArrayStreamParser("daily_plan")
+    parser.feed('{"daily_plan": [' + ", ".join(json.dumps({"day": n, "topic": "x" * 200}) for n in range(50)))
+    parser.feed(', {"day": 50, "topic": "open')
+
+    assert len(parser._buffer) < 100
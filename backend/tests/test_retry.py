@@ -0,0 +1,176 @@
+"""
+Retry Engine Tests
+Backoff, Retry-After handling and the total time budget
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.ai.errors import LLMResponseError, LLMTimeoutError, LLMUpstreamError
+from app.ai.groq_client import GroqClient
+from app.ai.retry import RetryPolicy, parse_duration, parse_retry_after
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("7.66s", 7.66),
+    ("2m59.56s", 179.56),
+    ("120ms", 0.12),
+    ("1h", 3600.0),
+])
+def test_parse_duration(value, seconds):
+    assert parse_duration(value) == pytest.approx(seconds)
+
+
+@pytest.mark.parametrize("value", ["soon", "5s later", ""])
+def test_parse_duration_rejects_other_text(value):
+    assert parse_duration(value) is None
+
+
+def test_retry_after_seconds_wins_over_reset_headers():
+    headers = httpx.Headers({"Retry-After": "3", "x-ratelimit-reset-tokens": "10s"})
+
+    assert parse_retry_after(headers) == 3.0
+
+
+def test_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=30)
+    headers = httpx.Headers({"Retry-After": format_datetime(when, usegmt=True)})
+
+    assert 28 <= parse_retry_after(headers) <= 30
+
+
+def test_longest_reset_header_is_used():
+    headers = httpx.Headers({"x-ratelimit-reset-requests": "2s", "x-ratelimit-reset-tokens": "1m0.5s"})
+
+    assert parse_retry_after(headers) == pytest.approx(60.5)
+
+
+def test_no_hint():
+    assert parse_retry_after(httpx.Headers({"x-ratelimit-reset-tokens": "later"})) is None
+
+
+def test_backoff_is_capped_full_jitter():
+    policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=4.0, total_budget=60.0)
+
+    delays = [policy.backoff(attempt) for attempt in range(8) for _ in range(50)]
+
+    assert min(delays) >= 0
+    assert max(delays) <= 4.0
+    assert all(policy.backoff(0) <= 1.0 for _ in range(50))
+
+
+def test_server_hint_replaces_backoff():
+    policy = RetryPolicy(max_attempts=3, base_delay=100.0, max_delay=100.0, total_budget=60.0)
+    error = LLMUpstreamError("rate limited", status_code=429, retry_after=0.5)
+
+    assert policy.next_delay(0, error, time.monotonic()) == 0.5
+
+
+def test_non_retryable_errors_are_not_retried():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0, total_budget=60.0)
+
+    assert policy.next_delay(0, LLMUpstreamError("bad request", status_code=400), time.monotonic()) is None
+    assert policy.next_delay(0, LLMResponseError("not JSON"), time.monotonic()) is None
+    assert policy.next_delay(0, LLMTimeoutError("slow"), time.monotonic()) is not None
+
+
+def test_gives_up_after_max_attempts():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0, total_budget=60.0)
+
+    assert policy.next_delay(1, LLMTimeoutError("slow"), time.monotonic()) is not None
+    assert policy.next_delay(2, LLMTimeoutError("slow"), time.monotonic()) is None
+
+
+def test_no_sleep_past_the_budget():
+    policy = RetryPolicy(max_attempts=5, base_delay=0.0, max_delay=0.0, total_budget=1.0)
+    error = LLMUpstreamError("rate limited", status_code=429, retry_after=5.0)
+
+    assert policy.next_delay(0, error, time.monotonic()) is None
+
+
+def test_call_retries_until_success():
+    policy = RetryPolicy(max_attempts=4, base_delay=0.01, max_delay=0.01, total_budget=5.0)
+    timeouts = []
+
+    async def operation(timeout):
+        timeouts.append(timeout)
+        if len(timeouts) < 3:
+            raise LLMUpstreamError("unavailable", status_code=503)
+        return "ok"
+
+    assert asyncio.run(policy.call(operation, default_timeout=2.0)) == "ok"
+    assert len(timeouts) == 3
+    assert all(0 < timeout <= 2.0 for timeout in timeouts)
+
+
+def test_call_raises_the_last_error():
+    policy = RetryPolicy(max_attempts=2, base_delay=0.0, max_delay=0.0, total_budget=5.0)
+    calls = []
+
+    async def operation(timeout):
+        calls.append(timeout)
+        raise LLMTimeoutError(f"attempt {len(calls)}")
+
+    with pytest.raises(LLMTimeoutError, match="attempt 2"):
+        asyncio.run(policy.call(operation, default_timeout=1.0))
+
+
+def test_attempt_timeout_shrinks_to_the_remaining_budget():
+    policy = RetryPolicy(max_attempts=1, base_delay=0.0, max_delay=0.0, total_budget=0.5)
+    timeouts = []
+
+    async def operation(timeout):
+        timeouts.append(timeout)
+        return None
+
+    asyncio.run(policy.call(operation, default_timeout=30.0))
+
+    assert timeouts[0] <= 0.5
+
+
+def test_client_honours_retry_after_from_a_429():
+    requests = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(time.monotonic())
+        if len(requests) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.2"}, json={"error": "rate limited"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "done"}}]})
+
+    async def run():
+        client = GroqClient()
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        try:
+            return await client.generate_completion("prompt")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == "done"
+    assert len(requests) == 2
+    assert requests[1] - requests[0] >= 0.2
+
+
+def test_client_does_not_retry_a_bad_request():
+    requests = []
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(400, json={"error": "bad request"})
+
+    async def run():
+        client = GroqClient()
+        client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+        try:
+            await client.generate_completion("prompt")
+        finally:
+            await client.close()
+
+    with pytest.raises(LLMUpstreamError) as error:
+        asyncio.run(run())
+    assert error.value.status_code == 400
+    assert len(requests) == 1
@@ -0,0 +1,146 @@
+"""
+Single-Flight Tests
+Identical concurrent calls share one execution, without sharing a deadline
+"""
+
+import asyncio
+
+import pytest
+
+from app.ai.admission import current_llm_user
+from app.ai.singleflight import SingleFlight, completion_key
+from app.core import deadline
+
+
+def test_key_covers_every_request_field():
+    base = completion_key("model", "prompt", 0.7, 100, False)
+
+    assert base == completion_key("model", "prompt", 0.7, 100, False)
+    assert base != completion_key("other", "prompt", 0.7, 100, False)
+    assert base != completion_key("model", "prompt", 0.2, 100, False)
+    assert base != completion_key("model", "prompt", 0.7, 200, False)
+    assert base != completion_key("model", "prompt", 0.7, 100, True)
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    executions = []
+
+    async def work():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return {"answer": 42}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    results = asyncio.run(run())
+
+    assert len(executions) == 1
+    assert results == [{"answer": 42}] * 5
+    assert flight.stats()["coalesced_calls"] == 4
+    assert not flight.is_in_flight("key")
+
+
+def test_failure_reaches_every_caller():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream broke")
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert [type(result) for result in results] == [ValueError] * 3
+
+
+def test_shared_call_runs_without_the_callers_deadline_and_user():
+    flight = SingleFlight()
+    seen = {}
+
+    async def work():
+        seen["deadline"] = deadline.current_deadline.get()
+        seen["user"] = current_llm_user.get()
+        return "done"
+
+    async def run():
+        deadline.set_deadline(30)
+        current_llm_user.set(7)
+        return await flight.do("key", work)
+
+    assert asyncio.run(run()) == "done"
+    assert seen == {"deadline": None, "user": None}
+
+
+def test_each_caller_stops_waiting_at_its_own_deadline():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.3)
+        return "done"
+
+    async def impatient():
+        deadline.set_deadline(0.05)
+        return await flight.do("key", work)
+
+    async def patient():
+        await asyncio.sleep(0.01)
+        return await flight.do("key", work)
+
+    async def run():
+        return await asyncio.gather(impatient(), patient(), return_exceptions=True)
+
+    first, second = asyncio.run(run())
+
+    assert isinstance(first, deadline.DeadlineExceededError)
+    assert second == "done"
+    assert flight.stats()["upstream_calls"] == 1
+
+
+def test_shared_call_is_cancelled_when_nobody_waits():
+    flight = SingleFlight()
+
+    async def run():
+        stopped = asyncio.Event()
+
+        async def work():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                stopped.set()
+                raise
+
+        async def caller(seconds):
+            deadline.set_deadline(seconds)
+            return await flight.do("key", work)
+
+        results = await asyncio.gather(caller(0.05), caller(0.1), return_exceptions=True)
+        await asyncio.wait_for(stopped.wait(), timeout=1)
+        return results
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, deadline.DeadlineExceededError) for result in results)
+    assert not flight.is_in_flight("key")
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.1)
+        return "done"
+
+    async def run():
+        first = asyncio.create_task(flight.do("key", work))
+        second = asyncio.create_task(flight.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == "done"
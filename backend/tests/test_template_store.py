@@ -0,0 +1,116 @@
+"""
+Template Store Tests
+Saves never leave a transaction open, and database errors are rolled back
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app.ai.prompts import PromptTemplates
+from app.models.roadmap import DailyPlan
+from app.models.template import GenerationTemplate, TemplateDailyPlan
+from app.models.user import User, UserRole
+from app.services.template_store import TemplateStore
+
+
+def run(async_sessions, work):
+    async def main():
+        async with async_sessions() as db:
+            return await work(db)
+    return asyncio.run(main())
+
+
+def test_save_roadmap_stores_and_commits(async_sessions):
+    async def work(db):
+        await TemplateStore.save_roadmap("Data  Engineer", 30, '{"v": 1}', db)
+        assert not db.in_transaction()
+        return await TemplateStore.get_roadmap_text("data engineer", 30, db)
+
+    assert run(async_sessions, work) == '{"v": 1}'
+
+
+def test_pinned_template_is_kept_and_the_transaction_ended(async_sessions):
+    async def work(db):
+        await TemplateStore.save_roadmap("Pinned Role", 30, '{"catalog": true}', db, pin=True)
+        await TemplateStore.save_daily_plan(
+            "Pinned Role", 30, [DailyPlan(day_number=1, topic="Catalog", estimated_hours=2)], db, pin=True
+        )
+
+        await TemplateStore.save_roadmap("Pinned Role", 30, '{"catalog": false}', db)
+        assert not db.in_transaction()
+        await TemplateStore.save_daily_plan(
+            "Pinned Role", 30, [DailyPlan(day_number=1, topic="User", estimated_hours=2)], db
+        )
+        assert not db.in_transaction()
+
+        template = await TemplateStore.find("Pinned Role", 30, db)
+        topics = list(await db.scalars(
+            select(TemplateDailyPlan.topic).where(TemplateDailyPlan.template_id == template.id)
+        ))
+        return template.roadmap_text, topics
+
+    assert run(async_sessions, work) == ('{"catalog": true}', ["Catalog"])
+
+
+def test_database_error_is_rolled_back_and_logged(async_sessions, monkeypatch, capsys):
+    async def broken(role_name, duration_days, db):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(TemplateStore, "_get_or_create", broken)
+
+    async def work(db):
+        await TemplateStore.save_roadmap("Broken Role", 30, "{}", db)
+        await TemplateStore.save_daily_plan("Broken Role", 30, [], db)
+        assert not db.in_transaction()
+        # The session is still usable
+        return await db.scalar(select(GenerationTemplate.id).limit(1))
+
+    run(async_sessions, work)
+
+    output = capsys.readouterr().out
+    assert "Skipping roadmap template save for 'Broken Role'" in output
+    assert "Skipping daily plan template save for 'Broken Role'" in output
+
+
+def test_catalog_save_errors_are_raised(async_sessions, monkeypatch):
+    async def broken(role_name, duration_days, db):
+        raise OperationalError("INSERT", {}, Exception("database is locked"))
+
+    monkeypatch.setattr(TemplateStore, "_get_or_create", broken)
+
+    async def work(db):
+        with pytest.raises(OperationalError):
+            await TemplateStore.save_roadmap("Catalog Role", 30, "{}", db, pin=True)
+        assert not db.in_transaction()
+
+    run(async_sessions, work)
+
+
+def test_empty_template_keeps_the_current_plan(async_sessions):
+    async def work(db):
+        user = User(email="tpl@example.com", username="tpl", password_hash="x", full_name="Tpl")
+        db.add(user)
+        await db.flush()
+        role = UserRole(user_id=user.id, role_name="Empty Role", duration_days=7)
+        db.add(role)
+        await db.flush()
+        role_id = role.id
+        db.add(DailyPlan(user_role_id=role_id, day_number=1, topic="Mine", estimated_hours=1))
+        db.add(GenerationTemplate(
+            role_key="empty role",
+            duration_days=7,
+            prompt_version=PromptTemplates.VERSION,
+            daily_plan_generated_at=datetime.utcnow()
+        ))
+        await db.commit()
+
+        copied = await TemplateStore.copy_daily_plan("Empty Role", 7, role_id, db)
+        assert not db.in_transaction()
+        topics = list(await db.scalars(select(DailyPlan.topic).where(DailyPlan.user_role_id == role_id)))
+        return copied, topics
+
+    assert run(async_sessions, work) == (None, ["Mine"])
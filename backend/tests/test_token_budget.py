@@ -0,0 +1,111 @@
+"""
+Token Budget Tests
+Output budgets sized from observed completions, and model-limit checks
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.ai.groq_client import groq_client
+from app.ai.token_budget import TokenBudget, TokenBudgetExceededError, estimate_tokens
+from app.services import ai_service
+from app.services.ai_service import AIService
+
+
+def make_budget(**overrides):
+    options = dict(
+        tokens_per_entry=100.0,
+        overhead_tokens=50,
+        margin=1.0,
+        context_window=8000,
+        max_output_tokens=4000,
+        smoothing=0.5
+    )
+    options.update(overrides)
+    return TokenBudget(**options)
+
+
+def test_estimate_is_four_characters_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_max_tokens_scales_with_entries():
+    budget = make_budget(margin=1.2)
+
+    assert budget.max_tokens_for("prompt", 10) == 1260
+    assert budget.max_tokens_for("prompt", 20) == 2460
+
+
+def test_reported_completion_tokens_win_over_the_text_estimate():
+    budget = make_budget()
+
+    budget.observe("x" * 4000, entries=10, completion_tokens=550)
+
+    # (550 - 50) / 10 = 50 per entry, halfway from the 100 seed
+    assert budget.tokens_per_entry == 75.0
+    assert budget.observations == 1
+
+
+def test_raw_text_is_estimated_when_usage_is_missing():
+    budget = make_budget()
+
+    budget.observe("x" * 2200, entries=10)
+
+    # 550 tokens -> 50 per entry
+    assert budget.tokens_per_entry == 75.0
+
+
+@pytest.mark.parametrize("usage, expected_tokens", [
+    ({"prompt_tokens": 100, "completion_tokens": 620, "total_tokens": 720}, 620),
+    (None, None),
+])
+def test_segments_observe_usage_or_the_raw_response(monkeypatch, usage, expected_tokens):
+    raw = json.dumps(
+        {"daily_plan": [{"day": day, "topic": f"Topic {day}", "estimated_hours": 2} for day in range(1, 11)]},
+        indent=4
+    )
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        body = {"choices": [{"message": {"content": raw}}]}
+        if usage:
+            body["usage"] = usage
+        return httpx.Response(200, json=body)
+
+    budget = make_budget()
+    monkeypatch.setattr(ai_service, "daily_plan_budget", budget)
+    monkeypatch.setattr(groq_client, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(upstream)))
+
+    days = asyncio.run(AIService._generate_segment("segment prompt", 2000, asyncio.Semaphore(1)))
+
+    assert len(days) == 10
+    generated = expected_tokens or estimate_tokens(raw)
+    assert budget.tokens_per_entry == pytest.approx(100 + 0.5 * ((generated - 50) / 10 - 100))
+
+
+def test_empty_results_are_not_observed():
+    budget = make_budget()
+
+    budget.observe("{}", entries=0, completion_tokens=10)
+
+    assert budget.observations == 0
+    assert budget.tokens_per_entry == 100.0
+
+
+def test_output_over_the_model_limit_is_rejected():
+    budget = make_budget(max_output_tokens=1000)
+
+    with pytest.raises(TokenBudgetExceededError) as error:
+        budget.max_tokens_for("prompt", 20)
+    assert error.value.output_tokens == 2050
+
+
+def test_prompt_and_output_must_fit_the_context_window():
+    budget = make_budget(context_window=1200)
+
+    with pytest.raises(TokenBudgetExceededError, match="context window"):
+        budget.max_tokens_for("p" * 2000, 10)
@@ -0,0 +1,120 @@
+"""
+Generation Worker
+Runs queued roadmap / daily-plan jobs from the generation_jobs table
+
+Usage:
+    python worker.py
+    python worker.py --concurrency 8 --poll-interval 0.5
+
+Start as many worker processes as the LLM quota allows; jobs are claimed
+with SELECT ... FOR UPDATE SKIP LOCKED, so each job runs once. SIGINT or
+SIGTERM stops claiming new jobs and waits for the running ones to finish.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+import sys
+import time
+import uuid
+
+sys.path.append(".")
+
+from app.ai.groq_client import groq_client
+from app.core.config import settings
+from app.core.database import async_engine
+from app.services.job_service import JobService
+
+
+async def work(worker_id: str, concurrency: int, poll_interval: float, stop: asyncio.Event) -> None:
+    """
+    Claim and run jobs until stopped
+
+    Args:
+        worker_id: Identifier recorded on claimed jobs
+        concurrency: Jobs run at once
+        poll_interval: Seconds to wait after finding the queue empty
+        stop: Set to stop claiming new jobs
+    """
+    slots = asyncio.Semaphore(concurrency)
+    running = set()
+
+    async def run(job_id: int) -> None:
+        started_at = time.monotonic()
+        try:
+            final_status = await JobService.run(job_id)
+        except Exception as e:
+            final_status = f"crashed ({e})"
+        finally:
+            slots.release()
+        print(f"   job {job_id}: {final_status} in {time.monotonic() - started_at:.1f}s")
+
+    while not stop.is_set():
+        await slots.acquire()
+        if stop.is_set():
+            slots.release()
+            break
+
+        try:
+            job_id = await JobService.claim(worker_id)
+        except Exception as e:
+            print(f"⚠️  Claim failed: {e}")
+            job_id = None
+
+        if job_id is None:
+            slots.release()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        task = asyncio.create_task(run(job_id))
+        running.add(task)
+        task.add_done_callback(running.discard)
+
+    if running:
+        print(f"Waiting for {len(running)} running job(s)...")
+        await asyncio.gather(*running, return_exceptions=True)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows: Ctrl+C raises KeyboardInterrupt instead
+            pass
+
+    print("=" * 60)
+    print(f"GENERATION WORKER {worker_id}: concurrency {args.concurrency}, polling every {args.poll_interval}s")
+    print("=" * 60)
+
+    await groq_client.start()
+    try:
+        await work(worker_id, args.concurrency, args.poll_interval, stop)
+    finally:
+        await groq_client.close()
+        # Pooled aiosqlite connections each hold a thread that would keep the process alive
+        await async_engine.dispose()
+    print("Worker stopped")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run queued generation jobs")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help=f"Jobs run at once (default: JOB_WORKER_CONCURRENCY={settings.JOB_WORKER_CONCURRENCY})")
+    parser.add_argument("--poll-interval", type=float, default=settings.JOB_POLL_INTERVAL,
+                        help=f"Seconds between polls of an empty queue (default: {settings.JOB_POLL_INTERVAL})")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()